@@ -0,0 +1,130 @@
+"""
+Benchmark forecast parsing and response encoding
+
+Compares the previous path (stdlib JSON decode, one DailyForecast per index,
+model_dump + JSONResponse) with the orjson path used by the weather routes
+
+Usage:
+    python scripts/tools/bench/forecast_response.py [--days 7] [--number 2000]
+"""
+
+import os
+import sys
+import json
+import timeit
+import argparse
+import tracemalloc
+
+from datetime import date, timedelta
+
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.append(os.path.join(root, "src"))
+os.chdir(root)
+os.environ.setdefault("USE_TEST_CONFIG", "1")
+
+import orjson  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.core.utils.weather import WeatherUtils  # noqa: E402
+from app.core.models.weather import (  # noqa: E402
+    DailyForecast,
+    LocationInfo,
+    WeatherResponse,
+    WeatherListResponse,
+)
+
+LOCATION = LocationInfo(name="Moscow", country="Russia", latitude=55.75, longitude=37.62)
+
+parse_forecast = WeatherUtils._WeatherUtils__parse_forecast
+
+
+def build_payload(days: int) -> bytes:
+    start = date(2025, 1, 1)
+    return orjson.dumps(
+        {
+            "latitude": 55.75,
+            "longitude": 37.625,
+            "daily": {
+                "time": [str(start + timedelta(days=i)) for i in range(days)],
+                "temperature_2m_max": [-3.1 + i * 0.1 for i in range(days)],
+                "temperature_2m_min": [-9.4 + i * 0.1 for i in range(days)],
+                "weathercode": [i % 4 for i in range(days)],
+            },
+        }
+    )
+
+
+def legacy_parse(content: bytes) -> WeatherResponse:
+    data = json.loads(content)
+    forecasts = [
+        DailyForecast(
+            date=data["daily"]["time"][i],
+            temperature_max=data["daily"]["temperature_2m_max"][i],
+            temperature_min=data["daily"]["temperature_2m_min"][i],
+            weather_code=data["daily"]["weathercode"][i],
+        )
+        for i in range(len(data["daily"]["time"]))
+    ]
+    return WeatherResponse(
+        latitude=LOCATION.latitude,
+        longitude=LOCATION.longitude,
+        city=LOCATION.name,
+        country=LOCATION.country,
+        daily=forecasts,
+    )
+
+
+def fast_parse(content: bytes) -> WeatherResponse:
+    return parse_forecast(LOCATION, orjson.loads(content))
+
+
+def legacy_render(forecast: WeatherResponse) -> bytes:
+    localized = forecast.model_copy(update={"city": LOCATION.name})
+    response = WeatherListResponse(message="Weather for Moscow", weather=localized)
+    return JSONResponse(content=response.model_dump()).body
+
+
+def fast_render(forecast: WeatherResponse) -> bytes:
+    localized = forecast.model_copy(update={"city": LOCATION.name})
+    return WeatherListResponse.encode("Weather for Moscow", localized)
+
+
+def measure(name: str, func, arg, number: int) -> tuple[float, int]:
+    func(arg)
+    seconds = min(timeit.repeat(lambda: func(arg), number=number, repeat=5)) / number
+
+    tracemalloc.start()
+    func(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<20} {seconds * 1e6:>9.1f} us/op {peak:>9} B peak")
+    return seconds, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=7, help="Number of forecast days")
+    parser.add_argument("--number", type=int, default=2000, help="Calls per repeat")
+    args = parser.parse_args()
+
+    content = build_payload(args.days)
+    legacy = legacy_parse(content)
+    cached = fast_parse(content)
+    cached.daily_json()
+
+    assert orjson.loads(legacy_render(legacy)) == orjson.loads(fast_render(cached))
+
+    print(f"forecast with {args.days} days, {len(content)} bytes upstream payload\n")
+    for label, (old, new, arg_old, arg_new) in {
+        "parse": (legacy_parse, fast_parse, content, content),
+        "render (cached)": (legacy_render, fast_render, legacy, cached),
+    }.items():
+        old_time, old_peak = measure(f"{label} old", old, arg_old, args.number)
+        new_time, new_peak = measure(f"{label} new", new, arg_new, args.number)
+        speedup, saving = old_time / new_time, old_peak / new_peak
+        print(f"{'':<20} {speedup:>9.1f}x faster, {saving:.1f}x less peak\n")
+
+
+if __name__ == "__main__":
+    main()
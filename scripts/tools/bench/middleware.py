@@ -0,0 +1,177 @@
+"""
+Benchmark per-request middleware overhead on /api/health
+
+Compares the previous BaseHTTPMiddleware stack with the pure ASGI
+middlewares used by the app. Requests are sent straight to the ASGI app,
+each stack gets a valid session cookie in its own format and /api/health
+is made a session path for the new stack, so both do the session lookup.
+The session repository, session store and request logging are stubbed so
+only the middleware cost is measured
+
+Usage:
+    python scripts/tools/bench/middleware.py [--requests 5000]
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.append(os.path.join(root, "src"))
+os.chdir(root)
+os.environ.setdefault("USE_TEST_CONFIG", "1")
+
+from fastapi import APIRouter, FastAPI, Request  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from app.core.api.main.routes import main_routes  # noqa: E402
+from app.core.utils import session_utils  # noqa: E402
+from app.core.connectors.db.sql import session_repo  # noqa: E402
+from app.core.connectors.db.redis import session_store  # noqa: E402
+from app.core.connectors.logging import logger  # noqa: E402
+from app.core.middlewares import (  # noqa: E402
+    LoggingMiddleware,
+    RequestParamsMiddleware,
+    SessionMiddleware,
+)
+
+
+class LegacyRequestParamsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid.uuid4())
+        client_ip = request.headers.get("X-Original-Forwarded-For") or request.client.host
+        request.state.request_id = request_id
+        request.state.client_ip = client_ip
+        request.state.traceback = None
+
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        logger.info(
+            {
+                "type": "request",
+                "request_id": request.state.request_id,
+                "client_ip": request.state.client_ip,
+                "method": request.method,
+                "path": request.url.path,
+                "status_code": response.status_code,
+                "duration": round(time.time() - start_time, 4),
+            }
+        )
+        return response
+
+
+class LegacySessionMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        session_data = json.loads(request.cookies["Session"])
+        expiry_date = datetime.fromisoformat(session_data["expiry"])
+        if expiry_date > datetime.now(UTC) and await session_repo.get_session(
+            session_data["session_id"]
+        ):
+            request.state.session_id = session_data["session_id"]
+        return await call_next(request)
+
+
+def build_app(middlewares: list[tuple[type, dict]]) -> FastAPI:
+    app = FastAPI()
+    router = APIRouter(prefix="/api")
+    router.include_router(main_routes.router)
+    app.include_router(router)
+    for middleware, options in middlewares:
+        app.add_middleware(middleware, **options)
+    return app
+
+
+def build_scope(cookie: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/health",
+        "raw_path": b"/api/health",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost"), (b"cookie", f"Session={cookie}".encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 80),
+    }
+
+
+async def measure(name: str, app: FastAPI, cookie: str, requests: int) -> float:
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    messages = []
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    async def run(count: int) -> float:
+        started = time.perf_counter()
+        for _ in range(count):
+            await app(build_scope(cookie), receive, send)
+        return (time.perf_counter() - started) / count
+
+    await run(200)
+    assert messages[0]["status"] == 200
+    assert not any(name == b"set-cookie" for name, _ in messages[0]["headers"])
+
+    seconds = min([await run(requests) for _ in range(5)])
+    print(f"{name:<12} {seconds * 1e6:>9.1f} us/request")
+    return seconds
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per repeat")
+    args = parser.parse_args()
+
+    session_id = str(uuid.uuid4())
+    expires_at = datetime.now(UTC) + timedelta(days=1)
+    legacy_cookie = json.dumps({"session_id": session_id, "expiry": expires_at.isoformat()})
+    legacy_cookie = '"' + legacy_cookie.replace('"', '\\"') + '"'
+    cookie = session_utils.sign(session_id, expires_at)
+
+    stack = [
+        (SessionMiddleware, {"paths": ["/api/health"]}),
+        (LoggingMiddleware, {}),
+        (RequestParamsMiddleware, {}),
+    ]
+    legacy_stack = [
+        (LegacySessionMiddleware, {}),
+        (LegacyLoggingMiddleware, {}),
+        (LegacyRequestParamsMiddleware, {}),
+    ]
+
+    with (
+        patch.object(session_repo, "get_session", AsyncMock(return_value=True)),
+        patch.object(session_store, "validate", AsyncMock(return_value=True)),
+        patch.object(logger, "info"),
+    ):
+        bare = await measure("no stack", build_app([]), cookie, args.requests)
+        old = await measure("old stack", build_app(legacy_stack), legacy_cookie, args.requests)
+        new = await measure("new stack", build_app(stack), cookie, args.requests)
+
+    print(
+        f"\nmiddleware overhead: {(old - bare) * 1e6:.1f} us -> {(new - bare) * 1e6:.1f} us "
+        f"({(old - bare) / (new - bare):.1f}x less)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,5 @@
+from .cities import CitiesRoutes
 from .services import ServicesRoutes
 
+cities_routes = CitiesRoutes()
 services_routes = ServicesRoutes()
@@ -0,0 +1,111 @@
+from typing import Literal
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse
+
+from app.core.geo import gazetteer
+from app.core.caches import trending_cities
+from app.core.connectors.config import config
+from app.core.models.cities import (
+    CitySuggestion,
+    CitySuggestionListResponse,
+    TrendingCity,
+    TrendingCityListResponse,
+)
+
+
+class CitiesRoutes:
+    """
+    Cities routes class
+    """
+
+    def __init__(self):
+        self.router = APIRouter(tags=["Cities Routes"])
+        self.__set_routes()
+        self.__set_trending_routes()
+
+    def __set_routes(self) -> None:
+        """
+        Cities API routes
+        """
+
+        @self.router.get(
+            "/cities/suggest",
+            response_class=JSONResponse,
+            status_code=200,
+            description="Suggest cities by name prefix",
+        )
+        async def suggest(
+            q: str = Query(min_length=1, max_length=100, description="City name prefix"),
+            limit: int = Query(default=5, ge=1, le=10, description="Maximum suggestions"),
+        ):
+            """
+            Suggest cities by name prefix, most populated first
+
+            Args:
+                q (str): City name prefix
+                limit (int): Maximum number of suggestions
+
+            Returns:
+                JSONResponse: List of suggested cities
+            """
+
+            suggestions = []
+            for city_id in gazetteer.suggest(q, limit):
+                location = gazetteer.location(city_id)
+                suggestions.append(
+                    CitySuggestion(
+                        **location.model_dump(), population=gazetteer.population(city_id)
+                    )
+                )
+
+            response = CitySuggestionListResponse(suggestions=suggestions)
+
+            return JSONResponse(
+                status_code=200,
+                content=response.model_dump(),
+                headers={"Cache-Control": "public, max-age=3600"},
+            )
+
+    def __set_trending_routes(self) -> None:
+        """
+        Trending cities API routes
+        """
+
+        @self.router.get(
+            "/cities/trending",
+            response_class=JSONResponse,
+            status_code=200,
+            description="Get most looked up cities",
+        )
+        async def trending(
+            window: Literal["1h", "6h", "24h"] = Query("24h", description="Time window"),
+            limit: int = Query(
+                default=10,
+                ge=1,
+                le=config.trending_max_results,
+                description="Maximum cities",
+            ),
+        ):
+            """
+            Get most looked up cities in the window
+
+            Args:
+                window (str): Time window (1h, 6h, 24h)
+                limit (int): Maximum number of cities
+
+            Returns:
+                JSONResponse: List of trending cities
+            """
+
+            cities = [
+                TrendingCity(**location.model_dump(), lookups=lookups)
+                for location, lookups in await trending_cities.top(window, limit)
+            ]
+
+            response = TrendingCityListResponse(window=window, cities=cities)
+
+            return JSONResponse(
+                status_code=200,
+                content=response.model_dump(),
+                headers={"Cache-Control": f"public, max-age={config.trending_cache_ttl}"},
+            )
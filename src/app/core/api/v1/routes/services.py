@@ -1,13 +1,25 @@
-import json
+import orjson
 
-from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from typing import Literal
+from traceback import format_exc
+from collections.abc import AsyncIterator
+from fastapi import APIRouter, BackgroundTasks, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
 from app.core.utils import weather_utils
+from app.core.caches import trending_cities
 from app.core.decorators import require_auth
+from app.core.connectors.config import config
+from app.core.connectors.logging import logger
+from app.core.connectors.db.sql import history_repo, history_writer
 from app.core.connectors.db.sql.models import History
-from app.core.models.weather import WeatherListResponse
-from app.core.connectors.db.sql.repositories import HistoryRepository
+from app.core.models.hourly import HOURLY_VARIABLES, AGGREGATES, MAX_DAYS
+from app.core.models.weather import (
+    LocationInfo,
+    WeatherListResponse,
+    WeatherBatchRequest,
+    WeatherBatchResponse,
+)
 from app.core.models.history import HistoryResponse, HistoryListResponse
 
 
@@ -18,23 +30,58 @@ class ServicesRoutes:
 
     def __init__(self):
         self.router = APIRouter(tags=["Services Routes"])
-        self.__set_routes()
+        self.__set_weather_routes()
+        self.__set_hourly_routes()
+        self.__set_history_routes()
 
-    def __set_routes(self) -> None:
+    def __set_weather_routes(self) -> None:
         """
-        Services API routes
+        Weather API routes
         """
 
+        @self.router.get(
+            "/weather/coords",
+            response_class=JSONResponse,
+            status_code=200,
+            description="Get weather for coordinates",
+        )
+        async def weather_coords(
+            lat: float = Query(ge=-90, le=90, description="Latitude"),
+            lon: float = Query(ge=-180, le=180, description="Longitude"),
+        ):
+            """
+            Get weather for coordinates, skipping geocoding
+
+            Args:
+                lat (float): Latitude
+                lon (float): Longitude
+
+            Returns:
+                JSONResponse: Weather for coordinates
+            """
+
+            location = LocationInfo(name="", country="", latitude=lat, longitude=lon)
+            forecast, cache_status = await weather_utils.get_forecast_with_state(location)
+
+            return Response(
+                status_code=200,
+                content=WeatherListResponse.encode(f"Weather for {lat}, {lon}", forecast),
+                media_type="application/json",
+                headers={"X-Cache-Status": cache_status},
+            )
+
         @self.router.get(
             "/weather/{city}",
             response_class=JSONResponse,
             status_code=200,
             description="Get weather for a city",
         )
-        async def weather(city: str, request: Request):
+        async def weather(city: str, request: Request, background_tasks: BackgroundTasks):
             """
             Get weather for a city
 
+            The trending counter is updated after the response is sent
+
             Returns:
                 JSONResponse: Weather for a city
             """
@@ -46,21 +93,14 @@ class ServicesRoutes:
                     content={"status": "error", "message": "city not found"},
                 )
 
-            forecast = await weather_utils.get_weekly_forecast(location)
-            response = WeatherListResponse(
-                message=f"Weather for {city}",
-                weather=forecast,
-            )
-
-            session_cookie = request.cookies.get("Session")
+            forecast, cache_status = await weather_utils.get_forecast_with_state(location)
+            background_tasks.add_task(trending_cities.record, location)
 
-            if session_cookie:
-                session_data = json.loads(session_cookie)
-                session_id = session_data.get("session_id")
-
-                await HistoryRepository().add(
+            session = getattr(request.state, "session", None)
+            if session is not None:
+                history_writer.submit(
                     History(
-                        session_id=session_id,
+                        session_id=session.session_id,
                         city=city,
                         country=location.country,
                         latitude=location.latitude,
@@ -68,48 +108,252 @@ class ServicesRoutes:
                     )
                 )
 
-            return JSONResponse(
+            return Response(
+                status_code=200,
+                content=WeatherListResponse.encode(f"Weather for {city}", forecast),
+                media_type="application/json",
+                headers={"X-Cache-Status": cache_status},
+            )
+
+        @self.router.post(
+            "/weather/batch",
+            response_class=JSONResponse,
+            status_code=200,
+            description="Get weather for a list of cities or coordinates",
+        )
+        async def weather_batch(payload: WeatherBatchRequest):
+            """
+            Get weather for a list of cities or coordinates
+
+            Args:
+                payload (WeatherBatchRequest): Cities and coordinates
+
+            Returns:
+                JSONResponse: Weather for every resolved location
+            """
+
+            total = len(payload.cities) + len(payload.coordinates)
+            if total == 0 or total > config.batch_max_items:
+                return JSONResponse(
+                    status_code=400,
+                    content={
+                        "status": "error",
+                        "message": f"batch must contain 1 to {config.batch_max_items} items",
+                    },
+                )
+
+            locations = []
+            not_found = []
+
+            geocoded = await weather_utils.get_locations(payload.cities)
+            for city, location in zip(payload.cities, geocoded, strict=True):
+                if location is None:
+                    not_found.append(city)
+                else:
+                    locations.append(location)
+
+            locations.extend(
+                LocationInfo(
+                    name="",
+                    country="",
+                    latitude=coordinates.latitude,
+                    longitude=coordinates.longitude,
+                )
+                for coordinates in payload.coordinates
+            )
+
+            weather = await weather_utils.get_batch_forecast(locations)
+
+            return Response(
+                status_code=200,
+                content=WeatherBatchResponse.encode(
+                    f"Weather for {len(locations)} locations", weather, not_found
+                ),
+                media_type="application/json",
+            )
+
+    def __set_hourly_routes(self) -> None:
+        """
+        Hourly weather API routes
+        """
+
+        @self.router.get(
+            "/weather/{city}/hourly",
+            response_class=JSONResponse,
+            status_code=200,
+            description="Get hourly weather for a city",
+        )
+        async def weather_hourly(
+            city: str,
+            variables: str = Query("temperature_2m", description="Comma-separated variables"),
+            resolution: Literal["1h", "3h", "1d"] = Query("1h", description="Time resolution"),
+            aggregates: str = Query("mean", description="Comma-separated aggregates (3h, 1d)"),
+            days: int = Query(7, ge=1, le=MAX_DAYS, description="Number of days"),
+        ):
+            """
+            Get hourly weather for a city, optionally downsampled
+
+            Args:
+                city (str): City name
+                variables (str): Hourly variables
+                resolution (str): Time resolution (1h, 3h, 1d)
+                aggregates (str): Aggregates for downsampled resolutions
+                days (int): Number of days
+
+            Returns:
+                JSONResponse: Hourly weather for a city
+            """
+
+            requested_variables = self.__parse_list(variables, HOURLY_VARIABLES)
+            requested_aggregates = self.__parse_list(aggregates, AGGREGATES)
+            if not requested_variables or not requested_aggregates:
+                return JSONResponse(
+                    status_code=400,
+                    content={
+                        "status": "error",
+                        "message": (
+                            f"variables must be some of {', '.join(HOURLY_VARIABLES)}, "
+                            f"aggregates must be some of {', '.join(AGGREGATES)}"
+                        ),
+                    },
+                )
+
+            location = await weather_utils.get_location(city)
+            if location is None:
+                return JSONResponse(
+                    status_code=404,
+                    content={"status": "error", "message": "city not found"},
+                )
+
+            series = await weather_utils.get_hourly_forecast(location)
+            hourly = series.aggregate(requested_variables, resolution, requested_aggregates, days)
+
+            return Response(
                 status_code=200,
-                content=response.model_dump(),
+                content=orjson.dumps(
+                    {
+                        "status": "success",
+                        "message": f"Hourly weather for {city}",
+                        "weather": {
+                            "latitude": location.latitude,
+                            "longitude": location.longitude,
+                            "city": location.name,
+                            "country": location.country,
+                            "resolution": resolution,
+                            **hourly,
+                        },
+                    },
+                    option=orjson.OPT_SERIALIZE_NUMPY,
+                ),
+                media_type="application/json",
             )
 
+    @staticmethod
+    def __parse_list(value: str, allowed: tuple[str, ...]) -> list[str] | None:
+        """
+        Parse comma-separated query value
+
+        Args:
+            value (str): Comma-separated values
+            allowed (tuple[str, ...]): Allowed values
+
+        Returns:
+            list[str] | None: Unique values in request order, None if any is not allowed
+        """
+
+        values = list(dict.fromkeys(item.strip() for item in value.split(",") if item.strip()))
+        if any(item not in allowed for item in values):
+            return None
+        return values
+
+    def __set_history_routes(self) -> None:
+        """
+        History API routes
+        """
+
         @self.router.get(
             "/history/{session_id}",
             response_class=JSONResponse,
             status_code=200,
-            description="Get history",
+            description="Get history, newest first",
         )
         @require_auth()
-        async def history(session_id: str):
+        async def history(
+            session_id: str,
+            after: int | None = Query(
+                default=None, ge=1, description="Return records older than this id"
+            ),
+            limit: int = Query(
+                default=config.history_page_size,
+                ge=1,
+                le=config.history_page_max,
+                description="Page size",
+            ),
+            stream: bool = Query(default=False, description="Stream all records as NDJSON"),
+        ):
             """
             Get history
+
+            A page is a keyset read on (session_id, id): `next_after` is the
+            cursor for the following page. With `stream` every record older
+            than `after` is sent as newline-delimited JSON, read in chunks of
+            `history_stream_chunk_size` rows
             """
 
-            history = await HistoryRepository().get_history(session_id)
+            if stream:
+                return StreamingResponse(
+                    self.__stream_history(session_id, after),
+                    media_type="application/x-ndjson",
+                )
+
+            history = await history_repo.get_history(session_id, after, limit)
             if history is None:
                 return JSONResponse(
                     status_code=404,
                     content={"status": "error", "message": "history not found"},
                 )
 
-            history_list = [
-                HistoryResponse(
-                    id=h.id,
-                    session_id=h.session_id,
-                    city=h.city,
-                    country=h.country,
-                    latitude=float(h.latitude),
-                    longitude=float(h.longitude),
-                )
-                for h in history
-            ]
-
             response = HistoryListResponse(
                 message="history found",
-                history=history_list,
+                history=[HistoryResponse(**h._asdict()) for h in history],
+                next_after=history[-1].id if len(history) == limit else None,
             )
 
-            return JSONResponse(
+            return Response(
                 status_code=200,
-                content=response.model_dump(),
+                content=orjson.dumps(response.model_dump()),
+                media_type="application/json",
+            )
+
+    @staticmethod
+    async def __stream_history(session_id: str, after: int | None) -> AsyncIterator[bytes]:
+        """
+        Encode history chunks as newline-delimited JSON
+
+        The status is already sent when a chunk fails, so the stream ends
+        with an error line instead of looking complete
+
+        Args:
+            session_id (str): Session ID
+            after (int | None): Start with records older than this id
+
+        Yields:
+            bytes: One JSON line per record
+        """
+
+        try:
+            async for rows in history_repo.stream_history(
+                session_id, after, config.history_stream_chunk_size
+            ):
+                yield b"".join(orjson.dumps(row._asdict()) + b"\n" for row in rows)
+        except Exception as e:
+            logger.error(
+                {
+                    "service": "stream_history",
+                    "message": "error streaming history",
+                    "session_id": session_id,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
             )
+            yield orjson.dumps({"status": "error", "message": "error reading history"}) + b"\n"
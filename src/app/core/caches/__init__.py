@@ -0,0 +1,12 @@
+from .lru import LRUCache, MISSING
+from .geocoding import GeocodingCache, normalize_city
+from .singleflight import SingleFlight
+from .forecast import ForecastCache, seconds_until_refresh, snap, FRESH, STALE, REFRESHED
+from .hourly import HourlyCache
+from .trending import TrendingCities, WINDOWS
+
+geocoding_cache = GeocodingCache()
+forecast_cache = ForecastCache()
+hourly_cache = HourlyCache()
+trending_cities = TrendingCities()
+single_flight = SingleFlight()
@@ -0,0 +1,188 @@
+import time
+
+from traceback import format_exc
+from pydantic import BaseModel, Field
+
+from .lru import LRUCache, MISSING
+from app.core.metrics import app_metrics
+from app.core.connectors.config import config
+from app.core.connectors.logging import logger
+from app.core.models.weather import WeatherResponse
+from app.core.connectors.db.redis import redis_connector
+
+FRESH = "fresh"
+STALE = "stale"
+REFRESHED = "refreshed"
+
+
+def snap(value: float, resolution: float) -> float:
+    """
+    Snap coordinate to the nearest grid point
+
+    Args:
+        value (float): Latitude or longitude
+        resolution (float): Grid resolution in degrees
+
+    Returns:
+        float: Snapped coordinate
+    """
+
+    if resolution <= 0:
+        return round(value, 4)
+    return round(round(value / resolution) * resolution, 4)
+
+
+def seconds_until_refresh(now: float | None = None) -> int:
+    """
+    Get number of seconds until the next upstream model refresh
+
+    Model runs are published every `forecast_update_interval` seconds,
+    `forecast_update_offset` seconds after each interval boundary (UTC)
+
+    Args:
+        now (float | None): Current unix timestamp
+
+    Returns:
+        int: Seconds until the next refresh, at least `forecast_min_ttl`
+    """
+
+    now = time.time() if now is None else now
+    interval = config.forecast_update_interval
+    offset = config.forecast_update_offset
+
+    next_refresh = ((now - offset) // interval + 1) * interval + offset
+    return max(int(next_refresh - now), config.forecast_min_ttl)
+
+
+class CachedForecast(BaseModel):
+    """
+    Cached forecast envelope
+    """
+
+    expires_at: float = Field(description="Unix timestamp of the next model refresh")
+    forecast: WeatherResponse = Field(description="Parsed forecast")
+
+
+class ForecastCache:
+    """
+    Two-tier forecast cache keyed on grid-snapped coordinates
+    """
+
+    def __init__(self):
+        self.__local = LRUCache(config.forecast_cache_size)
+        self.__resolution = config.forecast_grid_resolution
+        self.__grace = config.forecast_stale_grace
+
+    def cell(self, latitude: float, longitude: float) -> tuple[float, float]:
+        """
+        Get grid cell for coordinates
+
+        Args:
+            latitude (float): Latitude
+            longitude (float): Longitude
+
+        Returns:
+            tuple[float, float]: Snapped latitude and longitude
+        """
+
+        return snap(latitude, self.__resolution), snap(longitude, self.__resolution)
+
+    @staticmethod
+    def key(latitude: float, longitude: float) -> str:
+        """
+        Build cache key for a grid cell
+
+        Args:
+            latitude (float): Snapped latitude
+            longitude (float): Snapped longitude
+
+        Returns:
+            str: Cache key
+        """
+
+        return f"forecast:{latitude:.4f}:{longitude:.4f}"
+
+    async def get(
+        self, latitude: float, longitude: float
+    ) -> tuple[WeatherResponse | None, str | None]:
+        """
+        Get cached forecast for a grid cell
+
+        Entries are kept for `forecast_stale_grace` seconds past the model
+        refresh and reported as stale during that window
+
+        Args:
+            latitude (float): Snapped latitude
+            longitude (float): Snapped longitude
+
+        Returns:
+            tuple[WeatherResponse | None, str | None]: Forecast and its state
+                (fresh, stale), or (None, None) on miss
+        """
+
+        key = self.key(latitude, longitude)
+
+        entry = self.__local.get(key)
+        if entry is not MISSING:
+            app_metrics.record_cache_lookup("forecast", "local", "hit")
+        else:
+            try:
+                data = await redis_connector.get(key)
+            except Exception as e:
+                logger.error(
+                    {
+                        "type": "cache",
+                        "service": "forecast",
+                        "key": key,
+                        "error": str(e),
+                        "traceback": format_exc(),
+                    }
+                )
+                data = None
+
+            if data is None:
+                app_metrics.record_cache_lookup("forecast", "redis", "miss")
+                return None, None
+
+            app_metrics.record_cache_lookup("forecast", "redis", "hit")
+
+            entry = CachedForecast.model_validate_json(data)
+            remaining = entry.expires_at + self.__grace - time.time()
+            if remaining <= 0:
+                return None, None
+            entry.forecast.daily_json()
+            self.__local.set(key, entry, remaining)
+
+        state = FRESH if entry.expires_at > time.time() else STALE
+        return entry.forecast, state
+
+    async def set(self, latitude: float, longitude: float, forecast: WeatherResponse) -> None:
+        """
+        Cache forecast for a grid cell until the next model refresh
+
+        Args:
+            latitude (float): Snapped latitude
+            longitude (float): Snapped longitude
+            forecast (WeatherResponse): Parsed forecast
+        """
+
+        key = self.key(latitude, longitude)
+        ttl = seconds_until_refresh()
+        entry = CachedForecast(expires_at=time.time() + ttl, forecast=forecast)
+
+        # Encode once here, localized copies served from this entry reuse the bytes
+        forecast.daily_json()
+        self.__local.set(key, entry, ttl + self.__grace)
+
+        try:
+            await redis_connector.set(key, entry.model_dump_json(), ex=ttl + self.__grace)
+        except Exception as e:
+            logger.error(
+                {
+                    "type": "cache",
+                    "service": "forecast",
+                    "key": key,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
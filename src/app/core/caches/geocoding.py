@@ -0,0 +1,157 @@
+import unicodedata
+
+from traceback import format_exc
+
+from .lru import LRUCache, MISSING
+from app.core.metrics import app_metrics
+from app.core.connectors.config import config
+from app.core.connectors.logging import logger
+from app.core.models.weather import LocationInfo
+from app.core.connectors.db.redis import redis_connector
+
+NOT_FOUND = "null"
+
+
+def normalize_city(city_name: str) -> str:
+    """
+    Normalize city name for use as a cache key
+
+    Args:
+        city_name (str): Raw city name
+
+    Returns:
+        str: Unicode-normalized, case-folded name with collapsed whitespace
+    """
+
+    return " ".join(unicodedata.normalize("NFKC", city_name).casefold().split())
+
+
+class GeocodingCache:
+    """
+    Two-tier geocoding cache: in-process LRU in front of Redis
+    """
+
+    def __init__(self):
+        self.__local = LRUCache(config.geocoding_cache_size)
+        self.__ttl = config.geocoding_cache_ttl
+        self.__local_ttl = config.geocoding_local_cache_ttl
+        self.__negative_ttl = config.geocoding_negative_cache_ttl
+
+    @staticmethod
+    def key(city_name: str) -> str:
+        """
+        Build cache key for a city
+
+        Args:
+            city_name (str): City name
+
+        Returns:
+            str: Cache key
+        """
+
+        return f"geocoding:{normalize_city(city_name)}"
+
+    async def get(self, city_name: str) -> tuple[bool, LocationInfo | None]:
+        """
+        Get cached location
+
+        Args:
+            city_name (str): City name
+
+        Returns:
+            tuple[bool, LocationInfo | None]: Hit flag and location, None for cached misses
+        """
+
+        key = self.key(city_name)
+
+        location = self.__local.get(key)
+        if location is not MISSING:
+            app_metrics.record_cache_lookup("geocoding", "local", "hit")
+            return True, location
+
+        try:
+            data = await redis_connector.get(key)
+        except Exception as e:
+            logger.error(
+                {
+                    "type": "cache",
+                    "service": "geocoding",
+                    "key": key,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
+            data = None
+
+        if data is None:
+            app_metrics.record_cache_lookup("geocoding", "redis", "miss")
+            return False, None
+
+        app_metrics.record_cache_lookup("geocoding", "redis", "hit")
+
+        if data == NOT_FOUND:
+            self.__local.set(key, None, min(self.__local_ttl, self.__negative_ttl))
+            return True, None
+
+        location = LocationInfo.model_validate_json(data)
+        self.__local.set(key, location, self.__local_ttl)
+        return True, location
+
+    async def ttl(self, city_name: str) -> int | None:
+        """
+        Get remaining lifetime of the shared entry
+
+        Args:
+            city_name (str): City name
+
+        Returns:
+            int | None: Seconds until expiry, negative if the entry is missing,
+                None if Redis cannot be reached
+        """
+
+        key = self.key(city_name)
+
+        try:
+            return await redis_connector.ttl(key)
+        except Exception as e:
+            logger.error(
+                {
+                    "type": "cache",
+                    "service": "geocoding",
+                    "key": key,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
+            return None
+
+    async def set(self, city_name: str, location: LocationInfo | None) -> None:
+        """
+        Cache location, or a negative entry when the city was not found
+
+        Args:
+            city_name (str): City name
+            location (LocationInfo | None): Location or None if not found
+        """
+
+        key = self.key(city_name)
+
+        if location is None:
+            ttl, value = self.__negative_ttl, NOT_FOUND
+            self.__local.set(key, None, min(self.__local_ttl, self.__negative_ttl))
+        else:
+            ttl, value = self.__ttl, location.model_dump_json()
+            self.__local.set(key, location, self.__local_ttl)
+
+        try:
+            await redis_connector.set(key, value, ex=ttl)
+        except Exception as e:
+            logger.error(
+                {
+                    "type": "cache",
+                    "service": "geocoding",
+                    "key": key,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
@@ -0,0 +1,104 @@
+from traceback import format_exc
+
+from .lru import LRUCache, MISSING
+from .forecast import seconds_until_refresh
+from app.core.metrics import app_metrics
+from app.core.connectors.config import config
+from app.core.connectors.logging import logger
+from app.core.models.hourly import HourlySeries
+from app.core.connectors.db.redis import redis_connector
+
+
+class HourlyCache:
+    """
+    Two-tier hourly forecast cache keyed on grid-snapped coordinates
+    """
+
+    def __init__(self):
+        self.__local = LRUCache(config.hourly_cache_size)
+
+    @staticmethod
+    def key(latitude: float, longitude: float) -> str:
+        """
+        Build cache key for a grid cell
+
+        Args:
+            latitude (float): Snapped latitude
+            longitude (float): Snapped longitude
+
+        Returns:
+            str: Cache key
+        """
+
+        return f"hourly:{latitude:.4f}:{longitude:.4f}"
+
+    async def get(self, latitude: float, longitude: float) -> HourlySeries | None:
+        """
+        Get cached hourly series for a grid cell
+
+        Args:
+            latitude (float): Snapped latitude
+            longitude (float): Snapped longitude
+
+        Returns:
+            HourlySeries | None: Hourly series or None on miss
+        """
+
+        key = self.key(latitude, longitude)
+
+        series = self.__local.get(key)
+        if series is not MISSING:
+            app_metrics.record_cache_lookup("hourly", "local", "hit")
+            return series
+
+        try:
+            data = await redis_connector.get(key)
+        except Exception as e:
+            logger.error(
+                {
+                    "type": "cache",
+                    "service": "hourly",
+                    "key": key,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
+            data = None
+
+        if data is None:
+            app_metrics.record_cache_lookup("hourly", "redis", "miss")
+            return None
+
+        app_metrics.record_cache_lookup("hourly", "redis", "hit")
+
+        series = HourlySeries.from_json(data)
+        self.__local.set(key, series, seconds_until_refresh())
+        return series
+
+    async def set(self, latitude: float, longitude: float, series: HourlySeries) -> None:
+        """
+        Cache hourly series for a grid cell until the next model refresh
+
+        Args:
+            latitude (float): Snapped latitude
+            longitude (float): Snapped longitude
+            series (HourlySeries): Hourly series
+        """
+
+        key = self.key(latitude, longitude)
+        ttl = seconds_until_refresh()
+
+        self.__local.set(key, series, ttl)
+
+        try:
+            await redis_connector.set(key, series.to_json(), ex=ttl)
+        except Exception as e:
+            logger.error(
+                {
+                    "type": "cache",
+                    "service": "hourly",
+                    "key": key,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
@@ -0,0 +1,76 @@
+import time
+
+from typing import Any
+from collections import OrderedDict
+
+MISSING = object()
+
+
+class LRUCache:
+    """
+    In-process LRU cache with per-entry expiry
+    """
+
+    def __init__(self, maxsize: int):
+        self.__maxsize = maxsize
+        self.__data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        """
+        Get value from cache
+
+        Args:
+            key (str): Cache key
+            default (Any): Value returned on miss
+
+        Returns:
+            Any: Cached value or default
+        """
+
+        entry = self.__data.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self.__data[key]
+            return default
+
+        self.__data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Set value in cache, evicting the least recently used entry when full
+
+        Args:
+            key (str): Cache key
+            value (Any): Value to cache
+            ttl (float): Time to live in seconds
+        """
+
+        if self.__maxsize <= 0:
+            return
+
+        self.__data[key] = (time.monotonic() + ttl, value)
+        self.__data.move_to_end(key)
+
+        while len(self.__data) > self.__maxsize:
+            self.__data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """
+        Delete value from cache
+
+        Args:
+            key (str): Cache key
+        """
+
+        self.__data.pop(key, None)
+
+    def clear(self) -> None:
+        """Clear cache"""
+        self.__data.clear()
+
+    def __len__(self) -> int:
+        return len(self.__data)
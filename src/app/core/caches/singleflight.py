@@ -0,0 +1,167 @@
+import uuid
+import asyncio
+
+from functools import partial
+from traceback import format_exc
+from typing import Any, TypeVar
+from collections.abc import Callable, Awaitable
+
+from app.core.metrics import app_metrics
+from app.core.connectors.config import config
+from app.core.connectors.logging import logger
+from app.core.connectors.db.redis import redis_connector
+
+T = TypeVar("T")
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into a single in-flight call
+    """
+
+    def __init__(self):
+        self.__calls: dict[str, asyncio.Task] = {}
+        self.__distributed = config.singleflight_redis_lock
+        self.__lock_ttl = config.singleflight_lock_ttl
+        self.__lock_wait = config.singleflight_lock_wait / 1000
+        self.__lock_poll = config.singleflight_lock_poll / 1000
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run func once per key, concurrent callers await the shared result
+
+        The shared call runs in its own task, so a cancelled caller
+        does not cancel the call for the others
+
+        Args:
+            key (str): Coalescing key
+            func (Callable[[], Awaitable[T]]): Call to run
+
+        Returns:
+            T: Result of the shared call
+        """
+
+        task = self.__calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.__run(key, func))
+            task.add_done_callback(partial(self.__done, key))
+            self.__calls[key] = task
+            app_metrics.record_single_flight("leader")
+        else:
+            app_metrics.record_single_flight("follower")
+
+        return await asyncio.shield(task)
+
+    def __done(self, key: str, task: asyncio.Task) -> None:
+        """
+        Forget finished call
+
+        Args:
+            key (str): Coalescing key
+            task (asyncio.Task): Finished task
+        """
+
+        if self.__calls.get(key) is task:
+            del self.__calls[key]
+
+        if not task.cancelled():
+            task.exception()
+
+    async def __run(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run call, optionally holding a short Redis lock shared by all workers
+
+        When another worker holds the lock, wait until it is released
+        (or the wait times out) and run func, which is expected to
+        re-check the cache first
+
+        Args:
+            key (str): Coalescing key
+            func (Callable[[], Awaitable[T]]): Call to run
+
+        Returns:
+            T: Result of the call
+        """
+
+        if not self.__distributed:
+            return await func()
+
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+
+        try:
+            acquired = await redis_connector.set(lock_key, token, nx=True, px=self.__lock_ttl)
+        except Exception as e:
+            logger.error(
+                {
+                    "type": "single_flight",
+                    "key": lock_key,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
+            return await func()
+
+        if acquired:
+            try:
+                return await func()
+            finally:
+                await self.__release(lock_key, token)
+
+        app_metrics.record_single_flight("lock_wait")
+        await self.__wait(lock_key)
+        return await func()
+
+    async def __wait(self, lock_key: str) -> None:
+        """
+        Wait until lock is released or wait timeout expires
+
+        Args:
+            lock_key (str): Lock key
+        """
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.__lock_wait
+
+        try:
+            while loop.time() < deadline:
+                if not await redis_connector.exists(lock_key):
+                    return
+                await asyncio.sleep(self.__lock_poll)
+        except Exception as e:
+            logger.error(
+                {
+                    "type": "single_flight",
+                    "key": lock_key,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
+
+    async def __release(self, lock_key: str, token: Any) -> None:
+        """
+        Release lock if it is still owned by this call
+
+        Args:
+            lock_key (str): Lock key
+            token (Any): Lock owner token
+        """
+
+        try:
+            await redis_connector.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except Exception as e:
+            logger.error(
+                {
+                    "type": "single_flight",
+                    "key": lock_key,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
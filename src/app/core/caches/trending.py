@@ -0,0 +1,136 @@
+import time
+import orjson
+
+from traceback import format_exc
+
+from .lru import LRUCache, MISSING
+from app.core.metrics import app_metrics
+from app.core.connectors.config import config
+from app.core.connectors.logging import logger
+from app.core.models.weather import LocationInfo
+from app.core.connectors.db.redis import trending_redis
+
+# Window name -> number of hourly buckets merged, the current hour included
+WINDOWS = {"1h": 1, "6h": 6, "24h": 24}
+BUCKET_SECONDS = 3600
+
+
+class TrendingCities:
+    """
+    Lookup counters kept in hourly Redis sorted sets
+
+    Every lookup is a ZINCRBY on the bucket of the current hour, so a write
+    is O(log N) whatever the history size. A window is read by merging its
+    buckets with ZUNIONSTORE, the merged ranking is kept in Redis and in
+    process for `trending_cache_ttl` seconds
+    """
+
+    def __init__(self):
+        self.__local = LRUCache(len(WINDOWS))
+
+    @staticmethod
+    def bucket(hour: int) -> str:
+        """
+        Build key of an hourly bucket
+
+        Args:
+            hour (int): Hours since the epoch
+
+        Returns:
+            str: Bucket key
+        """
+
+        return f"trending:bucket:{hour}"
+
+    async def record(self, location: LocationInfo) -> None:
+        """
+        Count a lookup of location in the current hour
+
+        Args:
+            location (LocationInfo): Looked up location
+        """
+
+        key = self.bucket(int(time.time() // BUCKET_SECONDS))
+        member = orjson.dumps(location.model_dump()).decode()
+
+        try:
+            async with trending_redis.pipeline(transaction=False) as pipe:
+                pipe.zincrby(key, 1, member)
+                pipe.expire(key, (max(WINDOWS.values()) + 1) * BUCKET_SECONDS)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(
+                {
+                    "type": "cache",
+                    "service": "trending",
+                    "key": key,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
+
+    async def top(self, window: str, limit: int) -> list[tuple[LocationInfo, int]]:
+        """
+        Get most looked up locations in window
+
+        Args:
+            window (str): Window name (1h, 6h, 24h)
+            limit (int): Maximum number of locations
+
+        Returns:
+            list[tuple[LocationInfo, int]]: Locations with lookup counts, most looked up first
+        """
+
+        ranking = self.__local.get(window)
+        if ranking is not MISSING:
+            app_metrics.record_cache_lookup("trending", "local", "hit")
+            return ranking[:limit]
+
+        app_metrics.record_cache_lookup("trending", "local", "miss")
+
+        ranking = [
+            (LocationInfo(**orjson.loads(member)), int(score))
+            for member, score in await self.__merge(window)
+        ]
+        self.__local.set(window, ranking, config.trending_cache_ttl)
+        return ranking[:limit]
+
+    async def __merge(self, window: str) -> list[tuple[str, float]]:
+        """
+        Merge hourly buckets of window into a short-lived ranking
+
+        Args:
+            window (str): Window name
+
+        Returns:
+            list[tuple[str, float]]: Members with scores, highest first
+        """
+
+        key = f"trending:window:{window}"
+        hour = int(time.time() // BUCKET_SECONDS)
+        buckets = [self.bucket(hour - offset) for offset in range(WINDOWS[window])]
+
+        try:
+            async with trending_redis.pipeline(transaction=False) as pipe:
+                pipe.exists(key)
+                pipe.zrevrange(key, 0, config.trending_max_results - 1, withscores=True)
+                cached, ranking = await pipe.execute()
+                if cached:
+                    return ranking
+
+                pipe.zunionstore(key, buckets)
+                pipe.expire(key, config.trending_cache_ttl)
+                pipe.zrevrange(key, 0, config.trending_max_results - 1, withscores=True)
+                *_, ranking = await pipe.execute()
+                return ranking
+        except Exception as e:
+            logger.error(
+                {
+                    "type": "cache",
+                    "service": "trending",
+                    "key": key,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
+            return []
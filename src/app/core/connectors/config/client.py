@@ -11,6 +11,8 @@ class Settings(BaseSettings):
 
     # Paths
     log_path: str
+    log_queue_size: int = 10000
+    log_queue_overflow: str = "drop_newest"
 
     # Redis config
     redis_host: str
@@ -24,6 +26,11 @@ class Settings(BaseSettings):
     vault_role_id: SecretStr
     vault_secret_id: SecretStr
 
+    # Secret provider
+    secrets_ttl: int = 300
+    secrets_refresh_ratio: float = 0.75
+    secrets_retry_interval: int = 30
+
     # API preferences
     api_prefix: str
 
@@ -33,11 +40,111 @@ class Settings(BaseSettings):
     db_name: str | None = None
     db_username: SecretStr | None = None
     db_password: SecretStr | None = None
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
 
     # External services
     openmeteo_api_url: str
     openmeteo_geocoding_api_url: str
 
+    # Upstream HTTP client
+    http2_enabled: bool = True
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http_connect_timeout: float = 5.0
+    http_read_timeout: float = 10.0
+    http_write_timeout: float = 10.0
+    http_pool_timeout: float = 5.0
+    http_retry_attempts: int = 2
+    http_retry_backoff: float = 0.1
+    http_retry_backoff_max: float = 1.0
+    http_retry_budget_ratio: float = 0.1
+    http_retry_budget_max: float = 10.0
+
+    # Upstream circuit breaker
+    circuit_failure_threshold: int = 5
+    circuit_slow_call_threshold: float = 5.0
+    circuit_slow_call_thresholds: dict[str, float] = {"geocoding": 2.0, "forecast": 5.0}
+    circuit_recovery_timeout: float = 30.0
+    circuit_half_open_max_calls: int = 1
+
+    # Upstream rate limiter
+    rate_limit_enabled: bool = True
+    rate_limit_name: str = "openmeteo"
+    rate_limit_rate: float = 10.0
+    rate_limit_burst: int = 10
+    rate_limit_max_wait: int = 2000
+    rate_limit_max_queue: int = 100
+    rate_limit_redis_db: int = 3
+
+    # Geocoding cache
+    geocoding_cache_size: int = 10000
+    geocoding_cache_ttl: int = 2592000
+    geocoding_local_cache_ttl: int = 86400
+    geocoding_negative_cache_ttl: int = 3600
+
+    # Forecast cache
+    forecast_cache_size: int = 2000
+    forecast_grid_resolution: float = 0.1
+    forecast_update_interval: int = 3600
+    forecast_update_offset: int = 300
+    forecast_min_ttl: int = 60
+    forecast_stale_grace: int = 600
+
+    # Hourly forecast cache
+    hourly_cache_size: int = 500
+
+    # Cache pre-warming
+    prewarm_enabled: bool = True
+    prewarm_interval: int = 300
+    prewarm_lookback: int = 24
+    prewarm_top_n: int = 100
+    prewarm_concurrency: int = 8
+    prewarm_refresh_ahead: int = 86400
+
+    # Trending cities
+    trending_cache_ttl: int = 30
+    trending_max_results: int = 50
+    trending_redis_db: int = 2
+
+    # Request coalescing
+    singleflight_redis_lock: bool = False
+    singleflight_lock_ttl: int = 5000
+    singleflight_lock_wait: int = 5000
+    singleflight_lock_poll: int = 50
+
+    # Offline gazetteer
+    gazetteer_enabled: bool = True
+    gazetteer_cities_path: str | None = None
+    gazetteer_countries_path: str | None = None
+    gazetteer_min_population: int = 0
+    gazetteer_suggest_limit: int = 10
+
+    # Batch requests
+    batch_max_items: int = 50
+    batch_geocoding_concurrency: int = 8
+    batch_forecast_chunk_size: int = 50
+
+    # History writer
+    history_queue_size: int = 1000
+    history_queue_overflow: str = "drop_oldest"
+    history_flush_timeout: float = 5.0
+    history_batch_size: int = 500
+    history_batch_interval: int = 200
+    history_page_size: int = 50
+    history_page_max: int = 500
+    history_stream_chunk_size: int = 500
+
+    # Sessions
+    # Route templates relative to /api/<api_prefix>, matched exactly
+    session_paths: list[str] = ["/weather/{city}"]
+    session_expiry_days: int = 7
+    session_sliding: bool = False
+    session_redis_db: int = 1
+
     # Frontend
     frontend_path: str
 
@@ -70,12 +177,11 @@ class Settings(BaseSettings):
             db_password = "test"
             db_name = "test"
         else:
-            from app.core.connectors.secrets import get_vault  # noqa
+            from app.core.connectors.secrets import secret_provider  # noqa
 
-            vault = get_vault()
-            db_username = vault.get_secret("db", "db_username")
-            db_password = vault.get_secret("db", "db_password")
-            db_name = vault.get_secret("db", "db_name")
+            db_username = secret_provider.get_cached("db", "db_username")
+            db_password = secret_provider.get_cached("db", "db_password")
+            db_name = secret_provider.get_cached("db", "db_name")
 
         return f"postgresql+asyncpg://{db_username}:{db_password}@{self.db_host}:{self.db_port}/{db_name}"
 
@@ -89,14 +195,43 @@ class Settings(BaseSettings):
         """
 
         if os.getenv("USE_TEST_CONFIG") != "1":
-            from app.core.connectors.secrets import get_vault
+            from app.core.connectors.secrets import secret_provider
 
-            vault = get_vault()
-            auth_token = vault.get_secret("access/authorization", "token")
+            auth_token = secret_provider.get_cached("access/authorization", "token")
         else:
             auth_token = "test"
         return auth_token
 
+    @property
+    def session_keys(self) -> tuple[str, dict[str, str]]:
+        """
+        Get the session token signing keys
+
+        The `session` secret maps key ids to keys, its `current` entry names
+        the key new tokens are signed with. Older keys stay valid for
+        verification until they are removed from the secret
+
+        Returns:
+            tuple[str, dict[str, str]]: Current key id and keys by id
+
+        Raises:
+            ValueError: The `session` secret has no `current` entry or no key for it
+        """
+
+        if os.getenv("USE_TEST_CONFIG") == "1":
+            return "test", {"test": "test"}
+
+        from app.core.connectors.secrets import secret_provider
+
+        data = secret_provider.get_cached_data("session")
+        keys = {key_id: key for key_id, key in data.items() if key_id != "current"}
+        current = data.get("current")
+        if current not in keys:
+            raise ValueError(
+                f"vault secret 'session' must map 'current' to one of its key ids, got {current!r}"
+            )
+        return current, keys
+
     model_config = SettingsConfigDict(
         env_file="tests/.env.test" if os.getenv("USE_TEST_CONFIG") == "1" else "config/.env",
         env_file_encoding="utf-8",
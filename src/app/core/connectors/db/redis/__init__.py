@@ -1,3 +1,12 @@
 from .client import RedisConnector
+from .session import SessionStore
+from app.core.connectors.config import config
 
 redis_connector = RedisConnector().redis
+# Sessions live in their own database, the cache database is flushed on shutdown
+session_redis = RedisConnector(db=config.session_redis_db).redis
+session_store = SessionStore(session_redis)
+# Trending counters outlive restarts, so they are kept out of the flushed database too
+trending_redis = RedisConnector(db=config.trending_redis_db).redis
+# Rate limit buckets are shared by all instances, a restart must not refill them
+rate_limit_redis = RedisConnector(db=config.rate_limit_redis_db).redis
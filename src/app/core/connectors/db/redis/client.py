@@ -16,9 +16,10 @@ class RedisConnector:
     Redis connector class
     """
 
-    def __init__(self):
+    def __init__(self, db: int = 0):
         self.__redis_host = config.redis_host
         self.__redis_port = config.redis_port
+        self.__redis_db = db
         self.__redis: redis.Redis | None = None
         self.__connect()
 
@@ -38,6 +39,7 @@ class RedisConnector:
             self.__redis = redis.Redis(
                 host=self.__redis_host,
                 port=self.__redis_port,
+                db=self.__redis_db,
                 decode_responses=True,
                 socket_timeout=5,
                 socket_connect_timeout=5,
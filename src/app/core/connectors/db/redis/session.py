@@ -0,0 +1,107 @@
+import redis.asyncio as redis
+
+from datetime import UTC, datetime
+from traceback import format_exc
+
+from app.core.connectors.logging import logger
+
+
+class SessionStore:
+    """
+    Session store backed by Redis hashes
+
+    Every session is a `session:<id>` hash whose TTL ends with the session
+    cookie, so expired sessions are removed by Redis itself
+    """
+
+    def __init__(self, client: redis.Redis):
+        self.__redis = client
+
+    @staticmethod
+    def key(session_id: str) -> str:
+        """
+        Build key of a session hash
+
+        Args:
+            session_id (str): Session ID
+
+        Returns:
+            str: Session key
+        """
+
+        return f"session:{session_id}"
+
+    async def create(self, session_id: str, user_ip: str | None, expires_at: datetime) -> bool:
+        """
+        Store new session until its expiry
+
+        Args:
+            session_id (str): Session ID
+            user_ip (str | None): Client IP
+            expires_at (datetime): Session expiry
+
+        Returns:
+            bool: True if the session was stored
+        """
+
+        key = self.key(session_id)
+
+        try:
+            async with self.__redis.pipeline(transaction=True) as pipe:
+                pipe.hset(
+                    key,
+                    mapping={
+                        "user_ip": user_ip or "",
+                        "created_at": datetime.now(UTC).isoformat(),
+                    },
+                )
+                pipe.expireat(key, expires_at)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(
+                {
+                    "type": "session_store",
+                    "key": key,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
+            return False
+
+    async def validate(self, session_id: str, ttl: int | None = None) -> bool:
+        """
+        Check that session is still stored, optionally extending its lifetime
+
+        Redis errors reject the session, a session that cannot be checked is
+        not trusted even if its token is valid
+
+        Args:
+            session_id (str): Session ID
+            ttl (int | None): New lifetime in seconds for sliding expiration
+
+        Returns:
+            bool: True if the session exists, False if it does not or Redis failed
+        """
+
+        key = self.key(session_id)
+
+        try:
+            if ttl is None:
+                return bool(await self.__redis.exists(key))
+
+            async with self.__redis.pipeline(transaction=False) as pipe:
+                pipe.exists(key)
+                pipe.expire(key, ttl)
+                exists, _ = await pipe.execute()
+            return bool(exists)
+        except Exception as e:
+            logger.error(
+                {
+                    "type": "session_store",
+                    "key": key,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
+            return False
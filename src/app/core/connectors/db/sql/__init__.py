@@ -1,5 +1,9 @@
 from .models import *
+from .connector import SQLConnector
 from .repositories import *
+from .writer import HistoryWriter
 
-session_repo = SessionRepository()
-history_repo = HistoryRepository()
+sql_connector = SQLConnector()
+session_repo = SessionRepository(sql_connector)
+history_repo = HistoryRepository(sql_connector)
+history_writer = HistoryWriter(history_repo)
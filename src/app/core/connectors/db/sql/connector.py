@@ -1,8 +1,14 @@
 from typing import Any
 from traceback import format_exc
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import (
+    create_async_engine,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+)
 
+from app.core.metrics import app_metrics
 from app.core.connectors.config import config
 from app.core.connectors.logging import logger
 
@@ -12,21 +18,78 @@ Base = declarative_base()
 
 class SQLConnector:
     """
-    SQL connector
+    SQL connector holding the process-wide engine and sessionmaker
     """
 
     def __init__(self):
-        self.engine = create_async_engine(
-            url=config.db_url, echo=False, pool_pre_ping=True, pool_size=20, max_overflow=10
+        self.__engine: AsyncEngine | None = None
+        self.__session: async_sessionmaker[AsyncSession] | None = None
+        self.Base = Base
+
+    @property
+    def engine(self) -> AsyncEngine:
+        """Get engine, created on first use"""
+        if self.__engine is None:
+            self.connect()
+        return self.__engine
+
+    @property
+    def session(self) -> async_sessionmaker[AsyncSession]:
+        """Get sessionmaker bound to the shared engine"""
+        if self.__session is None:
+            self.connect()
+        return self.__session
+
+    def connect(self) -> None:
+        """
+        Create engine with a connection pool and its sessionmaker
+        """
+
+        if self.__engine is not None:
+            return
+
+        self.__engine = create_async_engine(
+            url=config.db_url,
+            echo=False,
+            pool_pre_ping=True,
+            pool_size=config.db_pool_size,
+            max_overflow=config.db_max_overflow,
+            pool_timeout=config.db_pool_timeout,
+            pool_recycle=config.db_pool_recycle,
         )
-        self.session = async_sessionmaker(
-            bind=self.engine,
+        self.__session = async_sessionmaker(
+            bind=self.__engine,
             class_=AsyncSession,
             expire_on_commit=False,
             autocommit=False,
             autoflush=False,
         )
-        self.Base = Base
+        app_metrics.track_sql_pool(self.__engine.pool)
+
+    async def reconnect(self) -> None:
+        """
+        Replace engine, e.g. after database credentials were rotated
+
+        Sessions already running finish on the old engine before it is disposed
+        """
+
+        engine = self.__engine
+        self.__engine = None
+        self.__session = None
+        self.connect()
+
+        if engine is not None:
+            await engine.dispose()
+
+    async def dispose(self) -> None:
+        """
+        Close pooled connections and drop the engine
+        """
+
+        if self.__engine is not None:
+            await self.__engine.dispose()
+            self.__engine = None
+            self.__session = None
 
     def get_session(self) -> AsyncSession:
         """
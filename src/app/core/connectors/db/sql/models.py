@@ -1,5 +1,5 @@
 from traceback import format_exc
-from sqlalchemy import Column, BigInteger, Text, Numeric, ForeignKey
+from sqlalchemy import Column, BigInteger, DateTime, Text, Numeric, Index, func, text
 
 from app.core.connectors.logging import logger
 from app.core.connectors.db.sql.connector import Base, SQLConnector
@@ -9,6 +9,9 @@ class Session(Base):
     """
     Session model for managing session information and permissions
 
+    Sessions are kept in the Redis session store, the table is no longer
+    written and only holds rows from before the move
+
     Attributes:
         id: Primary key
         session_id: Session ID
@@ -36,31 +39,50 @@ class History(Base):
         country: Country name
         latitude: Latitude
         longitude: Longitude
+        created_at: Creation time
     """
 
     __tablename__ = "history"
+    __table_args__ = (
+        Index("ix_history_session_id_id", "session_id", "id"),
+        Index("ix_history_created_at", "created_at"),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
-    session_id = Column(Text, ForeignKey("sessions.session_id"))
+    # Plain column, sessions live in Redis, indexed by ix_history_session_id_id
+    session_id = Column(Text)
     city = Column(Text, nullable=False)
     country = Column(Text, nullable=False)
     latitude = Column(Numeric, nullable=False)
     longitude = Column(Numeric, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
     def __repr__(self):
         return f"History(id={self.id}, session_id='{self.session_id}'"
 
 
-async def init_models() -> None:
+# Idempotent changes for tables created before the columns or indexes existed
+MIGRATIONS = [
+    "ALTER TABLE history ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ NOT NULL DEFAULT now()",
+    "CREATE INDEX IF NOT EXISTS ix_history_session_id_id ON history (session_id, id)",
+    "CREATE INDEX IF NOT EXISTS ix_history_created_at ON history (created_at)",
+    "ALTER TABLE history DROP CONSTRAINT IF EXISTS history_session_id_fkey",
+]
+
+
+async def init_models(connector: SQLConnector) -> None:
     """
     Initialize database by creating all defined tables
-    """
 
-    __connector = SQLConnector()
+    Args:
+        connector (SQLConnector): Shared SQL connector
+    """
 
     try:
-        async with __connector.engine.begin() as conn:
+        async with connector.engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            for migration in MIGRATIONS:
+                await conn.execute(text(migration))
 
     except Exception as e:
         logger.error(
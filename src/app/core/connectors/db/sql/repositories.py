@@ -1,5 +1,7 @@
 from typing import Any
-from sqlalchemy import select
+from datetime import datetime
+from collections.abc import AsyncIterator
+from sqlalchemy import Float, Row, func, insert, select
 from traceback import format_exc
 
 from .connector import SQLConnector
@@ -13,8 +15,8 @@ class BaseRepository:
     Base class for all repositories
     """
 
-    def __init__(self):
-        self._connector = SQLConnector()
+    def __init__(self, connector: SQLConnector):
+        self._connector = connector
 
     async def execute_query(self, query):
         """
@@ -186,23 +188,76 @@ class HistoryRepository(BaseRepository):
     History repository
     """
 
-    async def get_history(self, session_id: str) -> list[History] | None:
+    async def add_history(self, rows: list[dict[str, Any]]) -> bool:
         """
-        Get history by session id.
+        Insert history rows with a single multi-row INSERT in one transaction
+
+        Args:
+            rows (list[dict[str, Any]]): History values, every row has the same keys
+
+        Returns:
+            bool: True if rows were inserted
+        """
+
+        if not rows:
+            return True
+
+        try:
+            async with self._connector.session() as session:
+                await session.execute(insert(History).values(rows))
+                await session.commit()
+                return True
+        except Exception as e:
+            logger.error(
+                {
+                    "service": "add_history",
+                    "message": "error adding history",
+                    "rows": len(rows),
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
+            return False
+
+    async def get_history(
+        self, session_id: str, after: int | None = None, limit: int = 50
+    ) -> list[Row] | None:
+        """
+        Get a page of history by session id, newest first
+
+        Pages are read with a keyset on the (session_id, id) index, so the
+        cost does not grow with the number of rows a session already has
 
         Args:
             session_id: Session ID
+            after: Return rows older than this history id
+            limit: Maximum number of rows
 
         Returns:
-            list[History] | None: List of history instances or None if error occurred
+            list[Row] | None: History rows or None if error occurred
         """
 
+        query = (
+            select(
+                History.id,
+                History.session_id,
+                History.city,
+                History.country,
+                History.latitude.cast(Float).label("latitude"),
+                History.longitude.cast(Float).label("longitude"),
+                History.created_at,
+            )
+            .where(History.session_id == session_id)
+            .order_by(History.id.desc())
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(History.id < after)
+
         try:
             async with self._connector.session() as session:
-                result = await session.execute(
-                    select(History).where(History.session_id == session_id)
-                )
-                return result.scalars().all()
+                result = await session.execute(query)
+                return result.all()
         except Exception as e:
             logger.error(
                 {
@@ -213,3 +268,83 @@ class HistoryRepository(BaseRepository):
                 }
             )
             return None
+
+    async def stream_history(
+        self, session_id: str, after: int | None = None, chunk_size: int = 500
+    ) -> AsyncIterator[list[Row]]:
+        """
+        Iterate over history in keyset-paginated chunks, newest first
+
+        Every chunk is a separate short query, no connection is held
+        between chunks
+
+        Args:
+            session_id: Session ID
+            after: Start with rows older than this history id
+            chunk_size: Number of rows per chunk
+
+        Yields:
+            list[Row]: Chunk of history rows
+
+        Raises:
+            RuntimeError: A chunk could not be read
+        """
+
+        while True:
+            rows = await self.get_history(session_id, after, chunk_size)
+            if rows is None:
+                raise RuntimeError("error reading history")
+            if not rows:
+                return
+
+            yield rows
+
+            if len(rows) < chunk_size:
+                return
+            after = rows[-1].id
+
+    async def get_top_locations(self, since: datetime, limit: int) -> list[Row] | None:
+        """
+        Get most searched locations since a point in time
+
+        Searches are grouped by country and coordinates, so spelling
+        variants of the same city are counted as one location
+
+        Args:
+            since: Only count searches made after this time
+            limit: Maximum number of locations
+
+        Returns:
+            list[Row] | None: City, country, coordinates and search count,
+                most searched first, or None if error occurred
+        """
+
+        searches = func.count().label("searches")
+        query = (
+            select(
+                func.min(History.city).label("city"),
+                History.country,
+                History.latitude.cast(Float).label("latitude"),
+                History.longitude.cast(Float).label("longitude"),
+                searches,
+            )
+            .where(History.created_at >= since)
+            .group_by(History.country, History.latitude, History.longitude)
+            .order_by(searches.desc())
+            .limit(limit)
+        )
+
+        try:
+            async with self._connector.session() as session:
+                result = await session.execute(query)
+                return result.all()
+        except Exception as e:
+            logger.error(
+                {
+                    "service": "get_top_locations",
+                    "message": "error getting top locations",
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
+            return None
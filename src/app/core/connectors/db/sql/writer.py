@@ -0,0 +1,179 @@
+import time
+import asyncio
+
+from traceback import format_exc
+
+from .models import History
+from .repositories import HistoryRepository
+from app.core.metrics import app_metrics
+from app.core.connectors.config import config
+from app.core.connectors.logging import logger
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+# Columns written by the batch insert, database generated columns are left out
+COLUMNS = [
+    column.key
+    for column in History.__table__.columns
+    if not column.primary_key and column.server_default is None
+]
+# PostgreSQL accepts at most 32767 bind parameters per statement
+MAX_BATCH_SIZE = 32767 // len(COLUMNS)
+
+
+class HistoryWriter:
+    """
+    Background history writer fed by a bounded in-process queue
+
+    Requests only enqueue rows, a single worker task writes them behind in
+    batches: a batch is flushed with one multi-row INSERT once it holds
+    `history_batch_size` rows or its first row has waited
+    `history_batch_interval` milliseconds. When the queue is full the overflow
+    policy decides which row is dropped: `drop_oldest` evicts the oldest
+    queued row, `drop_newest` rejects the new one
+    """
+
+    def __init__(self, repository: HistoryRepository):
+        self.__repository = repository
+        self.__queue: asyncio.Queue[History] | None = None
+        self.__worker: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        """Check if the worker is running"""
+        return self.__worker is not None and not self.__worker.done()
+
+    def start(self) -> None:
+        """
+        Create queue and start worker task
+        """
+
+        if self.running:
+            return
+
+        self.__queue = asyncio.Queue(maxsize=config.history_queue_size)
+        self.__worker = asyncio.create_task(self.__run())
+
+    def submit(self, history: History) -> bool:
+        """
+        Queue history row without waiting for the database
+
+        Args:
+            history (History): History row
+
+        Returns:
+            bool: True if the row was queued
+        """
+
+        if not self.running:
+            app_metrics.record_history_write("dropped")
+            return False
+
+        if self.__queue.full():
+            app_metrics.record_history_write("dropped")
+            if config.history_queue_overflow != DROP_OLDEST:
+                return False
+            self.__queue.get_nowait()
+            self.__queue.task_done()
+
+        self.__queue.put_nowait(history)
+        app_metrics.record_history_queue(self.__queue.qsize())
+        return True
+
+    async def stop(self) -> None:
+        """
+        Flush queued rows and stop worker task
+
+        Rows still queued after `history_flush_timeout` seconds are dropped
+        """
+
+        if not self.running:
+            return
+
+        try:
+            await asyncio.wait_for(self.__queue.join(), timeout=config.history_flush_timeout)
+        except TimeoutError:
+            logger.error(
+                {
+                    "type": "history_writer",
+                    "message": "history flush timed out",
+                    "dropped": self.__queue.qsize(),
+                }
+            )
+
+        self.__worker.cancel()
+        await asyncio.gather(self.__worker, return_exceptions=True)
+        self.__worker = None
+
+    async def __run(self) -> None:
+        """
+        Collect and write batches until cancelled
+        """
+
+        while True:
+            batch = await self.__collect()
+            try:
+                await self.__flush(batch)
+            finally:
+                for _ in batch:
+                    self.__queue.task_done()
+                app_metrics.record_history_queue(self.__queue.qsize())
+
+    async def __collect(self) -> list[History]:
+        """
+        Wait for the first row, then gather rows until the batch is full
+        or the batch interval has passed
+
+        Returns:
+            list[History]: Batch of rows
+        """
+
+        loop = asyncio.get_running_loop()
+        batch = [await self.__queue.get()]
+        deadline = loop.time() + config.history_batch_interval / 1000
+        limit = min(config.history_batch_size, MAX_BATCH_SIZE)
+
+        while len(batch) < limit:
+            if not self.__queue.empty():
+                batch.append(self.__queue.get_nowait())
+                continue
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+
+            try:
+                batch.append(await asyncio.wait_for(self.__queue.get(), timeout=timeout))
+            except TimeoutError:
+                break
+
+        return batch
+
+    async def __flush(self, batch: list[History]) -> None:
+        """
+        Write batch with a single multi-row INSERT
+
+        Args:
+            batch (list[History]): Batch of rows
+        """
+
+        started = time.perf_counter()
+        try:
+            written = await self.__repository.add_history(
+                [{key: getattr(row, key) for key in COLUMNS} for row in batch]
+            )
+        except Exception as e:
+            written = False
+            logger.error(
+                {
+                    "type": "history_writer",
+                    "message": "error writing history",
+                    "rows": len(batch),
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
+
+        app_metrics.record_history_flush(len(batch), time.perf_counter() - started)
+        app_metrics.record_history_write("written" if written else "failed", len(batch))
@@ -0,0 +1,13 @@
+from .client import HTTPConnector
+from .limiter import RateLimiter
+from .breaker import (
+    CircuitBreaker,
+    RetryBudget,
+    UpstreamUnavailableError,
+    UpstreamRateLimitedError,
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+)
+
+http_connector = HTTPConnector()
@@ -0,0 +1,172 @@
+import time
+
+from app.core.metrics import app_metrics
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+
+class UpstreamUnavailableError(Exception):
+    """
+    Upstream API is failing or its circuit is open
+    """
+
+    status_code = 503
+    reason = "service unavailable"
+
+    def __init__(self, endpoint: str, retry_after: float = 0.0, message: str | None = None):
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        super().__init__(message or f"Upstream service '{endpoint}' is unavailable")
+
+
+class UpstreamRateLimitedError(UpstreamUnavailableError):
+    """
+    Upstream call would wait for the rate limiter longer than allowed
+    """
+
+    status_code = 429
+    reason = "too many requests"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a single upstream endpoint
+
+    Consecutive failures or slow calls open the circuit, while it is open
+    calls fail fast. After the recovery timeout a limited number of probe
+    calls are let through, a successful probe closes the circuit again
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        slow_call_threshold: float,
+        recovery_timeout: float,
+        half_open_max_calls: int,
+    ):
+        self.name = name
+        self.__failure_threshold = failure_threshold
+        self.__slow_call_threshold = slow_call_threshold
+        self.__recovery_timeout = recovery_timeout
+        self.__half_open_max_calls = half_open_max_calls
+        self.__state = CLOSED
+        self.__failures = 0
+        self.__probes = 0
+        self.__opened_at = 0.0
+        app_metrics.record_circuit_state(self.name, self.__state)
+
+    @property
+    def state(self) -> str:
+        """Get circuit state, moving an expired open circuit to half-open"""
+        if self.__state == OPEN and self.retry_after == 0:
+            self.__transition(HALF_OPEN)
+        return self.__state
+
+    @property
+    def retry_after(self) -> float:
+        """Get seconds until the open circuit lets probe calls through"""
+        if self.__state != OPEN:
+            return 0.0
+        return max(0.0, self.__opened_at + self.__recovery_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """
+        Check if a call may be sent
+
+        Returns:
+            bool: True if the call may be sent
+        """
+
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self.__probes < self.__half_open_max_calls:
+            self.__probes += 1
+            return True
+        return False
+
+    def record_success(self, latency: float) -> None:
+        """
+        Record a completed call, slow calls count as failures
+
+        Args:
+            latency (float): Call latency in seconds
+        """
+
+        if latency >= self.__slow_call_threshold:
+            app_metrics.record_upstream_call(self.name, "slow")
+            self.record_failure(count=False)
+            return
+
+        app_metrics.record_upstream_call(self.name, "success")
+        self.__release()
+        self.__failures = 0
+        if self.__state == HALF_OPEN:
+            self.__transition(CLOSED)
+
+    def record_failure(self, count: bool = True) -> None:
+        """
+        Record a failed call
+
+        Args:
+            count (bool): Count the failure in metrics
+        """
+
+        if count:
+            app_metrics.record_upstream_call(self.name, "failure")
+        self.__release()
+        self.__failures += 1
+        if self.__state == HALF_OPEN or self.__failures >= self.__failure_threshold:
+            self.__opened_at = time.monotonic()
+            self.__transition(OPEN)
+
+    def release(self) -> None:
+        """Release a probe slot for a call that did not complete"""
+        self.__release()
+
+    def __release(self) -> None:
+        if self.__probes > 0:
+            self.__probes -= 1
+
+    def __transition(self, state: str) -> None:
+        if state == self.__state:
+            return
+        self.__state = state
+        self.__probes = 0
+        if state == CLOSED:
+            self.__failures = 0
+        app_metrics.record_circuit_state(self.name, state)
+
+
+class RetryBudget:
+    """
+    Token bucket that caps retries to a fraction of requests
+
+    Every request deposits ratio tokens and every retry withdraws one,
+    so a failing upstream is not hit with a multiple of the normal load
+    """
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self.__ratio = ratio
+        self.__max_tokens = max_tokens
+        self.__tokens = max_tokens
+
+    def deposit(self) -> None:
+        """Add tokens for a new request"""
+        self.__tokens = min(self.__max_tokens, self.__tokens + self.__ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Take a token for a retry
+
+        Returns:
+            bool: True if the retry is allowed
+        """
+
+        if self.__tokens < 1:
+            return False
+        self.__tokens -= 1
+        return True
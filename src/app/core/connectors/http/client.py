@@ -0,0 +1,187 @@
+import time
+import httpx
+import random
+import asyncio
+
+from typing import Any
+
+from app.core.metrics import app_metrics
+from app.core.connectors.config import config
+
+from .limiter import RateLimiter
+from .breaker import CircuitBreaker, RetryBudget, UpstreamUnavailableError
+
+
+class HTTPConnector:
+    """
+    Shared HTTP connector for upstream APIs
+    """
+
+    def __init__(self):
+        self.__client: httpx.AsyncClient | None = None
+        self.__breakers: dict[str, CircuitBreaker] = {}
+        self.__budgets: dict[str, RetryBudget] = {}
+        self.__limiter = RateLimiter(config.rate_limit_name)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Get HTTP client"""
+        if self.__client is None or self.__client.is_closed:
+            self.connect()
+        return self.__client
+
+    def connect(self) -> None:
+        """
+        Create pooled HTTP client with keep-alive connections
+        """
+
+        if self.__client is not None and not self.__client.is_closed:
+            return
+
+        self.__client = httpx.AsyncClient(
+            http2=config.http2_enabled,
+            limits=httpx.Limits(
+                max_connections=config.http_max_connections,
+                max_keepalive_connections=config.http_max_keepalive_connections,
+                keepalive_expiry=config.http_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                connect=config.http_connect_timeout,
+                read=config.http_read_timeout,
+                write=config.http_write_timeout,
+                pool=config.http_pool_timeout,
+            ),
+        )
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """
+        Get circuit breaker for an upstream endpoint
+
+        Args:
+            endpoint (str): Endpoint name
+
+        Returns:
+            CircuitBreaker: Circuit breaker
+        """
+
+        if endpoint not in self.__breakers:
+            self.__breakers[endpoint] = CircuitBreaker(
+                endpoint,
+                failure_threshold=config.circuit_failure_threshold,
+                slow_call_threshold=config.circuit_slow_call_thresholds.get(
+                    endpoint, config.circuit_slow_call_threshold
+                ),
+                recovery_timeout=config.circuit_recovery_timeout,
+                half_open_max_calls=config.circuit_half_open_max_calls,
+            )
+            self.__budgets[endpoint] = RetryBudget(
+                config.http_retry_budget_ratio, config.http_retry_budget_max
+            )
+        return self.__breakers[endpoint]
+
+    async def get(
+        self, url: str, params: dict[str, Any] | None = None, endpoint: str = "default"
+    ) -> httpx.Response:
+        """
+        Send GET request using shared client
+
+        Every attempt takes a token from the shared upstream rate limiter.
+        Transport errors, 429 and 5xx responses are retried with jittered
+        backoff while the endpoint retry budget allows it
+
+        Args:
+            url (str): Request URL
+            params (dict[str, Any] | None): Query parameters
+            endpoint (str): Endpoint name for circuit breaking
+
+        Raises:
+            UpstreamUnavailableError: Circuit is open, retries are exhausted
+                or the rate limiter rejected the call
+
+        Returns:
+            httpx.Response: Response object
+        """
+
+        breaker = self.breaker(endpoint)
+        budget = self.__budgets[endpoint]
+        budget.deposit()
+
+        error = None
+        for attempt in range(config.http_retry_attempts + 1):
+            if not breaker.allow():
+                app_metrics.record_upstream_call(endpoint, "rejected")
+                raise UpstreamUnavailableError(endpoint, breaker.retry_after) from error
+
+            try:
+                await self.__limiter.acquire()
+            except BaseException:
+                breaker.release()
+                raise
+
+            try:
+                return await self.__send(breaker, url, params)
+            except httpx.HTTPStatusError as e:
+                if not self.__is_retryable(e.response):
+                    raise
+                error = e
+            except httpx.TransportError as e:
+                error = e
+
+            if attempt == config.http_retry_attempts or not budget.withdraw():
+                break
+
+            app_metrics.record_upstream_retry(endpoint)
+            await asyncio.sleep(self.__backoff(attempt))
+
+        raise UpstreamUnavailableError(endpoint, breaker.retry_after) from error
+
+    async def __send(
+        self, breaker: CircuitBreaker, url: str, params: dict[str, Any] | None
+    ) -> httpx.Response:
+        """
+        Send a single request and record its outcome in the circuit breaker
+
+        Args:
+            breaker (CircuitBreaker): Endpoint circuit breaker
+            url (str): Request URL
+            params (dict[str, Any] | None): Query parameters
+
+        Returns:
+            httpx.Response: Response object
+        """
+
+        started = time.perf_counter()
+        try:
+            response = await self.client.get(url, params=params)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            if self.__is_retryable(e.response):
+                breaker.record_failure()
+            else:
+                breaker.record_success(time.perf_counter() - started)
+            raise
+        except httpx.TransportError:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+
+        breaker.record_success(time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def __is_retryable(response: httpx.Response) -> bool:
+        return response.status_code == 429 or response.status_code >= 500
+
+    @staticmethod
+    def __backoff(attempt: int) -> float:
+        """Full jitter exponential backoff in seconds"""
+        ceiling = min(config.http_retry_backoff_max, config.http_retry_backoff * 2**attempt)
+        return random.uniform(0, ceiling)
+
+    async def close(self) -> None:
+        """Close HTTP client"""
+        if self.__client is not None:
+            await self.__client.aclose()
+            self.__client = None
@@ -0,0 +1,122 @@
+import asyncio
+
+from traceback import format_exc
+
+from app.core.metrics import app_metrics
+from app.core.connectors.config import config
+from app.core.connectors.logging import logger
+from app.core.connectors.db.redis import rate_limit_redis
+
+from .breaker import UpstreamUnavailableError, UpstreamRateLimitedError
+
+# Token bucket that lets the balance go negative: every call reserves the next
+# free slot and gets back how long to wait for it, so callers from all workers
+# are served in the order they reached Redis. A call that would wait longer
+# than the deadline reserves nothing and gets back the negated wait
+RESERVE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local max_wait = tonumber(ARGV[3])
+
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local state = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+
+tokens = math.min(capacity, tokens + (now - ts) * rate / 1000) - 1
+
+local wait = 0
+if tokens < 0 then
+    wait = math.ceil(-tokens * 1000 / rate)
+end
+if wait > max_wait then
+    return -wait
+end
+
+redis.call("HSET", KEYS[1], "tokens", tokens, "ts", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil((capacity - tokens) * 1000 / rate) + 1000)
+return wait
+"""
+
+
+class RateLimiter:
+    """
+    Outbound rate limiter backed by a token bucket shared by all workers
+    """
+
+    def __init__(self, name: str):
+        self.__name = name
+        self.__key = f"ratelimit:{name}"
+        self.__waiting = 0
+
+    async def acquire(self) -> None:
+        """
+        Wait for a token, callers are served in arrival order
+
+        Raises:
+            UpstreamUnavailableError: Too many calls are already waiting
+            UpstreamRateLimitedError: Wait would exceed `rate_limit_max_wait`
+        """
+
+        if not config.rate_limit_enabled:
+            return
+
+        if self.__waiting >= config.rate_limit_max_queue:
+            app_metrics.record_rate_limit_rejection(self.__name, "queue_full")
+            raise UpstreamUnavailableError(
+                self.__name,
+                retry_after=config.rate_limit_max_wait / 1000,
+                message=f"Upstream service '{self.__name}' request queue is full",
+            )
+
+        wait = await self.__reserve()
+        if wait < 0:
+            app_metrics.record_rate_limit_rejection(self.__name, "deadline")
+            raise UpstreamRateLimitedError(
+                self.__name,
+                retry_after=-wait / 1000,
+                message=f"Upstream service '{self.__name}' rate limit exceeded",
+            )
+
+        if wait > 0:
+            self.__waiting += 1
+            app_metrics.record_rate_limit_queue(self.__name, self.__waiting)
+            try:
+                await asyncio.sleep(wait / 1000)
+            finally:
+                self.__waiting -= 1
+                app_metrics.record_rate_limit_queue(self.__name, self.__waiting)
+
+        app_metrics.record_rate_limit_wait(self.__name, wait / 1000)
+
+    async def __reserve(self) -> int:
+        """
+        Reserve a token in the shared bucket
+
+        Redis errors let the call through, the limiter fails open
+
+        Returns:
+            int: Milliseconds to wait for the token, negative if not reserved
+        """
+
+        try:
+            return await rate_limit_redis.eval(
+                RESERVE_SCRIPT,
+                1,
+                self.__key,
+                config.rate_limit_rate,
+                config.rate_limit_burst,
+                config.rate_limit_max_wait,
+            )
+        except Exception as e:
+            logger.error(
+                {
+                    "type": "rate_limiter",
+                    "key": self.__key,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
+            return 0
@@ -1,25 +1,32 @@
 import os
 import sys
+import queue
 import logging
 import colorlog
 
 from typing import Any
 from rich import traceback
 from functools import wraps
-from datetime import datetime
 from traceback import format_tb
 from collections.abc import Callable
 
 from .formatters import JsonFormatter
+from .handlers import DailyFileHandler, LogQueueHandler, LogListener
+from app.core.metrics import app_metrics
 from app.core.connectors.config import config
 
 
 class Logging:
     """
     Logger class for handling application logging
+
+    Loggers only enqueue records, a writer thread formats them and does the
+    file and stdout I/O, including the switch to the next day's files. See
+    `LogQueueHandler` for the overflow policy
     """
 
     __instance = None
+    __listener: LogListener | None = None
 
     def __new__(cls):
         if cls.__instance is None:
@@ -31,7 +38,6 @@ class Logging:
             return
 
         self.initialized = True
-        self.current_date = datetime.now().strftime("%Y-%m-%d")
         self._setup_logging()
 
     def _setup_logging(self) -> None:
@@ -40,8 +46,6 @@ class Logging:
         """
 
         log_errors_directory = os.path.abspath(config.log_path)
-        log_errors_file = os.path.join(log_errors_directory, f"log_{self.current_date}.log")
-        traceback_file = os.path.join(log_errors_directory, f"exception_{self.current_date}.log")
 
         os.makedirs(log_errors_directory, exist_ok=True)
 
@@ -58,48 +62,74 @@ class Logging:
         )
 
         # Main log handlers
-        self.file_handler = logging.FileHandler(log_errors_file, delay=True, encoding="utf-8")
+        self.file_handler = DailyFileHandler(log_errors_directory, "log")
         self.stream_handler = colorlog.StreamHandler(sys.stdout)
         self.file_handler.setFormatter(default_formatter)
         self.stream_handler.setFormatter(color_formatter)
 
         # Traceback handler
-        self.traceback_handler = logging.FileHandler(traceback_file, delay=True, encoding="utf-8")
+        self.traceback_handler = DailyFileHandler(log_errors_directory, "exception")
+
+        # Log writer thread
+        self.__queue = queue.Queue(maxsize=config.log_queue_size)
+        self.queue_handler = LogQueueHandler(self.__queue, config.log_queue_overflow)
+        self.__listener = LogListener(
+            self.__queue,
+            [self.file_handler, self.stream_handler],
+            routes={"traceback": [self.traceback_handler]},
+        )
+        self.__listener.start()
+        app_metrics.track_log_queue(self.__queue)
 
         # Main logger
         self.__logger = logging.getLogger()
         self.__logger.setLevel(logging.INFO)
 
-        # Remove existing handlers to prevent double logging
-        for handler in self.__logger.handlers[:]:
-            self.__logger.removeHandler(handler)
-
-        self.__logger.addHandler(self.file_handler)
-        self.__logger.addHandler(self.stream_handler)
-
         # Traceback logger
         self.__traceback_logger = logging.getLogger("traceback")
         self.__traceback_logger.setLevel(logging.ERROR)
-
-        # Remove existing handlers to prevent double logging
-        for handler in self.__traceback_logger.handlers[:]:
-            self.__traceback_logger.removeHandler(handler)
-
-        self.__traceback_logger.addHandler(self.traceback_handler)
         self.__traceback_logger.propagate = False
 
+        self.__set_handlers(self.queue_handler)
+
         sys.excepthook = self._handle_exception
         self._suppress_external_loggers()
 
-    def _update_handlers_if_needed(self) -> None:
+    def stop(self) -> None:
+        """
+        Write queued records and stop the writer thread
+
+        Records logged afterwards are written directly by the calling thread
+        """
+
+        if self.__listener is None:
+            return
+
+        self.__listener.stop()
+        self.__listener = None
+        self.__set_handlers(self.file_handler, self.stream_handler)
+
+    def __set_handlers(self, *handlers: logging.Handler) -> None:
         """
-        Update handlers if date has changed
+        Replace handlers of the main and traceback loggers
+
+        Args:
+            *handlers (logging.Handler): Main logger handlers, the traceback
+                logger gets the queue handler or its file handler
         """
 
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        if current_date != self.current_date:
-            self.current_date = current_date
-            self._setup_logging()
+        for logger, logger_handlers in (
+            (self.__logger, handlers),
+            (
+                self.__traceback_logger,
+                [self.queue_handler if self.__listener else self.traceback_handler],
+            ),
+        ):
+            # Remove existing handlers to prevent double logging
+            for handler in logger.handlers[:]:
+                logger.removeHandler(handler)
+            for handler in logger_handlers:
+                logger.addHandler(handler)
 
     def _suppress_external_loggers(self) -> None:
         """
@@ -236,7 +266,6 @@ class CustomLogger(metaclass=LoggerMeta):
             message (dict): Message to log
         """
 
-        Logging()._update_handlers_if_needed()
         self.__logger.info(message)
 
     def error(self, message: dict) -> None:
@@ -247,7 +276,6 @@ class CustomLogger(metaclass=LoggerMeta):
             message (dict): Message to log
         """
 
-        Logging()._update_handlers_if_needed()
         self.__logger.error(message)
 
     def exception(self, message: dict) -> None:
@@ -258,7 +286,6 @@ class CustomLogger(metaclass=LoggerMeta):
             message (dict): Message to log
         """
 
-        Logging()._update_handlers_if_needed()
         self.__logger.exception(message)
 
     def warning(self, message: dict) -> None:
@@ -269,7 +296,6 @@ class CustomLogger(metaclass=LoggerMeta):
             message (dict): Message to log
         """
 
-        Logging()._update_handlers_if_needed()
         self.__logger.warning(message)
 
     def debug(self, message: dict) -> None:
@@ -280,5 +306,11 @@ class CustomLogger(metaclass=LoggerMeta):
             message (dict): Message to log
         """
 
-        Logging()._update_handlers_if_needed()
         self.__logger.debug(message)
+
+    def stop(self) -> None:
+        """
+        Write queued records and stop the log writer thread
+        """
+
+        Logging().stop()
@@ -0,0 +1,158 @@
+import os
+import copy
+import queue
+import logging
+
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+from app.core.metrics import app_metrics
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+
+class LogQueueHandler(QueueHandler):
+    """
+    Non-blocking handler that hands records to the log writer thread
+
+    Records are put on a bounded queue without formatting, the writer
+    serializes their dict messages from a snapshot taken when the record is
+    queued. When the queue is full the
+    overflow policy decides which record is dropped: `drop_newest` rejects
+    the new record, `drop_oldest` evicts the oldest queued one. Logging
+    never waits for disk or stdout
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow: str = DROP_NEWEST):
+        super().__init__(log_queue)
+        self.__overflow = overflow
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Copy record with a snapshot of its dict message
+
+        Formatters of the writer handlers expect the dict message, the copy
+        keeps later changes of the caller's dict out of the written record
+
+        Args:
+            record (logging.LogRecord): Log record
+
+        Returns:
+            logging.LogRecord: Log record copy
+        """
+
+        record = copy.copy(record)
+        if isinstance(record.msg, dict):
+            record.msg = copy.deepcopy(record.msg)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """
+        Put record on the queue, applying the overflow policy when it is full
+
+        Args:
+            record (logging.LogRecord): Log record
+        """
+
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            app_metrics.record_log_dropped()
+
+        if self.__overflow != DROP_OLDEST:
+            return
+
+        try:
+            evicted = self.queue.get_nowait()
+            if evicted is QueueListener._sentinel:
+                # The writer is stopping, keep its stop signal
+                self.queue.put_nowait(evicted)
+                return
+            self.queue.put_nowait(record)
+        except (queue.Empty, queue.Full):
+            pass
+
+
+class DailyFileHandler(logging.FileHandler):
+    """
+    File handler writing to one `<prefix>_<date>.log` file per day
+
+    The day is taken from the record time and checked on every record, so
+    the switch to the next file happens in the log writer thread: the file of
+    the previous day is closed and the next write opens the new one
+    """
+
+    def __init__(self, directory: str, prefix: str):
+        self.__directory = directory
+        self.__prefix = prefix
+        self.__date = datetime.now().strftime("%Y-%m-%d")
+        super().__init__(self.__path(self.__date), delay=True, encoding="utf-8")
+
+    def __path(self, date: str) -> str:
+        """
+        Build path of the log file of a day
+
+        Args:
+            date (str): Date as YYYY-MM-DD
+
+        Returns:
+            str: Absolute file path
+        """
+
+        return os.path.join(self.__directory, f"{self.__prefix}_{date}.log")
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Write record to the file of its day
+
+        Args:
+            record (logging.LogRecord): Log record
+        """
+
+        date = datetime.fromtimestamp(record.created).strftime("%Y-%m-%d")
+        if date != self.__date:
+            self.__date = date
+            if self.stream is not None:
+                self.stream.close()
+                self.stream = None
+            self.baseFilename = self.__path(date)
+        super().emit(record)
+
+
+class LogListener(QueueListener):
+    """
+    Log writer thread draining the queue into file and stdout handlers
+
+    Records of a logger listed in `routes` go to that logger's handlers only,
+    all other records go to the default handlers
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        handlers: list[logging.Handler],
+        routes: dict[str, list[logging.Handler]],
+    ):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.__routes = routes
+
+    def handle(self, record: logging.LogRecord) -> None:
+        """
+        Write record with the handlers of its logger
+
+        Args:
+            record (logging.LogRecord): Log record
+        """
+
+        for handler in self.__routes.get(record.name, self.handlers):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def enqueue_sentinel(self) -> None:
+        """
+        Wait for room for the stop signal, records queued before it are written
+        """
+
+        self.queue.put(self._sentinel)
@@ -1,4 +1,5 @@
 from .client import VaultClient
+from .provider import SecretProvider, CachedSecret
 
 _vault_instance: VaultClient | None = None
 
@@ -7,3 +8,6 @@ def get_vault() -> VaultClient:
     if _vault_instance is None:
         _vault_instance = VaultClient()
     return _vault_instance
+
+
+secret_provider = SecretProvider()
@@ -14,6 +14,15 @@ class VaultClient:
     def __init__(self):
         vault_addr = config.vault_addr
         self.__client = hvac.Client(url=vault_addr)
+        self.__login()
+
+    def __login(self) -> None:
+        """
+        Authenticate with AppRole credentials
+
+        Raises:
+            Exception: If authentication fails
+        """
 
         self.__client.auth.approle.login(
             role_id=config.vault_role_id.get_secret_value(),
@@ -24,6 +33,34 @@ class VaultClient:
             logger.error({"type": "vault", "error": "authentication failed"})
             raise Exception("Vault authentication failed")
 
+    def read_secret(self, path: str) -> tuple[dict[str, str], int, int]:
+        """
+        Read all keys of a secret from Vault, logging in again if the token expired
+
+        Args:
+            path (str): Path to the secret
+
+        Returns:
+            tuple[dict[str, str], int, int]: Secret data, version and lease duration in seconds
+        """
+
+        try:
+            result = self.__read(path)
+        except hvac.exceptions.Forbidden:
+            self.__login()
+            result = self.__read(path)
+
+        return (
+            result["data"]["data"],
+            result["data"]["metadata"]["version"],
+            result.get("lease_duration") or 0,
+        )
+
+    def __read(self, path: str) -> dict:
+        return self.__client.secrets.kv.v2.read_secret_version(
+            mount_point="kv", path=path, raise_on_deleted_version=True
+        )
+
     def get_secret(self, path: str, key: str) -> str:
         """
         Get a secret from Vault
@@ -40,10 +77,8 @@ class VaultClient:
         """
 
         try:
-            result = self.__client.secrets.kv.v2.read_secret_version(
-                mount_point="kv", path=path, raise_on_deleted_version=True
-            )
-            return result["data"]["data"][key]
+            data, _, _ = self.read_secret(path)
+            return data[key]
         except Exception as e:
             logger.error({"type": "vault", "error": str(e), "traceback": format_exc()})
             raise e
@@ -0,0 +1,210 @@
+import time
+import asyncio
+
+from traceback import format_exc
+from typing import Any, NamedTuple
+from collections.abc import Callable, Awaitable
+
+from app.core.metrics import app_metrics
+from app.core.connectors.config import config
+from app.core.connectors.logging import logger
+
+
+class CachedSecret(NamedTuple):
+    """
+    Secret data read from a single path
+    """
+
+    data: dict[str, str]
+    version: int
+    expires_at: float
+    refresh_at: float
+
+
+class SecretProvider:
+    """
+    In-memory secret cache with background refresh
+
+    Every path is read once and kept for its lease duration, or
+    `secrets_ttl` seconds when Vault returns no lease. A background task
+    reloads paths after `secrets_refresh_ratio` of that time, so requests
+    only read memory. When a reload returns different data, the callbacks
+    registered for the path are awaited, e.g. to rebuild the SQL engine.
+    Paths are loaded at startup, reading a path that was never loaded is an
+    error rather than a blocking Vault call on the event loop
+    """
+
+    def __init__(self, reader: Callable[[str], tuple[dict[str, str], int, int]] | None = None):
+        self.__reader = reader
+        self.__secrets: dict[str, CachedSecret] = {}
+        self.__loading: dict[str, asyncio.Task] = {}
+        self.__callbacks: dict[str, list[Callable[[], Awaitable[Any]]]] = {}
+        self.__refresher: asyncio.Task | None = None
+
+    def get_cached(self, path: str, key: str) -> str:
+        """
+        Get secret from memory without awaiting
+
+        Args:
+            path (str): Path to the secret
+            key (str): Key of the secret
+
+        Returns:
+            str: Secret value
+
+        Raises:
+            RuntimeError: The path was not loaded
+        """
+
+        return self.get_cached_data(path)[key]
+
+    def get_cached_data(self, path: str) -> dict[str, str]:
+        """
+        Get all keys of a secret from memory without awaiting
+
+        Args:
+            path (str): Path to the secret
+
+        Returns:
+            dict[str, str]: Secret data
+
+        Raises:
+            RuntimeError: The path was not loaded
+        """
+
+        secret = self.__secrets.get(path)
+        if secret is None:
+            raise RuntimeError(f"vault secret '{path}' is not loaded, load it on startup")
+        return secret.data
+
+    async def load(self, path: str) -> CachedSecret:
+        """
+        Read path in a worker thread, concurrent loads of a path are coalesced
+
+        Args:
+            path (str): Path to the secret
+
+        Returns:
+            CachedSecret: Loaded secret
+        """
+
+        task = self.__loading.get(path)
+        if task is None:
+            task = asyncio.ensure_future(self.__reload(path))
+            self.__loading[path] = task
+            task.add_done_callback(lambda _: self.__loading.pop(path, None))
+        return await asyncio.shield(task)
+
+    def on_rotate(self, path: str, callback: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Register callback awaited after the secret at path changes
+
+        Args:
+            path (str): Path to the secret
+            callback (Callable[[], Awaitable[Any]]): Rotation callback
+        """
+
+        self.__callbacks.setdefault(path, []).append(callback)
+
+    def start(self) -> None:
+        """Start background refresh"""
+        if self.__refresher is None or self.__refresher.done():
+            self.__refresher = asyncio.create_task(self.__refresh())
+
+    async def stop(self) -> None:
+        """Stop background refresh"""
+        if self.__refresher is not None:
+            self.__refresher.cancel()
+            await asyncio.gather(self.__refresher, return_exceptions=True)
+            self.__refresher = None
+
+    async def __reload(self, path: str) -> CachedSecret:
+        """
+        Read path and run rotation callbacks if its data changed
+
+        Args:
+            path (str): Path to the secret
+
+        Returns:
+            CachedSecret: Loaded secret
+        """
+
+        previous = self.__secrets.get(path)
+        secret = self.__secrets[path] = await asyncio.to_thread(self.__read, path)
+        app_metrics.record_secret_refresh(path, "success")
+
+        if previous is not None and previous.data != secret.data:
+            logger.info({"type": "secrets", "path": path, "message": "secret rotated"})
+            for callback in self.__callbacks.get(path, []):
+                try:
+                    await callback()
+                except Exception as e:
+                    logger.error(
+                        {
+                            "type": "secrets",
+                            "path": path,
+                            "message": "rotation callback failed",
+                            "error": str(e),
+                            "traceback": format_exc(),
+                        }
+                    )
+
+        return secret
+
+    def __read(self, path: str) -> CachedSecret:
+        """
+        Read path from Vault
+
+        Args:
+            path (str): Path to the secret
+
+        Returns:
+            CachedSecret: Secret with expiry and refresh times
+        """
+
+        if self.__reader is None:
+            from app.core.connectors.secrets import get_vault
+
+            self.__reader = get_vault().read_secret
+
+        data, version, lease_duration = self.__reader(path)
+        ttl = lease_duration or config.secrets_ttl
+        now = time.time()
+        return CachedSecret(
+            data=data,
+            version=version,
+            expires_at=now + ttl,
+            refresh_at=now + ttl * config.secrets_refresh_ratio,
+        )
+
+    async def __refresh(self) -> None:
+        """
+        Reload paths as they become due until cancelled
+        """
+
+        while True:
+            now = time.time()
+            due = min((secret.refresh_at for secret in self.__secrets.values()), default=None)
+            await asyncio.sleep(max(due - now, 0) if due is not None else config.secrets_ttl)
+
+            for path, secret in list(self.__secrets.items()):
+                if secret.refresh_at > time.time():
+                    continue
+
+                try:
+                    await self.load(path)
+                except Exception as e:
+                    app_metrics.record_secret_refresh(path, "error")
+                    logger.error(
+                        {
+                            "type": "secrets",
+                            "path": path,
+                            "message": "secret refresh failed",
+                            "error": str(e),
+                            "traceback": format_exc(),
+                        }
+                    )
+                    # Keep serving the current value and try again later
+                    self.__secrets[path] = secret._replace(
+                        refresh_at=time.time() + config.secrets_retry_interval
+                    )
@@ -1,4 +1,5 @@
 import os
+import hmac
 
 from typing import Any
 from functools import wraps
@@ -27,10 +28,10 @@ class Auth:
             bool: True if token is valid, False otherwise
         """
 
-        if not self.__auth_header or self.__auth_header != config.auth_token:
+        if not self.__auth_header:
             return False
 
-        return True
+        return hmac.compare_digest(self.__auth_header.encode(), config.auth_token.encode())
 
 
 async def get_auth(request: Request) -> Auth:
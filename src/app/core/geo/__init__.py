@@ -0,0 +1,3 @@
+from .cities import Gazetteer
+
+gazetteer = Gazetteer()
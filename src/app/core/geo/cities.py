@@ -0,0 +1,279 @@
+import os
+import sys
+import gzip
+import time
+import heapq
+
+from array import array
+from bisect import bisect_left
+from typing import TextIO
+
+from app.core.metrics import app_metrics
+from app.core.caches import normalize_city
+from app.core.connectors.config import config
+from app.core.connectors.logging import logger
+from app.core.models.weather import LocationInfo
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+class Gazetteer:
+    """
+    In-memory city gazetteer loaded from a GeoNames dump
+
+    Cities are stored column-wise in flat arrays, a dict maps every
+    normalized name (and ASCII name) to the most populated city with it,
+    and a sorted name array serves prefix lookups with bisect
+    """
+
+    PRECOMPUTED_PREFIX_LENGTH = 2
+
+    def __init__(self):
+        self.__names: list[str] = []
+        self.__country_ids = array("H")
+        self.__latitudes = array("d")
+        self.__longitudes = array("d")
+        self.__populations = array("Q")
+        self.__countries: list[str] = []
+        self.__index: dict[str, int] = {}
+        self.__prefix_names: list[str] = []
+        self.__prefix_ids = array("I")
+        self.__top_prefixes: dict[str, list[int]] = {}
+        self.__loaded = False
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the gazetteer is loaded"""
+        return self.__loaded
+
+    @staticmethod
+    def __open(path: str) -> TextIO:
+        """
+        Open plain or gzip-compressed dump
+
+        Args:
+            path (str): Path to file
+
+        Returns:
+            TextIO: File object
+        """
+
+        if path.endswith(".gz"):
+            return gzip.open(path, "rt", encoding="utf-8")
+        return open(path, encoding="utf-8")
+
+    def __load_countries(self, path: str) -> dict[str, str]:
+        """
+        Load ISO code to country name mapping from a GeoNames countryInfo file
+
+        Args:
+            path (str): Path to countryInfo file
+
+        Returns:
+            dict[str, str]: ISO code to country name
+        """
+
+        countries = {}
+        with self.__open(path) as f:
+            for line in f:
+                if line.startswith("#"):
+                    continue
+                columns = line.rstrip("\n").split("\t")
+                if len(columns) > 4:
+                    countries[columns[0]] = columns[4]
+        return countries
+
+    def load(self) -> None:
+        """
+        Load cities from GeoNames dump, keeping cities above the minimum population
+        """
+
+        if self.__loaded:
+            return
+
+        started = time.perf_counter()
+
+        countries = self.__load_countries(
+            config.gazetteer_countries_path or os.path.join(DATA_PATH, "countryInfo.txt")
+        )
+        country_ids: dict[str, int] = {}
+        names: list[tuple[str, int]] = []
+        min_population = config.gazetteer_min_population
+
+        with self.__open(
+            config.gazetteer_cities_path or os.path.join(DATA_PATH, "cities15000.txt.gz")
+        ) as f:
+            for line in f:
+                columns = line.rstrip("\n").split("\t")
+                if len(columns) < 15:
+                    continue
+
+                population = int(columns[14] or 0)
+                country = countries.get(columns[8])
+                if population < min_population or country is None:
+                    continue
+
+                if country not in country_ids:
+                    country_ids[country] = len(self.__countries)
+                    self.__countries.append(country)
+
+                city_id = len(self.__names)
+                self.__names.append(columns[1])
+                self.__country_ids.append(country_ids[country])
+                self.__latitudes.append(float(columns[4]))
+                self.__longitudes.append(float(columns[5]))
+                self.__populations.append(population)
+
+                for name in {normalize_city(columns[1]), normalize_city(columns[2])}:
+                    if not name:
+                        continue
+                    names.append((name, city_id))
+                    current = self.__index.get(name)
+                    if current is None or self.__populations[current] < population:
+                        self.__index[name] = city_id
+
+        self.__build_prefix_index(names)
+        self.__loaded = True
+
+        load_time = time.perf_counter() - started
+        memory = self.memory_usage()
+        app_metrics.record_gazetteer(len(self), memory, load_time)
+
+        logger.info(
+            {
+                "type": "gazetteer",
+                "cities": len(self),
+                "names": len(self.__index),
+                "memory_bytes": memory,
+                "load_time": round(load_time, 4),
+            }
+        )
+
+    def __build_prefix_index(self, names: list[tuple[str, int]]) -> None:
+        """
+        Build sorted name array and top cities for short prefixes
+
+        Args:
+            names (list[tuple[str, int]]): Normalized names with city ids
+        """
+
+        names.sort()
+        self.__prefix_names = [name for name, _ in names]
+        self.__prefix_ids = array("I", (city_id for _, city_id in names))
+
+        limit = config.gazetteer_suggest_limit
+        candidates: dict[str, set[int]] = {}
+        for name, city_id in names:
+            for length in range(1, min(len(name), self.PRECOMPUTED_PREFIX_LENGTH) + 1):
+                candidates.setdefault(name[:length], set()).add(city_id)
+
+        self.__top_prefixes = {
+            prefix: heapq.nlargest(limit, city_ids, key=self.__populations.__getitem__)
+            for prefix, city_ids in candidates.items()
+        }
+
+    def suggest(self, query: str, limit: int) -> list[int]:
+        """
+        Find most populated cities whose name starts with the query
+
+        Args:
+            query (str): Name prefix
+            limit (int): Maximum number of cities
+
+        Returns:
+            list[int]: City ids ordered by population
+        """
+
+        prefix = normalize_city(query)
+        if not prefix:
+            return []
+
+        top = self.__top_prefixes.get(prefix)
+        if top is not None:
+            return top[:limit]
+
+        start = bisect_left(self.__prefix_names, prefix)
+        end = bisect_left(self.__prefix_names, prefix + "\U0010ffff", lo=start)
+
+        return heapq.nlargest(
+            limit, set(self.__prefix_ids[start:end]), key=self.__populations.__getitem__
+        )
+
+    def population(self, city_id: int) -> int:
+        """
+        Get city population
+
+        Args:
+            city_id (int): City position in the gazetteer
+
+        Returns:
+            int: Population
+        """
+
+        return self.__populations[city_id]
+
+    def memory_usage(self) -> int:
+        """
+        Estimate memory held by the gazetteer
+
+        Returns:
+            int: Size in bytes
+        """
+
+        size = sum(
+            sys.getsizeof(column)
+            for column in (
+                self.__names,
+                self.__country_ids,
+                self.__latitudes,
+                self.__longitudes,
+                self.__populations,
+                self.__countries,
+                self.__index,
+                self.__prefix_names,
+                self.__prefix_ids,
+                self.__top_prefixes,
+            )
+        )
+        size += sum(sys.getsizeof(name) for name in self.__names)
+        size += sum(sys.getsizeof(name) for name in self.__countries)
+        size += sum(sys.getsizeof(name) for name in self.__index)
+        size += sum(sys.getsizeof(top) for top in self.__top_prefixes.values())
+        return size
+
+    def location(self, city_id: int) -> LocationInfo:
+        """
+        Build location for a city
+
+        Args:
+            city_id (int): City position in the gazetteer
+
+        Returns:
+            LocationInfo: Location info
+        """
+
+        return LocationInfo(
+            name=self.__names[city_id],
+            country=self.__countries[self.__country_ids[city_id]],
+            latitude=self.__latitudes[city_id],
+            longitude=self.__longitudes[city_id],
+        )
+
+    def lookup(self, city_name: str) -> LocationInfo | None:
+        """
+        Find the most populated city with the given name
+
+        Args:
+            city_name (str): City name
+
+        Returns:
+            LocationInfo | None: Location or None if not in the gazetteer
+        """
+
+        city_id = self.__index.get(normalize_city(city_name))
+        if city_id is None:
+            return None
+        return self.location(city_id)
+
+    def __len__(self) -> int:
+        return len(self.__names)
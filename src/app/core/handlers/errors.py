@@ -1,9 +1,12 @@
+import math
+
 from traceback import format_exc
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException
 
 from app.core.connectors.logging import logger
+from app.core.connectors.http import UpstreamUnavailableError
 
 
 class ErrorHandlers:
@@ -124,3 +127,41 @@ class ErrorHandlers:
                     "request_id": request.state.request_id,
                 },
             )
+
+        @self.__app.exception_handler(UpstreamUnavailableError)
+        async def _(request: Request, exc: UpstreamUnavailableError):
+            """
+            Upstream unavailable and rate limited error handler
+
+            Args:
+                request (Request): Request object
+                exc (UpstreamUnavailableError): UpstreamUnavailableError object
+
+            Returns:
+                JSONResponse: JSON response
+            """
+
+            logger.error(
+                {
+                    "type": type(exc).__name__,
+                    "code": exc.status_code,
+                    "request_id": request.state.request_id,
+                    "client_ip": request.state.client_ip,
+                    "method": request.method,
+                    "path": request.url.path,
+                    "endpoint": exc.endpoint,
+                    "error": str(exc),
+                    "cause": repr(exc.__cause__) if exc.__cause__ else None,
+                }
+            )
+
+            return JSONResponse(
+                status_code=exc.status_code,
+                headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+                content={
+                    "status": "error",
+                    "type": exc.reason,
+                    "error": str(exc),
+                    "request_id": request.state.request_id,
+                },
+            )
@@ -1,4 +1,7 @@
-from prometheus_client import Counter
+from typing import Any
+from prometheus_client import Counter, Gauge, Histogram
+
+CIRCUIT_STATES = {"closed": 0, "half_open": 1, "open": 2}
 
 
 class AppMetrics:
@@ -18,6 +21,113 @@ class AppMetrics:
             "Total number of tracebacks",
             ["request_id"],
         )
+        self._cache_lookups = Counter(
+            "app_cache_lookups_total",
+            "Total number of application cache lookups",
+            ["cache", "tier", "result"],
+        )
+        self._forecast_responses = Counter(
+            "forecast_responses_total",
+            "Total number of forecasts served by cache state",
+            ["state"],
+        )
+        self._gazetteer_cities = Gauge(
+            "gazetteer_cities", "Number of cities loaded into the gazetteer"
+        )
+        self._gazetteer_memory = Gauge(
+            "gazetteer_memory_bytes", "Estimated memory held by the gazetteer"
+        )
+        self._gazetteer_load_time = Gauge(
+            "gazetteer_load_seconds", "Time spent loading the gazetteer"
+        )
+        self._single_flight = Counter(
+            "single_flight_calls_total",
+            "Total number of coalesced upstream calls",
+            ["role"],
+        )
+        self._circuit_state = Gauge(
+            "circuit_breaker_state",
+            "Upstream circuit breaker state (0 closed, 1 half-open, 2 open)",
+            ["endpoint"],
+        )
+        self._upstream_calls = Counter(
+            "upstream_calls_total",
+            "Total number of upstream calls by outcome",
+            ["endpoint", "result"],
+        )
+        self._upstream_retries = Counter(
+            "upstream_retries_total",
+            "Total number of retried upstream calls",
+            ["endpoint"],
+        )
+        self._rate_limit_queue = Gauge(
+            "upstream_rate_limit_queue_depth",
+            "Number of upstream calls waiting for the rate limiter",
+            ["limiter"],
+        )
+        self._rate_limit_wait = Histogram(
+            "upstream_rate_limit_wait_seconds",
+            "Time upstream calls waited for the rate limiter",
+            ["limiter"],
+            buckets=(0, 0.05, 0.1, 0.25, 0.5, 1, 2, 5),
+        )
+        self._rate_limit_rejections = Counter(
+            "upstream_rate_limit_rejections_total",
+            "Total number of upstream calls rejected by the rate limiter",
+            ["limiter", "reason"],
+        )
+        self._history_queue = Gauge(
+            "history_queue_depth", "Number of history rows waiting to be written"
+        )
+        self._history_writes = Counter(
+            "history_writes_total",
+            "Total number of history rows by outcome",
+            ["result"],
+        )
+        self._history_batch_size = Histogram(
+            "history_batch_size",
+            "Number of history rows per batch insert",
+            buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+        )
+        self._history_flush = Histogram(
+            "history_flush_seconds",
+            "Time spent writing a history batch",
+            buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+        )
+        self._secret_refreshes = Counter(
+            "secret_refreshes_total",
+            "Total number of secret reloads by outcome",
+            ["path", "result"],
+        )
+        self._prewarm_runs = Counter(
+            "prewarm_runs_total",
+            "Total number of cache pre-warm runs by outcome",
+            ["result"],
+        )
+        self._prewarm_duration = Histogram(
+            "prewarm_duration_seconds",
+            "Time spent on a cache pre-warm run",
+            buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+        )
+        self._prewarm_keys = Counter(
+            "prewarm_keys_total",
+            "Total number of cache keys visited by pre-warm runs",
+            ["cache", "result"],
+        )
+        self._log_queue = Gauge("log_queue_depth", "Number of log records waiting to be written")
+        self._log_dropped = Counter(
+            "log_records_dropped_total", "Total number of log records dropped on a full queue"
+        )
+        self._sql_pool_size = Gauge("sql_pool_size", "Configured SQL connection pool size")
+        self._sql_pool_checked_out = Gauge(
+            "sql_pool_checked_out", "Number of SQL connections in use"
+        )
+        self._sql_pool_checked_in = Gauge(
+            "sql_pool_checked_in", "Number of idle SQL connections in the pool"
+        )
+        self._sql_pool_overflow = Gauge(
+            "sql_pool_overflow", "Number of SQL connections over the pool size"
+        )
 
     def record_success(self, method: str, path: str) -> None:
         """Record a successful cache operation
@@ -48,3 +158,191 @@ class AppMetrics:
         """
 
         self._traceback.labels(request_id=request_id).inc()
+
+    def record_cache_lookup(self, cache: str, tier: str, result: str) -> None:
+        """Record an application cache lookup
+
+        Args:
+            cache (str): Cache name
+            tier (str): Cache tier (local, redis)
+            result (str): Lookup result (hit, miss)
+        """
+
+        self._cache_lookups.labels(cache=cache, tier=tier, result=result).inc()
+
+    def record_forecast_response(self, state: str) -> None:
+        """Record a served forecast
+
+        Args:
+            state (str): Cache state (fresh, stale, refreshed)
+        """
+
+        self._forecast_responses.labels(state=state).inc()
+
+    def record_gazetteer(self, cities: int, memory: int, load_time: float) -> None:
+        """Record gazetteer size and load time
+
+        Args:
+            cities (int): Number of cities
+            memory (int): Memory in bytes
+            load_time (float): Load time in seconds
+        """
+
+        self._gazetteer_cities.set(cities)
+        self._gazetteer_memory.set(memory)
+        self._gazetteer_load_time.set(load_time)
+
+    def record_single_flight(self, role: str) -> None:
+        """Record a single-flight call
+
+        Args:
+            role (str): Caller role (leader, follower, lock_wait)
+        """
+
+        self._single_flight.labels(role=role).inc()
+
+    def record_circuit_state(self, endpoint: str, state: str) -> None:
+        """Record an upstream circuit breaker state
+
+        Args:
+            endpoint (str): Endpoint name
+            state (str): Circuit state (closed, half_open, open)
+        """
+
+        self._circuit_state.labels(endpoint=endpoint).set(CIRCUIT_STATES[state])
+
+    def record_upstream_call(self, endpoint: str, result: str) -> None:
+        """Record an upstream call
+
+        Args:
+            endpoint (str): Endpoint name
+            result (str): Call result (success, slow, failure, rejected)
+        """
+
+        self._upstream_calls.labels(endpoint=endpoint, result=result).inc()
+
+    def record_upstream_retry(self, endpoint: str) -> None:
+        """Record a retried upstream call
+
+        Args:
+            endpoint (str): Endpoint name
+        """
+
+        self._upstream_retries.labels(endpoint=endpoint).inc()
+
+    def record_rate_limit_queue(self, limiter: str, depth: int) -> None:
+        """Record rate limiter queue depth
+
+        Args:
+            limiter (str): Limiter name
+            depth (int): Number of waiting calls
+        """
+
+        self._rate_limit_queue.labels(limiter=limiter).set(depth)
+
+    def record_rate_limit_wait(self, limiter: str, seconds: float) -> None:
+        """Record time a call waited for the rate limiter
+
+        Args:
+            limiter (str): Limiter name
+            seconds (float): Wait time in seconds
+        """
+
+        self._rate_limit_wait.labels(limiter=limiter).observe(seconds)
+
+    def record_rate_limit_rejection(self, limiter: str, reason: str) -> None:
+        """Record a call rejected by the rate limiter
+
+        Args:
+            limiter (str): Limiter name
+            reason (str): Rejection reason (deadline, queue_full)
+        """
+
+        self._rate_limit_rejections.labels(limiter=limiter, reason=reason).inc()
+
+    def record_history_queue(self, depth: int) -> None:
+        """Record history queue depth
+
+        Args:
+            depth (int): Number of queued rows
+        """
+
+        self._history_queue.set(depth)
+
+    def record_history_write(self, result: str, rows: int = 1) -> None:
+        """Record history row outcomes
+
+        Args:
+            result (str): Row outcome (written, failed, dropped)
+            rows (int): Number of rows
+        """
+
+        self._history_writes.labels(result=result).inc(rows)
+
+    def record_history_flush(self, rows: int, seconds: float) -> None:
+        """Record a history batch insert
+
+        Args:
+            rows (int): Number of rows in the batch
+            seconds (float): Flush latency in seconds
+        """
+
+        self._history_batch_size.observe(rows)
+        self._history_flush.observe(seconds)
+
+    def track_sql_pool(self, pool: Any) -> None:
+        """Report SQL connection pool usage, read on every scrape
+
+        Args:
+            pool (Any): SQLAlchemy queue pool
+        """
+
+        self._sql_pool_size.set_function(pool.size)
+        self._sql_pool_checked_out.set_function(pool.checkedout)
+        self._sql_pool_checked_in.set_function(pool.checkedin)
+        self._sql_pool_overflow.set_function(lambda: max(pool.overflow(), 0))
+
+    def record_secret_refresh(self, path: str, result: str) -> None:
+        """Record a secret reload
+
+        Args:
+            path (str): Secret path
+            result (str): Reload result (success, error)
+        """
+
+        self._secret_refreshes.labels(path=path, result=result).inc()
+
+    def record_prewarm_run(self, result: str, seconds: float) -> None:
+        """Record a cache pre-warm run
+
+        Args:
+            result (str): Run result (success, error, skipped)
+            seconds (float): Run duration in seconds
+        """
+
+        self._prewarm_runs.labels(result=result).inc()
+        self._prewarm_duration.observe(seconds)
+
+    def record_prewarm_key(self, cache: str, result: str) -> None:
+        """Record a cache key visited by a pre-warm run
+
+        Args:
+            cache (str): Cache name (geocoding, forecast)
+            result (str): Key result (warmed, skipped, failed)
+        """
+
+        self._prewarm_keys.labels(cache=cache, result=result).inc()
+
+    def track_log_queue(self, log_queue: Any) -> None:
+        """Report log queue depth, read on every scrape
+
+        Args:
+            log_queue (Any): Queue drained by the log writer thread
+        """
+
+        self._log_queue.set_function(log_queue.qsize)
+
+    def record_log_dropped(self) -> None:
+        """Record a log record dropped on a full queue"""
+
+        self._log_dropped.inc()
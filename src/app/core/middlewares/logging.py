@@ -1,56 +1,67 @@
 import time
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.connectors.logging import logger
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware:
     """
     Logging middleware
     """
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
-        Dispatches the request to the next middleware or handler
+        Log the request once the response has been sent
 
         Args:
-            request (Request): Request object
-            call_next (Callable): Callable
-
-        Returns:
-            Response: Response object
+            scope (Scope): ASGI scope
+            receive (Receive): ASGI receive channel
+            send (Send): ASGI send channel
         """
 
-        start_time = time.time()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        try:
-            response: Response = await call_next(request)
+        start_time = time.perf_counter()
+        status_code = None
 
-            logger.info(
-                {
-                    "type": "request",
-                    "request_id": request.state.request_id,
-                    "client_ip": request.state.client_ip,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "status_code": response.status_code,
-                    "duration": round(time.time() - start_time, 4),
-                }
-            )
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        state = scope.setdefault("state", {})
+
+        try:
+            await self.app(scope, receive, send_with_status)
         except Exception as e:
             logger.error(
                 {
                     "type": "request",
-                    "request_id": request.state.request_id,
-                    "client_ip": request.state.client_ip,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "duration": round(time.time() - start_time, 4),
+                    "request_id": state.get("request_id"),
+                    "client_ip": state.get("client_ip"),
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "duration": round(time.perf_counter() - start_time, 4),
                     "error": str(e),
                 }
             )
             raise
 
-        return response
+        logger.info(
+            {
+                "type": "request",
+                "request_id": state.get("request_id"),
+                "client_ip": state.get("client_ip"),
+                "method": scope["method"],
+                "path": scope["path"],
+                "status_code": status_code,
+                "duration": round(time.perf_counter() - start_time, 4),
+            }
+        )
@@ -1,35 +1,44 @@
 import uuid
 
-from collections.abc import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
-class RequestParamsMiddleware(BaseHTTPMiddleware):
+class RequestParamsMiddleware:
     """
-    Middleware to add a request ID to the request
+    Middleware to add a request ID and client IP to the request state
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Dispatch
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        Args:
-            request (Request): Request object
-            call_next (Callable): Callable
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Set request params in `scope["state"]` and add the request ID header
 
-        Returns:
-            Response: Response object
+        Args:
+            scope (Scope): ASGI scope
+            receive (Receive): ASGI receive channel
+            send (Send): ASGI send channel
         """
 
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         request_id = str(uuid.uuid4())
-        client_ip = request.headers.get("X-Original-Forwarded-For")
-        if client_ip is None:
-            client_ip = request.client.host
+        client_ip = Headers(scope=scope).get("X-Original-Forwarded-For")
+        if client_ip is None and scope.get("client"):
+            client_ip = scope["client"][0]
+
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        state["client_ip"] = client_ip
+        state["traceback"] = None
 
-        request.state.request_id = request_id
-        request.state.client_ip = client_ip
-        request.state.traceback = None
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
 
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        return response
+        await self.app(scope, receive, send_with_request_id)
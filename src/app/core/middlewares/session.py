@@ -1,69 +1,161 @@
 import uuid
-import json
 
-from collections.abc import Callable
-from fastapi import Request, Response
 from datetime import datetime, timedelta, UTC
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+from starlette.routing import Match
+from starlette.requests import HTTPConnection
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.core.connectors.db.sql import session_repo
-from app.core.connectors.db.sql.models import Session
+from app.core.connectors.config import config
+from app.core.utils import session_utils, SessionInfo
+from app.core.connectors.db.redis import session_store
 
 
-class SessionMiddleware(BaseHTTPMiddleware):
+class SessionMiddleware:
     """
     Middleware to handle session management
+
+    Only requests routed to one of the `session_paths` route templates get a
+    session. Paths outside their static prefix pass straight through, others
+    are matched against the app routes, so sibling routes such as
+    `/weather/coords` skip the session work. The session cookie is a signed
+    token verified in memory, then checked against the Redis session store
+    and exposed to handlers as `request.state.session`. The store is the
+    source of truth: a new session is stored when its cookie is issued, and a
+    signed token missing from the store (revoked or expired on the server)
+    gets a new session instead of being restored.
+
+    With `session_sliding` every request extends the stored session, and the
+    cookie is renewed once less than half of its lifetime is left
     """
 
-    def __init__(self, app, session_cookie_name: str = "Session", session_expiry_days: int = 7):
-        super().__init__(app)
+    def __init__(
+        self,
+        app: ASGIApp,
+        session_cookie_name: str = "Session",
+        session_expiry_days: int | None = None,
+        paths: list[str] | None = None,
+    ):
+        self.app = app
         self.__session_cookie_name = session_cookie_name
-        self.__session_expiry_days = session_expiry_days
+        self.__lifetime = timedelta(days=session_expiry_days or config.session_expiry_days)
+        paths = paths or [f"/api/{config.api_prefix}{path}" for path in config.session_paths]
+        self.__routes = frozenset(paths)
+        self.__prefixes = tuple(path.split("{", 1)[0] for path in paths)
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Dispatch
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Reuse the session from the cookie or start a new one
 
         Args:
-            request (Request): Request object
-            call_next (Callable): Callable
+            scope (Scope): ASGI scope
+            receive (Receive): ASGI receive channel
+            send (Send): ASGI send channel
+        """
+
+        if scope["type"] != "http" or not self.__is_session_route(scope):
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        key_id = config.session_keys[0]
+        now = datetime.now(UTC)
+
+        session = await self.__get_session(scope)
+        if session is None:
+            session = SessionInfo(str(uuid.uuid4()), now + self.__lifetime, key_id)
+            await session_store.create(
+                session.session_id, state.get("client_ip"), session.expires_at
+            )
+        elif config.session_sliding and session.expires_at - now < self.__lifetime / 2:
+            session = session._replace(expires_at=now + self.__lifetime, key_id=key_id)
+        elif session.key_id == key_id:
+            state["session"] = session
+            await self.app(scope, receive, send)
+            return
+        else:
+            # Signed with a previous key, sign it again with the current one
+            session = session._replace(key_id=key_id)
+
+        state["session"] = session
+        cookie = self.__build_cookie(
+            session_utils.sign(session.session_id, session.expires_at), session.expires_at
+        )
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("set-cookie", cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+    def __is_session_route(self, scope: Scope) -> bool:
+        """
+        Check if the request is routed to a session route
+
+        The route is looked up the way the router does it, the first route
+        fully matching path and method wins
+
+        Args:
+            scope (Scope): ASGI scope
 
         Returns:
-            Response: Response object
+            bool: True if the matched route template is one of `session_paths`
         """
 
-        session_cookie = request.cookies.get(self.__session_cookie_name)
-        if session_cookie:
-            try:
-                session_data = json.loads(session_cookie)
-                expiry_date = datetime.fromisoformat(session_data.get("expiry"))
+        if not scope["path"].startswith(self.__prefixes):
+            return False
 
-                if expiry_date > datetime.now(UTC) and await session_repo.get_session(
-                    session_data.get("session_id")
-                ):
-                    request.state.session_id = session_data.get("session_id")
-                    response = await call_next(request)
-                    return response
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", None) in self.__routes
+        return False
 
-                request.cookies.clear()
-            except (json.JSONDecodeError, ValueError, TypeError):
-                pass
+    async def __get_session(self, scope: Scope) -> SessionInfo | None:
+        """
+        Get session from a valid session cookie that is still stored
 
-        session_id = str(uuid.uuid4())
-        expiry_date = datetime.now(UTC) + timedelta(days=self.__session_expiry_days)
+        Args:
+            scope (Scope): ASGI scope
+
+        Returns:
+            SessionInfo | None: Session or None if a new session is needed
+        """
+
+        token = HTTPConnection(scope).cookies.get(self.__session_cookie_name)
+        if not token:
+            return None
+
+        session = session_utils.verify(token)
+        if session is None:
+            return None
 
-        session_data = {"session_id": session_id, "expiry": expiry_date.isoformat()}
+        ttl = int(self.__lifetime.total_seconds()) if config.session_sliding else None
+        if not await session_store.validate(session.session_id, ttl):
+            return None
+        return session
 
-        await session_repo.add(Session(session_id=session_id, user_ip=request.state.client_ip))
+    def __build_cookie(self, value: str, expiry_date: datetime) -> str:
+        """
+        Build Set-Cookie header value for the session cookie
+
+        Args:
+            value (str): Cookie value
+            expiry_date (datetime): Cookie expiry
 
-        response = await call_next(request)
+        Returns:
+            str: Set-Cookie header value
+        """
 
+        response = Response()
         response.set_cookie(
             key=self.__session_cookie_name,
-            value=json.dumps(session_data),
+            value=value,
             expires=expiry_date,
             httponly=True,
             secure=True,
             samesite="strict",
         )
-
-        return response
+        return response.headers["set-cookie"]
@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field
+
+
+class CitySuggestion(BaseModel):
+    """
+    City suggestion model
+    """
+
+    name: str = Field(description="City name")
+    country: str = Field(description="Country name")
+    latitude: float = Field(description="Location latitude")
+    longitude: float = Field(description="Location longitude")
+    population: int = Field(description="City population")
+
+
+class CitySuggestionListResponse(BaseModel):
+    """
+    City suggestion list response model
+    """
+
+    status: str = Field(default="success", description="Response status")
+    suggestions: list[CitySuggestion] = Field(description="Suggested cities")
+
+
+class TrendingCity(BaseModel):
+    """
+    Trending city model
+    """
+
+    name: str = Field(description="City name")
+    country: str = Field(description="Country name")
+    latitude: float = Field(description="Location latitude")
+    longitude: float = Field(description="Location longitude")
+    lookups: int = Field(description="Number of lookups in the window")
+
+
+class TrendingCityListResponse(BaseModel):
+    """
+    Trending city list response model
+    """
+
+    status: str = Field(default="success", description="Response status")
+    window: str = Field(description="Time window")
+    cities: list[TrendingCity] = Field(description="Most looked up cities first")
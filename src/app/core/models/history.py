@@ -1,3 +1,4 @@
+from datetime import datetime
 from pydantic import BaseModel, Field
 
 
@@ -12,6 +13,7 @@ class HistoryResponse(BaseModel):
     country: str = Field(description="Country name")
     latitude: float = Field(description="Latitude")
     longitude: float = Field(description="Longitude")
+    created_at: datetime = Field(description="Creation time")
 
 
 class HistoryListResponse(BaseModel):
@@ -22,3 +24,6 @@ class HistoryListResponse(BaseModel):
     status: str = Field(default="success", description="Response status")
     message: str = Field(description="Response message")
     history: list[HistoryResponse] = Field(description="List of history records")
+    next_after: int | None = Field(
+        default=None, description="Cursor for the next page, None on the last page"
+    )
@@ -0,0 +1,171 @@
+import orjson
+import warnings
+import numpy as np
+
+HOURLY_VARIABLES = (
+    "temperature_2m",
+    "apparent_temperature",
+    "relative_humidity_2m",
+    "precipitation",
+    "cloud_cover",
+    "wind_speed_10m",
+)
+RESOLUTIONS = {"1h": 1, "3h": 3, "1d": 24}
+AGGREGATES = ("mean", "min", "max", "p10", "p50", "p90")
+MAX_DAYS = 16
+
+
+class HourlySeries:
+    """
+    Hourly forecast held as NumPy arrays, one per variable
+    """
+
+    def __init__(self, time: np.ndarray, values: dict[str, np.ndarray]):
+        self.time = time
+        self.values = values
+
+    @classmethod
+    def from_upstream(cls, hourly: dict) -> "HourlySeries":
+        """
+        Build series from the columnar `hourly` block of an upstream response
+
+        Args:
+            hourly (dict): Hourly block with `time` and one list per variable
+
+        Returns:
+            HourlySeries: Hourly series, missing values are NaN
+        """
+
+        return cls(
+            time=np.array(hourly["time"], dtype="datetime64[m]"),
+            values={
+                variable: np.array(hourly[variable], dtype=np.float32)
+                for variable in HOURLY_VARIABLES
+                if variable in hourly
+            },
+        )
+
+    @classmethod
+    def from_json(cls, data: bytes | str) -> "HourlySeries":
+        """
+        Build series from its JSON encoding
+
+        Args:
+            data (bytes | str): JSON produced by `to_json`
+
+        Returns:
+            HourlySeries: Hourly series
+        """
+
+        return cls.from_upstream(orjson.loads(data))
+
+    def to_json(self) -> bytes:
+        """
+        Encode series as JSON
+
+        Returns:
+            bytes: JSON object with `time` and one array per variable
+        """
+
+        return orjson.dumps({"time": self.time, **self.values}, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    @staticmethod
+    def __day_starts(time: np.ndarray, days: int) -> tuple[np.ndarray, int]:
+        """
+        Find where each local calendar day starts
+
+        Args:
+            time (np.ndarray): Local hourly timestamps, ascending
+            days (int): Number of days from the start of the series
+
+        Returns:
+            tuple[np.ndarray, int]: Index of the first hour of every day and
+                number of hours covered by the days
+        """
+
+        dates = time.astype("datetime64[D]")
+        hours = int(np.searchsorted(dates, dates[0] + days)) if len(dates) else 0
+        changes = dates[1:hours] != dates[: max(hours - 1, 0)]
+        return np.flatnonzero(np.r_[hours > 0, changes]), hours
+
+    @staticmethod
+    def __pad(values: np.ndarray, starts: np.ndarray, hours: int) -> np.ndarray:
+        """
+        Lay out blocks of different lengths as rows padded with NaN
+
+        Args:
+            values (np.ndarray): Hourly values
+            starts (np.ndarray): Index of the first hour of every block
+            hours (int): Number of hours covered by the blocks
+
+        Returns:
+            np.ndarray: One row per block
+        """
+
+        lengths = np.diff(starts, append=hours)
+        offsets = np.arange(lengths.max(initial=0))
+        index = np.minimum(starts[:, None] + offsets, max(hours - 1, 0))
+        return np.where(offsets < lengths[:, None], values[index], np.nan)
+
+    def aggregate(
+        self, variables: list[str], resolution: str, aggregates: list[str], days: int
+    ) -> dict:
+        """
+        Downsample series to the requested resolution
+
+        Hours are grouped into fixed blocks with a reshape, so every aggregate
+        is a single vectorized call over all blocks. Daily blocks follow the
+        local calendar date instead, so days with a DST change (23 or 25 hours)
+        are padded with NaN rather than shifting every later day. Hourly
+        resolution returns raw values and ignores aggregates
+
+        Args:
+            variables (list[str]): Variables to return
+            resolution (str): Resolution (1h, 3h, 1d)
+            aggregates (list[str]): Aggregates to compute (mean, min, max, p10, p50, p90)
+            days (int): Number of days from the start of the series
+
+        Returns:
+            dict: `time` array and `series` mapping variable -> aggregate -> array,
+                arrays are empty when the series has no hours
+        """
+
+        step = RESOLUTIONS[resolution]
+        if resolution == "1d":
+            starts, hours = self.__day_starts(self.time, days)
+        else:
+            hours = min(days * 24, len(self.time)) // step * step
+            starts = np.arange(0, hours, step)
+        percentiles = [int(aggregate[1:]) for aggregate in aggregates if aggregate[0] == "p"]
+
+        series = {}
+        for variable in variables:
+            values = self.values[variable][:hours]
+            if step == 1:
+                series[variable] = {"value": values}
+                continue
+            if not hours:
+                series[variable] = dict.fromkeys(aggregates, values)
+                continue
+
+            if resolution == "1d":
+                blocks = self.__pad(values, starts, hours)
+            else:
+                blocks = values.reshape(-1, step)
+            with warnings.catch_warnings():
+                # Blocks made only of missing values aggregate to NaN (null)
+                warnings.simplefilter("ignore", RuntimeWarning)
+                result = {
+                    aggregate: getattr(np, f"nan{aggregate}")(blocks, axis=1)
+                    for aggregate in aggregates
+                    if aggregate[0] != "p"
+                }
+                if percentiles:
+                    ranks = np.nanpercentile(blocks, percentiles, axis=1)
+                    result.update(zip((f"p{p}" for p in percentiles), ranks, strict=True))
+
+            series[variable] = {
+                aggregate: np.round(result[aggregate], 2) for aggregate in aggregates
+            }
+
+        return {"time": self.time[starts], "series": series}
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field
+import orjson
+
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class DailyForecast(BaseModel):
@@ -23,6 +25,41 @@ class WeatherResponse(BaseModel):
     country: str = Field(description="Country name")
     daily: list[DailyForecast] = Field(description="List of daily forecasts")
 
+    _daily_json: bytes | None = PrivateAttr(default=None)
+
+    def daily_json(self) -> bytes:
+        """
+        Get daily forecasts encoded as JSON
+
+        The encoding is kept on the instance and carried over by `model_copy`,
+        so a cached forecast is serialized once and shared by every response
+
+        Returns:
+            bytes: JSON array of daily forecasts
+        """
+
+        if self._daily_json is None:
+            self._daily_json = orjson.dumps([day.model_dump() for day in self.daily])
+        return self._daily_json
+
+    def to_json(self) -> bytes:
+        """
+        Encode forecast as JSON, reusing the encoded daily forecasts
+
+        Returns:
+            bytes: JSON object
+        """
+
+        return orjson.dumps(
+            {
+                "latitude": self.latitude,
+                "longitude": self.longitude,
+                "city": self.city,
+                "country": self.country,
+                "daily": orjson.Fragment(self.daily_json()),
+            }
+        )
+
 
 class WeatherListResponse(BaseModel):
     """
@@ -33,6 +70,79 @@ class WeatherListResponse(BaseModel):
     message: str = Field(description="Response message")
     weather: WeatherResponse = Field(description="Weather data")
 
+    @staticmethod
+    def encode(message: str, weather: WeatherResponse) -> bytes:
+        """
+        Encode response as JSON without building intermediate dicts
+
+        Args:
+            message (str): Response message
+            weather (WeatherResponse): Weather data
+
+        Returns:
+            bytes: JSON object
+        """
+
+        return orjson.dumps(
+            {
+                "status": "success",
+                "message": message,
+                "weather": orjson.Fragment(weather.to_json()),
+            }
+        )
+
+
+class Coordinates(BaseModel):
+    """
+    Coordinates model
+    """
+
+    latitude: float = Field(ge=-90, le=90, description="Latitude")
+    longitude: float = Field(ge=-180, le=180, description="Longitude")
+
+
+class WeatherBatchRequest(BaseModel):
+    """
+    Weather batch request model
+    """
+
+    cities: list[str] = Field(default_factory=list, description="List of city names")
+    coordinates: list[Coordinates] = Field(default_factory=list, description="List of coordinates")
+
+
+class WeatherBatchResponse(BaseModel):
+    """
+    Weather batch response model
+    """
+
+    status: str = Field(default="success", description="Response status")
+    message: str = Field(description="Response message")
+    weather: list[WeatherResponse] = Field(description="Weather data in request order")
+    not_found: list[str] = Field(description="Cities that could not be geocoded")
+
+    @staticmethod
+    def encode(message: str, weather: list[WeatherResponse], not_found: list[str]) -> bytes:
+        """
+        Encode response as JSON without building intermediate dicts
+
+        Args:
+            message (str): Response message
+            weather (list[WeatherResponse]): Weather data in request order
+            not_found (list[str]): Cities that could not be geocoded
+
+        Returns:
+            bytes: JSON object
+        """
+
+        return orjson.dumps(
+            {
+                "status": "success",
+                "message": message,
+                "weather": [orjson.Fragment(item.to_json()) for item in weather],
+                "not_found": not_found,
+            }
+        )
+
 
 class LocationInfo(BaseModel):
     """
@@ -1,7 +1,11 @@
 from .log import LogUtils
 from .base import BaseUtils
 from .weather import WeatherUtils
+from .session import SessionUtils, SessionInfo
+from .warmer import CacheWarmer
 
 log_utils = LogUtils()
 base_utils = BaseUtils()
 weather_utils = WeatherUtils()
+session_utils = SessionUtils()
+cache_warmer = CacheWarmer(weather_utils)
@@ -0,0 +1,94 @@
+import hmac
+import base64
+import hashlib
+
+from typing import NamedTuple
+from datetime import UTC, datetime
+
+from app.core.connectors.config import config
+
+VERSION = "v1"
+
+
+class SessionInfo(NamedTuple):
+    """
+    Verified session token contents
+    """
+
+    session_id: str
+    expires_at: datetime
+    key_id: str
+
+
+class SessionUtils:
+    """
+    Stateless session tokens signed with HMAC-SHA256
+
+    A token is `v1.<key id>.<session id>.<expiry>.<signature>`, where expiry
+    is a unix timestamp and the signature covers everything before it.
+    Tokens are verified in memory against the key named in the token, so keys
+    can be rotated without invalidating sessions signed with the previous key
+    """
+
+    def sign(self, session_id: str, expires_at: datetime) -> str:
+        """
+        Sign session token with the current key
+
+        Args:
+            session_id (str): Session ID
+            expires_at (datetime): Session expiry
+
+        Returns:
+            str: Session token
+        """
+
+        key_id, keys = config.session_keys
+        payload = f"{VERSION}.{key_id}.{session_id}.{int(expires_at.timestamp())}"
+        return f"{payload}.{self.__signature(keys[key_id], payload)}"
+
+    def verify(self, token: str) -> SessionInfo | None:
+        """
+        Verify session token
+
+        Args:
+            token (str): Session token
+
+        Returns:
+            SessionInfo | None: Session or None if the token is malformed,
+                signed with an unknown key, tampered with or expired
+        """
+
+        parts = token.split(".")
+        if len(parts) != 5 or parts[0] != VERSION:
+            return None
+
+        _, key_id, session_id, expiry, signature = parts
+        key = config.session_keys[1].get(key_id)
+        if key is None or not session_id or not expiry.isdigit():
+            return None
+
+        payload = token.rsplit(".", 1)[0]
+        if not hmac.compare_digest(signature, self.__signature(key, payload)):
+            return None
+
+        expires_at = datetime.fromtimestamp(int(expiry), UTC)
+        if expires_at <= datetime.now(UTC):
+            return None
+
+        return SessionInfo(session_id=session_id, expires_at=expires_at, key_id=key_id)
+
+    @staticmethod
+    def __signature(key: str, payload: str) -> str:
+        """
+        Sign payload
+
+        Args:
+            key (str): Signing key
+            payload (str): Token without signature
+
+        Returns:
+            str: URL-safe base64 HMAC-SHA256 without padding
+        """
+
+        digest = hmac.new(key.encode(), payload.encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
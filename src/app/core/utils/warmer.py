@@ -0,0 +1,169 @@
+import time
+import asyncio
+
+from traceback import format_exc
+from datetime import UTC, datetime, timedelta
+
+from .weather import WeatherUtils
+from app.core.geo import gazetteer
+from app.core.metrics import app_metrics
+from app.core.caches import geocoding_cache
+from app.core.connectors.config import config
+from app.core.connectors.logging import logger
+from app.core.models.weather import LocationInfo
+from app.core.connectors.db.redis import redis_connector
+from app.core.connectors.db.sql import history_repo
+
+LOCK_KEY = "prewarm:lock"
+
+
+class CacheWarmer:
+    """
+    Scheduled pre-warming of the caches behind the most searched locations
+
+    A run reads the `prewarm_top_n` locations searched most often in the last
+    `prewarm_lookback` hours and, with at most `prewarm_concurrency` locations
+    in flight, refreshes:
+
+    - geocoding entries expiring within `prewarm_refresh_ahead` seconds
+    - forecast cells that are missing or stale after a model update
+
+    Entries refreshed recently are skipped. A Redis lock held for the run
+    interval lets a single worker run per interval
+    """
+
+    def __init__(self, weather_utils: WeatherUtils):
+        self.__weather_utils = weather_utils
+
+    async def run(self) -> None:
+        """
+        Warm caches for the most searched locations
+        """
+
+        started = time.perf_counter()
+
+        if not await self.__lock():
+            app_metrics.record_prewarm_run("skipped", time.perf_counter() - started)
+            return
+
+        since = datetime.now(UTC) - timedelta(hours=config.prewarm_lookback)
+        locations = await history_repo.get_top_locations(since, config.prewarm_top_n)
+        if locations is None:
+            app_metrics.record_prewarm_run("error", time.perf_counter() - started)
+            return
+
+        semaphore = asyncio.Semaphore(config.prewarm_concurrency)
+
+        async def warm(location: LocationInfo) -> None:
+            async with semaphore:
+                await self.__warm_geocoding(location.name)
+                await self.__warm_forecast(location)
+
+        await asyncio.gather(
+            *(
+                warm(
+                    LocationInfo(
+                        name=row.city,
+                        country=row.country,
+                        latitude=row.latitude,
+                        longitude=row.longitude,
+                    )
+                )
+                for row in locations
+            )
+        )
+
+        duration = time.perf_counter() - started
+        app_metrics.record_prewarm_run("success", duration)
+        logger.info(
+            {
+                "type": "prewarm",
+                "message": "cache pre-warm finished",
+                "locations": len(locations),
+                "duration": round(duration, 3),
+            }
+        )
+
+    async def __lock(self) -> bool:
+        """
+        Take the run lock for one interval
+
+        Redis errors let the run through
+
+        Returns:
+            bool: True if this worker should run
+        """
+
+        try:
+            return bool(
+                await redis_connector.set(
+                    LOCK_KEY, "1", nx=True, ex=max(config.prewarm_interval - 1, 1)
+                )
+            )
+        except Exception as e:
+            logger.error(
+                {
+                    "type": "prewarm",
+                    "key": LOCK_KEY,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
+            return True
+
+    async def __warm_geocoding(self, city_name: str) -> None:
+        """
+        Refresh geocoding entry of city if it expires soon
+
+        Args:
+            city_name (str): City name as searched
+        """
+
+        if gazetteer.lookup(city_name) is not None:
+            app_metrics.record_prewarm_key("geocoding", "skipped")
+            return
+
+        ttl = await geocoding_cache.ttl(city_name)
+        if ttl is None or ttl > config.prewarm_refresh_ahead:
+            app_metrics.record_prewarm_key("geocoding", "skipped")
+            return
+
+        try:
+            await self.__weather_utils.refresh_location(city_name)
+        except Exception as e:
+            app_metrics.record_prewarm_key("geocoding", "failed")
+            logger.error(
+                {
+                    "type": "prewarm",
+                    "cache": "geocoding",
+                    "city": city_name,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
+        else:
+            app_metrics.record_prewarm_key("geocoding", "warmed")
+
+    async def __warm_forecast(self, location: LocationInfo) -> None:
+        """
+        Load forecast of location unless its cell is fresh
+
+        Args:
+            location (LocationInfo): Location
+        """
+
+        try:
+            warmed = await self.__weather_utils.refresh_forecast(location)
+        except Exception as e:
+            app_metrics.record_prewarm_key("forecast", "failed")
+            logger.error(
+                {
+                    "type": "prewarm",
+                    "cache": "forecast",
+                    "city": location.name,
+                    "error": str(e),
+                    "traceback": format_exc(),
+                }
+            )
+        else:
+            app_metrics.record_prewarm_key("forecast", "warmed" if warmed else "skipped")
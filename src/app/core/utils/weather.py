@@ -1,21 +1,83 @@
-import httpx
+import orjson
+import asyncio
 
+from functools import partial
+
+from app.core.metrics import app_metrics
+from app.core.geo import gazetteer
 from app.core.connectors.config import config
-from app.core.models.weather import LocationInfo, WeatherResponse, DailyForecast
+from app.core.connectors.logging import logger
+from app.core.connectors.http import http_connector
+from app.core.models.weather import LocationInfo, WeatherResponse
+from app.core.models.hourly import HourlySeries, HOURLY_VARIABLES, MAX_DAYS
+from app.core.caches import (
+    forecast_cache,
+    geocoding_cache,
+    hourly_cache,
+    single_flight,
+    FRESH,
+    STALE,
+    REFRESHED,
+)
 
 
 class WeatherUtils:
     def __init__(self):
         self.openmeteo_api_url = config.openmeteo_api_url
         self.openmeteo_geocoding_api_url = config.openmeteo_geocoding_api_url
+        self.__refresh_tasks: set[asyncio.Task] = set()
 
     async def get_location(self, city_name: str) -> LocationInfo | None:
+        location = gazetteer.lookup(city_name)
+        if location is not None:
+            app_metrics.record_cache_lookup("geocoding", "gazetteer", "hit")
+            return location
+
+        found, location = await geocoding_cache.get(city_name)
+        if found:
+            return location
+
+        return await single_flight.do(
+            geocoding_cache.key(city_name), partial(self.__load_location, city_name)
+        )
+
+    async def __load_location(self, city_name: str) -> LocationInfo | None:
+        # Re-check: the entry may have been filled by another caller or worker
+        found, location = await geocoding_cache.get(city_name)
+        if found:
+            return location
+
+        location = await self.__fetch_location(city_name)
+        await geocoding_cache.set(city_name, location)
+        return location
+
+    async def refresh_location(self, city_name: str) -> LocationInfo | None:
+        """
+        Geocode city upstream and replace its cache entry
+
+        Args:
+            city_name (str): City name
+
+        Returns:
+            LocationInfo | None: Location or None if not found
+        """
+
+        return await single_flight.do(
+            geocoding_cache.key(city_name), partial(self.__store_location, city_name)
+        )
+
+    async def __store_location(self, city_name: str) -> LocationInfo | None:
+        location = await self.__fetch_location(city_name)
+        await geocoding_cache.set(city_name, location)
+        return location
+
+    async def __fetch_location(self, city_name: str) -> LocationInfo | None:
         params = {"name": city_name, "count": 1, "language": "en", "format": "json"}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(self.openmeteo_geocoding_api_url + "/search", params=params)
-            response.raise_for_status()
-            data = response.json()
+        response = await http_connector.get(
+            self.openmeteo_geocoding_api_url + "/search", params=params, endpoint="geocoding"
+        )
+        data = response.json()
 
         if not data.get("results"):
             return None
@@ -29,32 +91,271 @@ class WeatherUtils:
         )
 
     async def get_weekly_forecast(self, location: LocationInfo) -> WeatherResponse:
+        forecast, _ = await self.get_forecast_with_state(location)
+        return forecast
+
+    async def get_forecast_with_state(self, location: LocationInfo) -> tuple[WeatherResponse, str]:
+        """
+        Get forecast and the cache state it was served from
+
+        Stale entries are returned right away and refreshed in the background
+
+        Args:
+            location (LocationInfo): Location
+
+        Returns:
+            tuple[WeatherResponse, str]: Forecast and cache state (fresh, stale, refreshed)
+        """
+
+        latitude, longitude = forecast_cache.cell(location.latitude, location.longitude)
+        key = forecast_cache.key(latitude, longitude)
+
+        forecast, state = await forecast_cache.get(latitude, longitude)
+        if state == STALE:
+            self.__schedule_refresh(key, location, latitude, longitude)
+        elif forecast is None:
+            forecast = await single_flight.do(
+                key, partial(self.__load_forecast, location, latitude, longitude)
+            )
+            state = REFRESHED
+
+        app_metrics.record_forecast_response(state)
+        return self.__localize(forecast, location), state
+
+    async def refresh_forecast(self, location: LocationInfo) -> bool:
+        """
+        Load forecast of the location's grid cell unless it is fresh
+
+        Args:
+            location (LocationInfo): Location
+
+        Returns:
+            bool: True if the forecast was fetched, False if the cache was fresh
+        """
+
+        latitude, longitude = forecast_cache.cell(location.latitude, location.longitude)
+
+        _, state = await forecast_cache.get(latitude, longitude)
+        if state == FRESH:
+            return False
+
+        await single_flight.do(
+            forecast_cache.key(latitude, longitude),
+            partial(self.__load_forecast, location, latitude, longitude),
+        )
+        return True
+
+    async def get_hourly_forecast(self, location: LocationInfo) -> HourlySeries:
+        """
+        Get hourly series for the grid cell of a location
+
+        The full horizon of every supported variable is fetched and cached
+        once per cell, requests only slice and aggregate it
+
+        Args:
+            location (LocationInfo): Location
+
+        Returns:
+            HourlySeries: Hourly series
+        """
+
+        latitude, longitude = forecast_cache.cell(location.latitude, location.longitude)
+
+        series = await hourly_cache.get(latitude, longitude)
+        if series is not None:
+            return series
+
+        return await single_flight.do(
+            hourly_cache.key(latitude, longitude),
+            partial(self.__load_hourly, latitude, longitude),
+        )
+
+    async def __load_hourly(self, latitude: float, longitude: float) -> HourlySeries:
+        # Re-check: the entry may have been filled by another caller or worker
+        series = await hourly_cache.get(latitude, longitude)
+        if series is not None:
+            return series
+
         params = {
-            "latitude": location.latitude,
-            "longitude": location.longitude,
-            "daily": "temperature_2m_max,temperature_2m_min,weathercode",
+            "latitude": latitude,
+            "longitude": longitude,
+            "hourly": ",".join(HOURLY_VARIABLES),
+            "forecast_days": MAX_DAYS,
             "timezone": "auto",
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(self.openmeteo_api_url + "/forecast", params=params)
-            response.raise_for_status()
-            data = response.json()
-
-        forecasts = [
-            DailyForecast(
-                date=data["daily"]["time"][i],
-                temperature_max=data["daily"]["temperature_2m_max"][i],
-                temperature_min=data["daily"]["temperature_2m_min"][i],
-                weather_code=data["daily"]["weathercode"][i],
+        response = await http_connector.get(
+            self.openmeteo_api_url + "/forecast", params=params, endpoint="forecast"
+        )
+        series = HourlySeries.from_upstream(orjson.loads(response.content)["hourly"])
+
+        await hourly_cache.set(latitude, longitude, series)
+        return series
+
+    async def get_locations(self, city_names: list[str]) -> list[LocationInfo | None]:
+        """
+        Geocode cities concurrently with bounded parallelism
+
+        Args:
+            city_names (list[str]): City names
+
+        Returns:
+            list[LocationInfo | None]: Locations in input order, None if not found
+        """
+
+        semaphore = asyncio.Semaphore(config.batch_geocoding_concurrency)
+
+        async def locate(city_name: str) -> LocationInfo | None:
+            async with semaphore:
+                return await self.get_location(city_name)
+
+        return await asyncio.gather(*(locate(city_name) for city_name in city_names))
+
+    async def get_batch_forecast(self, locations: list[LocationInfo]) -> list[WeatherResponse]:
+        """
+        Get forecasts for many locations with as few upstream calls as possible
+
+        Cached cells are served from cache, the rest are fetched in chunks
+        using multi-coordinate upstream requests
+
+        Args:
+            locations (list[LocationInfo]): Locations
+
+        Returns:
+            list[WeatherResponse]: Forecasts in input order
+        """
+
+        cells: dict[tuple[float, float], LocationInfo] = {}
+        for location in locations:
+            cells.setdefault(forecast_cache.cell(location.latitude, location.longitude), location)
+
+        cached = await asyncio.gather(*(forecast_cache.get(*cell) for cell in cells))
+
+        forecasts: dict[tuple[float, float], WeatherResponse] = {}
+        missing: list[tuple[LocationInfo, float, float]] = []
+        for (cell, location), (forecast, state) in zip(cells.items(), cached, strict=True):
+            if forecast is None:
+                missing.append((location, *cell))
+                continue
+
+            if state == STALE:
+                self.__schedule_refresh(forecast_cache.key(*cell), location, *cell)
+
+            forecasts[cell] = forecast
+            app_metrics.record_forecast_response(state)
+
+        chunk_size = config.batch_forecast_chunk_size
+        chunks = [missing[i : i + chunk_size] for i in range(0, len(missing), chunk_size)]
+        fetched = await asyncio.gather(*(self.__fetch_forecasts(chunk) for chunk in chunks))
+
+        for chunk, chunk_forecasts in zip(chunks, fetched, strict=True):
+            for (_, latitude, longitude), forecast in zip(chunk, chunk_forecasts, strict=True):
+                await forecast_cache.set(latitude, longitude, forecast)
+                forecasts[(latitude, longitude)] = forecast
+                app_metrics.record_forecast_response(REFRESHED)
+
+        return [
+            self.__localize(
+                forecasts[forecast_cache.cell(location.latitude, location.longitude)], location
+            )
+            for location in locations
+        ]
+
+    @staticmethod
+    def __localize(forecast: WeatherResponse, location: LocationInfo) -> WeatherResponse:
+        return forecast.model_copy(
+            update={
+                "latitude": location.latitude,
+                "longitude": location.longitude,
+                "city": location.name,
+                "country": location.country,
+            }
+        )
+
+    def __schedule_refresh(
+        self, key: str, location: LocationInfo, latitude: float, longitude: float
+    ) -> None:
+        task = asyncio.ensure_future(
+            single_flight.do(key, partial(self.__load_forecast, location, latitude, longitude))
+        )
+        self.__refresh_tasks.add(task)
+        task.add_done_callback(self.__refresh_done)
+
+    def __refresh_done(self, task: asyncio.Task) -> None:
+        self.__refresh_tasks.discard(task)
+
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                {
+                    "type": "cache",
+                    "service": "forecast",
+                    "message": "background forecast refresh failed",
+                    "error": str(task.exception()),
+                }
             )
-            for i in range(len(data["daily"]["time"]))
+
+    async def __load_forecast(
+        self, location: LocationInfo, latitude: float, longitude: float
+    ) -> WeatherResponse:
+        # Re-check: the entry may have been refreshed by another caller or worker
+        forecast, state = await forecast_cache.get(latitude, longitude)
+        if state == FRESH:
+            return forecast
+
+        [forecast] = await self.__fetch_forecasts([(location, latitude, longitude)])
+        await forecast_cache.set(latitude, longitude, forecast)
+        return forecast
+
+    async def __fetch_forecasts(
+        self, cells: list[tuple[LocationInfo, float, float]]
+    ) -> list[WeatherResponse]:
+        params = {
+            "latitude": ",".join(str(latitude) for _, latitude, _ in cells),
+            "longitude": ",".join(str(longitude) for _, _, longitude in cells),
+            "daily": "temperature_2m_max,temperature_2m_min,weathercode",
+            "timezone": "auto",
+        }
+
+        response = await http_connector.get(
+            self.openmeteo_api_url + "/forecast", params=params, endpoint="forecast"
+        )
+        data = orjson.loads(response.content)
+
+        # Open-Meteo returns a single object for one location and a list for several
+        if isinstance(data, dict):
+            data = [data]
+
+        return [
+            self.__parse_forecast(location, item)
+            for (location, _, _), item in zip(cells, data, strict=True)
         ]
 
-        return WeatherResponse(
-            latitude=location.latitude,
-            longitude=location.longitude,
-            city=location.name,
-            country=location.country,
-            daily=forecasts,
+    @staticmethod
+    def __parse_forecast(location: LocationInfo, data: dict) -> WeatherResponse:
+        daily = data["daily"]
+        # Transpose the columnar arrays in one pass and validate the whole model at once
+        days = zip(
+            daily["time"],
+            daily["temperature_2m_max"],
+            daily["temperature_2m_min"],
+            daily["weathercode"],
+            strict=True,
+        )
+
+        return WeatherResponse.model_validate(
+            {
+                "latitude": location.latitude,
+                "longitude": location.longitude,
+                "city": location.name,
+                "country": location.country,
+                "daily": [
+                    {
+                        "date": date,
+                        "temperature_max": temperature_max,
+                        "temperature_min": temperature_min,
+                        "weather_code": weather_code,
+                    }
+                    for date, temperature_max, temperature_min, weather_code in days
+                ],
+            }
         )
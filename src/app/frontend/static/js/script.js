@@ -20,15 +20,20 @@ document.addEventListener('DOMContentLoaded', async function() {
     // --- Inline autocomplete logic ---
     let currentSuggestion = '';
     let lastQuery = '';
+    let suggestionTimer = null;
+    let suggestionController = null;
+    const SUGGESTION_DELAY = 150; // ms
   
     async function fetchCitySuggestions(query) {
         if (!query) return [];
+        if (suggestionController) suggestionController.abort();
+        suggestionController = new AbortController();
         try {
-            const url = `https://geocoding-api.open-meteo.com/v1/search?name=${encodeURIComponent(query)}&count=5&language=en&format=json`;
-            const res = await fetch(url);
+            const url = `/api/v1/cities/suggest?q=${encodeURIComponent(query)}&limit=5`;
+            const res = await fetch(url, { signal: suggestionController.signal });
             if (!res.ok) return [];
             const data = await res.json();
-            return (data.results || []).map(item => item.name);
+            return (data.suggestions || []).map(item => item.name);
         } catch {
             return [];
         }
@@ -45,6 +50,7 @@ document.addEventListener('DOMContentLoaded', async function() {
         if (lastQuery === value) return;
         lastQuery = value;
         const suggestions = await fetchCitySuggestions(value);
+        if (searchInput.value !== value) return;
         const match = suggestions.find(name => name.toLowerCase().startsWith(value.toLowerCase()) && name.length > value.length);
         if (match) {
             suggestedSpan.textContent = match.slice(value.length);
@@ -55,7 +61,19 @@ document.addEventListener('DOMContentLoaded', async function() {
         }
     }
   
-    searchInput.addEventListener('input', updateInlineSuggestion);
+    searchInput.addEventListener('input', function() {
+        const value = searchInput.value;
+        enteredSpan.textContent = value;
+        // Keep the current suggestion while it still matches, otherwise hide it until the next lookup
+        if (currentSuggestion.toLowerCase().startsWith(value.toLowerCase()) && currentSuggestion.length > value.length) {
+            suggestedSpan.textContent = currentSuggestion.slice(value.length);
+        } else {
+            suggestedSpan.textContent = '';
+            currentSuggestion = '';
+        }
+        clearTimeout(suggestionTimer);
+        suggestionTimer = setTimeout(updateInlineSuggestion, SUGGESTION_DELAY);
+    });
   
     searchInput.addEventListener('keydown', async function(e) {
         if ((e.key === 'Tab' || e.key === 'ArrowRight') && currentSuggestion) {
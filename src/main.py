@@ -1,22 +1,35 @@
+import os
+import asyncio
+
 from typing import Any
 from rich import traceback
 from fastapi import APIRouter, FastAPI
 from contextlib import asynccontextmanager
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from datetime import datetime
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from prometheus_fastapi_instrumentator import Instrumentator
 
-from app.core.utils import base_utils
+from app.core.geo import gazetteer
+from app.core.utils import base_utils, cache_warmer
 from app.core.views import home_routes
 from app.core.handlers import ErrorHandlers
 from app.core.decorators import log_operation
 from app.core.connectors.config import config
+from app.core.connectors.logging import logger
+from app.core.connectors.http import http_connector
 from app.core.api.main.routes import main_routes
-from app.core.api.v1.routes import services_routes
-from app.core.connectors.db.sql import init_models
-from app.core.connectors.db.redis import redis_connector
+from app.core.api.v1.routes import cities_routes, services_routes
+from app.core.connectors.db.sql import init_models, history_writer, sql_connector
+from app.core.connectors.secrets import secret_provider
+from app.core.connectors.db.redis import (
+    redis_connector,
+    session_redis,
+    trending_redis,
+    rate_limit_redis,
+)
 from app.core.middlewares import LoggingMiddleware, RequestParamsMiddleware, SessionMiddleware
 
 
@@ -95,6 +108,7 @@ class App:
         home_router.include_router(home_routes.router)
         default_router.include_router(main_routes.router)
         api_router.include_router(services_routes.router)
+        api_router.include_router(cities_routes.router)
 
         self.__app.include_router(router=home_router)
         self.__app.include_router(router=default_router)
@@ -108,12 +122,31 @@ class App:
         Instrumentator().instrument(self.__app).expose(app=self.__app, include_in_schema=False)
         ErrorHandlers(self.__app)
 
+    @log_operation("start", "secrets")
+    async def __start_secrets(self) -> None:
+        """
+        Load Vault secrets into memory and start background refresh
+        """
+
+        if os.getenv("USE_TEST_CONFIG") == "1":
+            return
+
+        await secret_provider.load("db")
+        await secret_provider.load("access/authorization")
+        await secret_provider.load("session")
+        # Fail on startup rather than on the first session request
+        _ = config.session_keys
+        secret_provider.on_rotate("db", sql_connector.reconnect)
+        secret_provider.start()
+
+    @log_operation("start", "sql")
     async def __setup_db(self) -> None:
         """
-        Setup application database
+        Create shared SQL engine and setup application database
         """
 
-        await init_models()
+        sql_connector.connect()
+        await init_models(sql_connector)
 
     @log_operation("job", "pycache_cleanup")
     async def __job_pycache_remove(self) -> None:
@@ -128,6 +161,26 @@ class App:
             replace_existing=True,
         )
 
+    @log_operation("job", "cache_prewarm")
+    async def __job_cache_prewarm(self) -> None:
+        """
+        Adds a job to pre-warm caches for the most searched locations,
+        the first run starts right away
+        """
+
+        if not config.prewarm_enabled:
+            return
+
+        self.__scheduler.add_job(
+            cache_warmer.run,
+            trigger=IntervalTrigger(seconds=config.prewarm_interval),
+            id="cache_prewarm",
+            next_run_time=datetime.now(),
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True,
+        )
+
     @log_operation("start", "scheduler")
     async def __start_scheduler(self) -> None:
         """
@@ -143,6 +196,34 @@ class App:
         e"""
 
         await redis_connector.ping()
+        await session_redis.ping()
+        await trending_redis.ping()
+        await rate_limit_redis.ping()
+
+    @log_operation("start", "http")
+    async def __start_http(self) -> None:
+        """
+        Start shared upstream HTTP client
+        """
+
+        http_connector.connect()
+
+    @log_operation("start", "gazetteer")
+    async def __load_gazetteer(self) -> None:
+        """
+        Load offline city gazetteer
+        """
+
+        if config.gazetteer_enabled:
+            await asyncio.to_thread(gazetteer.load)
+
+    @log_operation("start", "history_writer")
+    async def __start_history_writer(self) -> None:
+        """
+        Start background history writer
+        """
+
+        history_writer.start()
 
     @log_operation("stop", "scheduler")
     async def __stop_scheduler(self) -> None:
@@ -152,6 +233,30 @@ class App:
 
         self.__scheduler.shutdown()
 
+    @log_operation("stop", "history_writer")
+    async def __stop_history_writer(self) -> None:
+        """
+        Flush queued history and stop background writer
+        """
+
+        await history_writer.stop()
+
+    @log_operation("stop", "sql")
+    async def __stop_db(self) -> None:
+        """
+        Dispose shared SQL engine
+        """
+
+        await sql_connector.dispose()
+
+    @log_operation("stop", "secrets")
+    async def __stop_secrets(self) -> None:
+        """
+        Stop background secret refresh
+        """
+
+        await secret_provider.stop()
+
     @log_operation("stop", "redis")
     async def __stop_redis(self) -> None:
         """
@@ -160,6 +265,25 @@ class App:
 
         await redis_connector.flushdb()
         await redis_connector.close()
+        await session_redis.close()
+        await trending_redis.close()
+        await rate_limit_redis.close()
+
+    @log_operation("stop", "http")
+    async def __stop_http(self) -> None:
+        """
+        Stop shared upstream HTTP client
+        """
+
+        await http_connector.close()
+
+    @log_operation("stop", "logging")
+    async def __stop_logging(self) -> None:
+        """
+        Write queued log records and stop the log writer thread
+        """
+
+        logger.stop()
 
     @asynccontextmanager
     async def lifespan(self, _: FastAPI) -> Any:
@@ -177,11 +301,21 @@ class App:
             await self.__job_pycache_remove()
             await self.__start_scheduler()
             await self.__start_redis()
+            await self.__start_http()
+            await self.__load_gazetteer()
+            await self.__start_secrets()
             await self.__setup_db()
+            await self.__start_history_writer()
+            await self.__job_cache_prewarm()
             yield
         finally:
             await self.__stop_scheduler()
+            await self.__stop_history_writer()
+            await self.__stop_db()
+            await self.__stop_secrets()
             await self.__stop_redis()
+            await self.__stop_http()
+            await self.__stop_logging()
 
     @property
     def app(self) -> FastAPI:
@@ -18,7 +18,7 @@ os.environ["USE_TEST_CONFIG"] = "1"
 
 from src.app.core.connectors.config import config  #  noqa
 from src.app.core.api.main.routes import main_routes  #  noqa
-from src.app.core.api.v1.routes import services_routes  #  noqa
+from src.app.core.api.v1.routes import cities_routes, services_routes  #  noqa
 
 
 @pytest.fixture(scope="session")
@@ -34,6 +34,7 @@ def app():
 
     default_router.include_router(main_routes.router)
     api_router.include_router(services_routes.router)
+    api_router.include_router(cities_routes.router)
 
     app.include_router(router=default_router)
     app.include_router(router=api_router)
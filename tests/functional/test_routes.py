@@ -1,8 +1,32 @@
+import orjson
 import pytest
 
 from fastapi import status
-from datetime import datetime, timedelta
-from unittest.mock import patch, AsyncMock
+from typing import NamedTuple
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch, AsyncMock, MagicMock
+
+from app.core.models.weather import LocationInfo
+from app.core.utils import weather_utils
+from app.core.caches import trending_cities
+from app.core.connectors.config import config
+from app.core.utils import SessionInfo
+from app.core.connectors.db.sql import history_repo, history_writer
+
+
+class HistoryRow(NamedTuple):
+    id: int
+    session_id: str
+    city: str
+    country: str
+    latitude: float
+    longitude: float
+    created_at: datetime
+
+
+def make_history_rows(*ids: int) -> list[HistoryRow]:
+    created_at = datetime(2025, 1, 1, tzinfo=UTC)
+    return [HistoryRow(i, "session", "Moscow", "Russia", 55.75, 37.62, created_at) for i in ids]
 
 
 @pytest.mark.asyncio
@@ -95,3 +119,323 @@ async def test_weather_not_found(client):
     data = response.json()
     assert data["status"] == "error"
     assert data["message"] == "city not found"
+
+
+@pytest.mark.asyncio
+async def test_weather_records_trending_in_background(client) -> None:
+    """
+    Test weather lookup is counted for trending cities after the response
+    """
+
+    location = LocationInfo(name="Moscow", country="Russia", latitude=55.75, longitude=37.62)
+    forecast = MagicMock(to_json=MagicMock(return_value=b"{}"))
+
+    with (
+        patch.object(weather_utils, "get_location", AsyncMock(return_value=location)),
+        patch.object(
+            weather_utils, "get_forecast_with_state", AsyncMock(return_value=(forecast, "HIT"))
+        ),
+        patch.object(trending_cities, "record", AsyncMock()) as mock_record,
+    ):
+        response = client.get("/api/v1/weather/Moscow")
+
+    assert response.status_code == status.HTTP_200_OK
+    mock_record.assert_awaited_once_with(location)
+
+
+@pytest.mark.asyncio
+async def test_weather_records_session_history(client, mock_request_state) -> None:
+    """
+    Test weather lookup queues history for the request session
+    """
+
+    location = LocationInfo(name="Moscow", country="Russia", latitude=55.75, longitude=37.62)
+    forecast = MagicMock(to_json=MagicMock(return_value=b"{}"))
+    mock_request_state.session = SessionInfo("abc", datetime(2025, 1, 8, tzinfo=UTC), "test")
+
+    with (
+        patch.object(weather_utils, "get_location", AsyncMock(return_value=location)),
+        patch.object(
+            weather_utils, "get_forecast_with_state", AsyncMock(return_value=(forecast, "HIT"))
+        ),
+        patch.object(trending_cities, "record", AsyncMock()),
+        patch.object(history_writer, "submit") as mock_submit,
+    ):
+        response = client.get("/api/v1/weather/Moscow")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert mock_submit.call_args.args[0].session_id == "abc"
+
+
+def forecast_payload(latitude: float, longitude: float) -> dict:
+    """
+    Build upstream forecast payload for a single location
+    """
+
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "daily": {
+            "time": ["2024-04-01", "2024-04-02"],
+            "temperature_2m_max": [10.0, 12.0],
+            "temperature_2m_min": [1.0, 2.0],
+            "weathercode": [3, 61],
+        },
+    }
+
+
+@pytest.mark.asyncio
+@patch("app.core.utils.weather.http_connector.get", new_callable=AsyncMock)
+@patch("app.core.caches.forecast.redis_connector", new_callable=AsyncMock)
+async def test_weather_batch_coordinates(mock_redis, mock_http_get, client) -> None:
+    """
+    Test batch endpoint fetches all uncached cells in one upstream call
+    """
+
+    mock_redis.get.return_value = None
+    mock_http_get.return_value = MagicMock(
+        content=orjson.dumps([forecast_payload(10.0, 20.0), forecast_payload(11.0, 21.0)])
+    )
+
+    response = client.post(
+        "/api/v1/weather/batch",
+        json={
+            "coordinates": [
+                {"latitude": 10.0, "longitude": 20.0},
+                {"latitude": 11.0, "longitude": 21.0},
+                {"latitude": 10.01, "longitude": 20.01},
+            ]
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [w["latitude"] for w in data["weather"]] == [10.0, 11.0, 10.01]
+    assert len(data["weather"][0]["daily"]) == 2
+
+    mock_http_get.assert_awaited_once()
+    params = mock_http_get.await_args.kwargs["params"]
+    assert params["latitude"] == "10.0,11.0"
+    assert params["longitude"] == "20.0,21.0"
+
+
+@pytest.mark.asyncio
+async def test_weather_batch_empty(client) -> None:
+    """
+    Test batch endpoint rejects empty batches
+    """
+
+    response = client.post("/api/v1/weather/batch", json={"cities": [], "coordinates": []})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["status"] == "error"
+
+
+@pytest.mark.asyncio
+@patch("app.core.utils.weather.http_connector.get", new_callable=AsyncMock)
+@patch("app.core.caches.forecast.redis_connector", new_callable=AsyncMock)
+async def test_weather_coords(mock_redis, mock_http_get, client) -> None:
+    """
+    Test coordinates endpoint skips geocoding and uses the forecast cache
+    """
+
+    mock_redis.get.return_value = None
+    mock_http_get.return_value = MagicMock(content=orjson.dumps(forecast_payload(-12.0, -77.0)))
+
+    response = client.get("/api/v1/weather/coords", params={"lat": -12.04, "lon": -77.03})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-Cache-Status"] == "refreshed"
+    assert response.json()["weather"]["latitude"] == -12.04
+
+    response = client.get("/api/v1/weather/coords", params={"lat": -12.01, "lon": -77.02})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-Cache-Status"] == "fresh"
+
+    mock_http_get.assert_awaited_once()
+    assert "/forecast" in mock_http_get.await_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_weather_coords_invalid(client) -> None:
+    """
+    Test coordinates endpoint validates ranges
+    """
+
+    response = client.get("/api/v1/weather/coords", params={"lat": 100, "lon": 0})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+@patch("app.core.geo.gazetteer.population")
+@patch("app.core.geo.gazetteer.location")
+@patch("app.core.geo.gazetteer.suggest")
+async def test_cities_suggest(mock_suggest, mock_location, mock_population, client) -> None:
+    """
+    Test city suggestions endpoint
+    """
+
+    mock_suggest.return_value = [0]
+    mock_location.return_value = LocationInfo(
+        name="Moscow", country="Russia", latitude=55.75204, longitude=37.61781
+    )
+    mock_population.return_value = 10381222
+
+    response = client.get("/api/v1/cities/suggest", params={"q": "mos"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["suggestions"][0]["name"] == "Moscow"
+    mock_suggest.assert_called_once_with("mos", 5)
+
+    response = client.get("/api/v1/cities/suggest", params={"q": ""})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+@patch("app.core.utils.weather.http_connector.get", new_callable=AsyncMock)
+@patch("app.core.caches.hourly.redis_connector", new_callable=AsyncMock)
+@patch("app.core.geo.gazetteer.lookup")
+async def test_weather_hourly(mock_lookup, mock_redis, mock_http_get, client) -> None:
+    """
+    Test hourly endpoint downsamples the cached series
+    """
+
+    mock_lookup.return_value = LocationInfo(
+        name="Lima", country="Peru", latitude=-12.04, longitude=-77.03
+    )
+    mock_redis.get.return_value = None
+    mock_http_get.return_value = MagicMock(
+        content=orjson.dumps(
+            {
+                "hourly": {
+                    "time": [f"2025-01-01T{hour:02d}:00" for hour in range(24)],
+                    "temperature_2m": [float(hour) for hour in range(24)],
+                }
+            }
+        )
+    )
+
+    response = client.get(
+        "/api/v1/weather/lima/hourly",
+        params={"variables": "temperature_2m", "resolution": "1d", "aggregates": "min,max"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    weather = response.json()["weather"]
+    assert weather["time"] == ["2025-01-01T00:00:00"]
+    assert weather["series"]["temperature_2m"] == {"min": [0.0], "max": [23.0]}
+
+    response = client.get("/api/v1/weather/lima/hourly", params={"variables": "snow"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    mock_http_get.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_history_page(client) -> None:
+    """
+    Test history page returns the cursor of the next page
+    """
+
+    with patch.object(
+        history_repo, "get_history", AsyncMock(return_value=make_history_rows(5, 4))
+    ) as mock_get_history:
+        response = client.get("/api/v1/history/session?after=6&limit=2")
+
+    assert response.status_code == status.HTTP_200_OK
+    mock_get_history.assert_awaited_once_with("session", 6, 2)
+
+    data = response.json()
+    assert [h["id"] for h in data["history"]] == [5, 4]
+    assert data["history"][0]["created_at"] == "2025-01-01T00:00:00+00:00"
+    assert data["next_after"] == 4
+
+
+@pytest.mark.asyncio
+async def test_history_last_page(client) -> None:
+    """
+    Test history page shorter than the limit has no next cursor
+    """
+
+    with patch.object(history_repo, "get_history", AsyncMock(return_value=make_history_rows(1))):
+        response = client.get("/api/v1/history/session?limit=2")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["next_after"] is None
+
+
+@pytest.mark.asyncio
+async def test_history_stream(client) -> None:
+    """
+    Test history stream sends one JSON line per record
+    """
+
+    async def stream_history(session_id, after, chunk_size):
+        yield make_history_rows(3, 2)
+        yield make_history_rows(1)
+
+    with patch.object(history_repo, "stream_history", stream_history):
+        response = client.get("/api/v1/history/session?stream=true")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [orjson.loads(line)["id"] for line in response.text.splitlines()] == [3, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_history_stream_error(client) -> None:
+    """
+    Test history stream ends with an error line when a chunk fails
+    """
+
+    with (
+        patch.object(config, "history_stream_chunk_size", 2),
+        patch.object(
+            history_repo, "get_history", AsyncMock(side_effect=[make_history_rows(2, 1), None])
+        ),
+    ):
+        response = client.get("/api/v1/history/session?stream=true")
+
+    lines = [orjson.loads(line) for line in response.text.splitlines()]
+    assert [line.get("id") for line in lines[:2]] == [2, 1]
+    assert lines[-1] == {"status": "error", "message": "error reading history"}
+
+
+@pytest.mark.asyncio
+async def test_history_stream_connection_error(client, caplog) -> None:
+    """
+    Test history stream logs a database error and ends with an error line
+    """
+
+    async def stream_history(session_id, after, chunk_size):
+        yield make_history_rows(2)
+        raise ConnectionError("connection lost")
+
+    with patch.object(history_repo, "stream_history", stream_history):
+        response = client.get("/api/v1/history/session?stream=true")
+
+    lines = [orjson.loads(line) for line in response.text.splitlines()]
+    assert lines[0]["id"] == 2
+    assert lines[-1] == {"status": "error", "message": "error reading history"}
+    assert "connection lost" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_cities_trending(client) -> None:
+    """
+    Test trending cities endpoint
+    """
+
+    location = LocationInfo(name="Moscow", country="Russia", latitude=55.75, longitude=37.62)
+
+    with patch.object(trending_cities, "top", AsyncMock(return_value=[(location, 3)])) as mock_top:
+        response = client.get("/api/v1/cities/trending?window=6h&limit=5")
+
+    assert response.status_code == status.HTTP_200_OK
+    mock_top.assert_awaited_once_with("6h", 5)
+    assert response.json()["cities"] == [{**location.model_dump(), "lookups": 3}]
+
+
+@pytest.mark.asyncio
+async def test_cities_trending_invalid_window(client) -> None:
+    """
+    Test trending cities endpoint rejects unknown windows
+    """
+
+    response = client.get("/api/v1/cities/trending?window=1y")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
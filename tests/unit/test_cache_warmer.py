@@ -0,0 +1,131 @@
+import asyncio
+import pytest
+
+from typing import NamedTuple
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.utils import warmer
+from app.core.utils.warmer import CacheWarmer
+
+
+class TopLocation(NamedTuple):
+    city: str
+    country: str
+    latitude: float
+    longitude: float
+    searches: int
+
+
+LOCATIONS = [
+    TopLocation("Moscow", "Russia", 55.75, 37.62, 10),
+    TopLocation("Lima", "Peru", -12.05, -77.04, 5),
+]
+
+
+@pytest.fixture
+def weather_utils() -> MagicMock:
+    """
+    Create weather utils mock
+    """
+
+    utils = MagicMock()
+    utils.refresh_location = AsyncMock()
+    utils.refresh_forecast = AsyncMock(return_value=True)
+    return utils
+
+
+@pytest.fixture(autouse=True)
+def prewarm_env():
+    """
+    Patch history, lock and geocoding lookups used by the warmer
+    """
+
+    with (
+        patch.object(warmer.redis_connector, "set", AsyncMock(return_value=True)),
+        patch.object(warmer.history_repo, "get_top_locations", AsyncMock(return_value=LOCATIONS)),
+        patch.object(warmer.gazetteer, "lookup", return_value=None),
+        patch.object(warmer.geocoding_cache, "ttl", AsyncMock(return_value=3600)),
+    ):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_warms_expiring_entries(weather_utils) -> None:
+    """
+    Test that expiring geocoding entries and stale forecasts are refreshed
+    """
+
+    await CacheWarmer(weather_utils).run()
+
+    assert {call.args[0] for call in weather_utils.refresh_location.await_args_list} == {
+        "Moscow",
+        "Lima",
+    }
+    assert weather_utils.refresh_forecast.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_skips_recently_refreshed_geocoding(weather_utils) -> None:
+    """
+    Test that geocoding entries far from expiry are not refreshed
+    """
+
+    with patch.object(warmer.geocoding_cache, "ttl", AsyncMock(return_value=2592000)):
+        await CacheWarmer(weather_utils).run()
+
+    weather_utils.refresh_location.assert_not_awaited()
+    assert weather_utils.refresh_forecast.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_skips_run_without_lock(weather_utils) -> None:
+    """
+    Test that only the worker holding the lock warms caches
+    """
+
+    with patch.object(warmer.redis_connector, "set", AsyncMock(return_value=None)):
+        await CacheWarmer(weather_utils).run()
+
+    weather_utils.refresh_forecast.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded(weather_utils) -> None:
+    """
+    Test that at most `prewarm_concurrency` locations are warmed at once
+    """
+
+    running = peak = 0
+
+    async def refresh_forecast(location) -> bool:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return True
+
+    weather_utils.refresh_forecast = AsyncMock(side_effect=refresh_forecast)
+    locations = [TopLocation(f"City {i}", "Country", i, i, 1) for i in range(10)]
+
+    with (
+        patch.object(warmer.config, "prewarm_concurrency", 3),
+        patch.object(warmer.history_repo, "get_top_locations", AsyncMock(return_value=locations)),
+    ):
+        await CacheWarmer(weather_utils).run()
+
+    assert weather_utils.refresh_forecast.await_count == 10
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_location_does_not_stop_run(weather_utils) -> None:
+    """
+    Test that an upstream error on one location does not stop the others
+    """
+
+    weather_utils.refresh_forecast = AsyncMock(side_effect=[RuntimeError("upstream"), True])
+
+    await CacheWarmer(weather_utils).run()
+
+    assert weather_utils.refresh_forecast.await_count == 2
@@ -0,0 +1,309 @@
+import time
+import orjson
+import pytest
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.caches import forecast, geocoding, trending
+from app.core.caches.lru import LRUCache, MISSING
+from app.core.models.weather import (
+    DailyForecast,
+    LocationInfo,
+    WeatherResponse,
+    WeatherListResponse,
+)
+from app.core.caches.geocoding import GeocodingCache, normalize_city
+from app.core.caches.forecast import ForecastCache, seconds_until_refresh, snap
+from app.core.caches.trending import TrendingCities
+
+
+@pytest.fixture
+def location() -> LocationInfo:
+    """
+    Create location for testing
+    """
+
+    return LocationInfo(name="Moscow", country="Russia", latitude=55.75, longitude=37.62)
+
+
+def test_normalize_city() -> None:
+    """
+    Test city name normalization
+    """
+
+    assert normalize_city("  New   York ") == "new york"
+    assert normalize_city("MOSCOW") == normalize_city("moscow")
+    assert normalize_city("Ｔｏｋｙｏ") == "tokyo"
+
+
+def test_lru_eviction() -> None:
+    """
+    Test least recently used entry is evicted first
+    """
+
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is MISSING
+    assert cache.get("c") == 3
+
+
+def test_lru_expiry() -> None:
+    """
+    Test expired entries are treated as misses
+    """
+
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1, ttl=0)
+
+    assert cache.get("a") is MISSING
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_geocoding_cache_local_hit(location: LocationInfo) -> None:
+    """
+    Test second lookup is served from the in-process tier
+    """
+
+    cache = GeocodingCache()
+    redis_mock = AsyncMock()
+
+    with patch.object(geocoding, "redis_connector", redis_mock):
+        await cache.set("Moscow", location)
+        found, cached = await cache.get("  moscow ")
+
+    assert found is True
+    assert cached.model_dump() == location.model_dump()
+    redis_mock.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_geocoding_cache_redis_hit(location: LocationInfo) -> None:
+    """
+    Test lookup falls back to Redis when the local tier misses
+    """
+
+    cache = GeocodingCache()
+    redis_mock = AsyncMock()
+    redis_mock.get.return_value = location.model_dump_json()
+
+    with patch.object(geocoding, "redis_connector", redis_mock):
+        found, cached = await cache.get("Moscow")
+
+    assert found is True
+    assert cached.model_dump() == location.model_dump()
+    redis_mock.get.assert_awaited_once_with("geocoding:moscow")
+
+
+@pytest.mark.asyncio
+async def test_geocoding_cache_negative_entry() -> None:
+    """
+    Test not found results are cached with the negative TTL
+    """
+
+    cache = GeocodingCache()
+    redis_mock = AsyncMock()
+
+    with patch.object(geocoding, "redis_connector", redis_mock):
+        await cache.set("non_existent_city", None)
+        found, cached = await cache.get("non_existent_city")
+
+    assert found is True
+    assert cached is None
+    redis_mock.set.assert_awaited_once_with(
+        "geocoding:non_existent_city",
+        geocoding.NOT_FOUND,
+        ex=geocoding.config.geocoding_negative_cache_ttl,
+    )
+
+
+@pytest.mark.asyncio
+async def test_geocoding_cache_redis_error() -> None:
+    """
+    Test Redis errors are treated as cache misses
+    """
+
+    cache = GeocodingCache()
+    redis_mock = AsyncMock()
+    redis_mock.get.side_effect = ConnectionError("redis is down")
+
+    with patch.object(geocoding, "redis_connector", redis_mock):
+        found, cached = await cache.get("Moscow")
+
+    assert found is False
+    assert cached is None
+
+
+def make_forecast() -> WeatherResponse:
+    """
+    Create forecast for testing
+    """
+
+    return WeatherResponse(
+        latitude=55.8,
+        longitude=37.6,
+        city="Moscow",
+        country="Russia",
+        daily=[
+            DailyForecast(
+                date="2024-04-01", temperature_max=10.0, temperature_min=2.0, weather_code=3
+            )
+        ],
+    )
+
+
+def test_snap() -> None:
+    """
+    Test coordinates are snapped to the grid
+    """
+
+    assert snap(55.7558, 0.1) == 55.8
+    assert snap(37.6173, 0.1) == 37.6
+    assert snap(-33.8688, 0.25) == -33.75
+    assert snap(55.7558, 0) == 55.7558
+
+
+def test_seconds_until_refresh() -> None:
+    """
+    Test TTL expires at the next model refresh
+    """
+
+    with patch.multiple(
+        forecast.config,
+        forecast_update_interval=3600,
+        forecast_update_offset=300,
+        forecast_min_ttl=60,
+    ):
+        assert seconds_until_refresh(now=0) == 300
+        assert seconds_until_refresh(now=300) == 3600
+        assert seconds_until_refresh(now=3000) == 900
+        assert seconds_until_refresh(now=3880) == 60
+
+
+@pytest.mark.asyncio
+async def test_forecast_cache_roundtrip() -> None:
+    """
+    Test forecast is cached per grid cell
+    """
+
+    cache = ForecastCache()
+    redis_mock = AsyncMock()
+    redis_mock.get.return_value = None
+    response = make_forecast()
+
+    with patch.object(forecast, "redis_connector", redis_mock):
+        latitude, longitude = cache.cell(55.7558, 37.6173)
+        assert await cache.get(latitude, longitude) == (None, None)
+
+        await cache.set(latitude, longitude, response)
+        cached, state = await cache.get(*cache.cell(55.76, 37.62))
+
+    assert state == forecast.FRESH
+    assert cached.model_dump() == response.model_dump()
+    redis_mock.set.assert_awaited_once()
+    assert redis_mock.set.await_args.args[0] == "forecast:55.8000:37.6000"
+
+
+@pytest.mark.asyncio
+async def test_forecast_cache_stale_window() -> None:
+    """
+    Test expired entries are served as stale within the grace window
+    """
+
+    entry = forecast.CachedForecast(expires_at=time.time() - 60, forecast=make_forecast())
+    redis_mock = AsyncMock()
+    redis_mock.get.return_value = entry.model_dump_json()
+
+    with patch.object(forecast, "redis_connector", redis_mock):
+        with patch.object(forecast.config, "forecast_stale_grace", 600):
+            cached, state = await ForecastCache().get(55.8, 37.6)
+        assert state == forecast.STALE
+        assert cached.city == "Moscow"
+
+        with patch.object(forecast.config, "forecast_stale_grace", 30):
+            assert await ForecastCache().get(55.8, 37.6) == (None, None)
+
+
+def test_forecast_encoding_is_reused() -> None:
+    """
+    Test pre-encoded forecast matches the model and survives localized copies
+    """
+
+    response = make_forecast()
+    daily = response.daily_json()
+
+    localized = response.model_copy(update={"city": "Moskva"})
+    assert localized.daily_json() is daily
+
+    encoded = orjson.loads(WeatherListResponse.encode("Weather for Moskva", localized))
+    expected = WeatherListResponse(message="Weather for Moskva", weather=localized)
+    assert encoded == expected.model_dump()
+
+
+def mock_pipeline(*results: list) -> MagicMock:
+    """
+    Create Redis pipeline mock returning results for each execute call
+    """
+
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(side_effect=results)
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    return pipe
+
+
+@pytest.mark.asyncio
+async def test_trending_record(location) -> None:
+    """
+    Test lookup is counted in the bucket of the current hour
+    """
+
+    pipe = mock_pipeline([1.0, True])
+
+    with patch.object(trending.trending_redis, "pipeline", return_value=pipe):
+        with patch.object(trending.time, "time", return_value=7200.5):
+            await TrendingCities().record(location)
+
+    pipe.zincrby.assert_called_once_with(
+        "trending:bucket:2", 1, orjson.dumps(location.model_dump()).decode()
+    )
+    pipe.expire.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_trending_top_merges_window(location) -> None:
+    """
+    Test window buckets are merged once and the ranking is kept in process
+    """
+
+    member = orjson.dumps(location.model_dump()).decode()
+    pipe = mock_pipeline([0, []], [2, True, [(member, 5.0)]])
+    cache = TrendingCities()
+
+    with patch.object(trending.trending_redis, "pipeline", return_value=pipe):
+        with patch.object(trending.time, "time", return_value=7200.5):
+            first = await cache.top("6h", 10)
+            second = await cache.top("6h", 10)
+
+    assert first == second == [(location, 5)]
+    pipe.zunionstore.assert_called_once_with(
+        "trending:window:6h", [f"trending:bucket:{hour}" for hour in (2, 1, 0, -1, -2, -3)]
+    )
+    assert pipe.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_trending_top_redis_error() -> None:
+    """
+    Test Redis errors return an empty ranking
+    """
+
+    with patch.object(
+        trending.trending_redis, "pipeline", side_effect=ConnectionError("redis is down")
+    ):
+        assert await TrendingCities().top("1h", 10) == []
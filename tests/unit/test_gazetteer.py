@@ -0,0 +1,103 @@
+import pytest
+
+from pathlib import Path
+from unittest.mock import patch
+
+from app.core.geo import cities
+from app.core.geo.cities import Gazetteer
+
+
+@pytest.fixture
+def gazetteer(tmp_path: Path) -> Gazetteer:
+    """
+    Create gazetteer loaded from a small GeoNames-style dump
+    """
+
+    rows = [
+        ["1", "London", "London", "", "51.50853", "-0.12574", "P", "", "GB"],
+        ["2", "London", "London", "", "42.98339", "-81.23304", "P", "", "CA"],
+        ["3", "São Paulo", "Sao Paulo", "", "-23.5475", "-46.63611", "P", "", "BR"],
+        ["4", "Smallville", "Smallville", "", "10.0", "10.0", "P", "", "US"],
+    ]
+    populations = ["8961989", "422324", "10021295", "100"]
+
+    cities_file = tmp_path / "cities.txt"
+    cities_file.write_text(
+        "".join(
+            "\t".join(city + ["", "", "", "", "", population, "", "", "UTC", ""]) + "\n"
+            for city, population in zip(rows, populations, strict=True)
+        ),
+        encoding="utf-8",
+    )
+
+    countries_file = tmp_path / "countryInfo.txt"
+    countries_file.write_text(
+        "#ISO\tISO3\tISO-Numeric\tfips\tCountry\n"
+        "GB\tGBR\t826\tUK\tUnited Kingdom\n"
+        "CA\tCAN\t124\tCA\tCanada\n"
+        "BR\tBRA\t076\tBR\tBrazil\n"
+        "US\tUSA\t840\tUS\tUnited States\n",
+        encoding="utf-8",
+    )
+
+    with patch.multiple(
+        cities.config,
+        gazetteer_cities_path=str(cities_file),
+        gazetteer_countries_path=str(countries_file),
+        gazetteer_min_population=1000,
+    ):
+        instance = Gazetteer()
+        instance.load()
+    return instance
+
+
+def test_lookup_prefers_most_populated(gazetteer: Gazetteer) -> None:
+    """
+    Test ambiguous names resolve to the most populated city
+    """
+
+    location = gazetteer.lookup("  london ")
+    assert location.country == "United Kingdom"
+    assert location.latitude == 51.50853
+
+
+def test_lookup_ascii_name(gazetteer: Gazetteer) -> None:
+    """
+    Test cities can be found by their ASCII name
+    """
+
+    assert gazetteer.lookup("sao paulo").name == "São Paulo"
+    assert gazetteer.lookup("SÃO PAULO").name == "São Paulo"
+
+
+def test_lookup_filters_population(gazetteer: Gazetteer) -> None:
+    """
+    Test cities below the minimum population are skipped
+    """
+
+    assert len(gazetteer) == 3
+    assert gazetteer.lookup("Smallville") is None
+    assert gazetteer.memory_usage() > 0
+
+
+def test_suggest_ranks_by_population(gazetteer: Gazetteer) -> None:
+    """
+    Test suggestions are ordered by population and deduplicated
+    """
+
+    names = [gazetteer.location(city_id).name for city_id in gazetteer.suggest("lon", 5)]
+    assert names == ["London", "London"]
+
+    countries = [gazetteer.location(city_id).country for city_id in gazetteer.suggest("L", 5)]
+    assert countries == ["United Kingdom", "Canada"]
+
+
+def test_suggest_matches_ascii_prefix(gazetteer: Gazetteer) -> None:
+    """
+    Test accented names are suggested for ASCII prefixes once
+    """
+
+    assert len(gazetteer.suggest("sao p", 5)) == 1
+    assert gazetteer.suggest("sa", 5) == gazetteer.suggest("sã", 5)
+    assert gazetteer.suggest("xyz", 5) == []
+    assert gazetteer.suggest("   ", 5) == []
@@ -0,0 +1,130 @@
+import pytest
+import asyncio
+
+from unittest.mock import AsyncMock, patch
+
+from app.core.connectors.db.sql import writer
+from app.core.connectors.db.sql.models import History
+from app.core.connectors.db.sql.writer import HistoryWriter
+
+
+def make_history(city: str) -> History:
+    return History(session_id="session", city=city, country="", latitude=0, longitude=0)
+
+
+def written_cities(repository: AsyncMock) -> list[list[str]]:
+    return [
+        [row["city"] for row in call.args[0]] for call in repository.add_history.await_args_list
+    ]
+
+
+@pytest.mark.asyncio
+async def test_writer_flushes_on_stop() -> None:
+    """
+    Test queued rows are written before the writer stops
+    """
+
+    repository = AsyncMock()
+    history_writer = HistoryWriter(repository)
+    history_writer.start()
+
+    assert history_writer.submit(make_history("Moscow"))
+    assert history_writer.submit(make_history("Lima"))
+    await history_writer.stop()
+
+    assert not history_writer.running
+    assert written_cities(repository) == [["Moscow", "Lima"]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "policy, written",
+    [(writer.DROP_OLDEST, ["Lima", "Paris"]), (writer.DROP_NEWEST, ["Moscow", "Lima"])],
+)
+async def test_writer_overflow_policy(policy: str, written: list[str]) -> None:
+    """
+    Test full queue drops rows according to the overflow policy
+    """
+
+    repository = AsyncMock()
+    history_writer = HistoryWriter(repository)
+
+    with patch.object(writer.config, "history_queue_size", 2):
+        with patch.object(writer.config, "history_queue_overflow", policy):
+            history_writer.start()
+            history_writer.submit(make_history("Moscow"))
+            history_writer.submit(make_history("Lima"))
+            queued = history_writer.submit(make_history("Paris"))
+
+    await history_writer.stop()
+
+    assert queued == (policy == writer.DROP_OLDEST)
+    assert written_cities(repository) == [written]
+
+
+@pytest.mark.asyncio
+async def test_writer_rejects_when_stopped() -> None:
+    """
+    Test rows are dropped when the writer is not running
+    """
+
+    repository = AsyncMock()
+    history_writer = HistoryWriter(repository)
+
+    assert not history_writer.submit(make_history("Moscow"))
+    repository.add_history.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_writer_batches_by_size() -> None:
+    """
+    Test rows are split into batches of at most the batch size
+    """
+
+    repository = AsyncMock()
+    history_writer = HistoryWriter(repository)
+
+    with patch.object(writer.config, "history_batch_size", 2):
+        history_writer.start()
+        for city in ["Moscow", "Lima", "Paris"]:
+            history_writer.submit(make_history(city))
+        await history_writer.stop()
+
+    assert written_cities(repository) == [["Moscow", "Lima"], ["Paris"]]
+    assert "id" not in repository.add_history.await_args.args[0][0]
+
+
+@pytest.mark.asyncio
+async def test_writer_flushes_by_interval() -> None:
+    """
+    Test a partial batch is written once the batch interval passes
+    """
+
+    repository = AsyncMock()
+    history_writer = HistoryWriter(repository)
+
+    with patch.object(writer.config, "history_batch_interval", 10):
+        history_writer.start()
+        history_writer.submit(make_history("Moscow"))
+        await asyncio.sleep(0.05)
+
+        assert written_cities(repository) == [["Moscow"]]
+        await history_writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_writer_keeps_session_id_on_rows() -> None:
+    """
+    Test rows are written with their session id and no session rows
+    """
+
+    repository = AsyncMock()
+    history_writer = HistoryWriter(repository)
+    history_writer.start()
+
+    history_writer.submit(make_history("Moscow"))
+    history_writer.submit(make_history("Lima"))
+    await history_writer.stop()
+
+    (rows,) = repository.add_history.await_args.args
+    assert [row["session_id"] for row in rows] == ["session", "session"]
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from app.core.models.hourly import HourlySeries
+
+
+@pytest.fixture
+def series() -> HourlySeries:
+    """
+    Create two days of hourly values 0..47 with one missing hour
+    """
+
+    temperature = [float(hour) for hour in range(48)]
+    temperature[5] = None
+    return HourlySeries.from_upstream(
+        {
+            "time": [f"2025-01-{1 + hour // 24:02d}T{hour % 24:02d}:00" for hour in range(48)],
+            "temperature_2m": temperature,
+            "precipitation": [0.0] * 47 + [1.2],
+        }
+    )
+
+
+def test_hourly_raw_values(series: HourlySeries) -> None:
+    """
+    Test hourly resolution returns raw values for the requested days
+    """
+
+    result = series.aggregate(["temperature_2m"], "1h", ["mean"], days=1)
+
+    assert len(result["time"]) == 24
+    assert list(result["series"]["temperature_2m"]) == ["value"]
+    assert np.isnan(result["series"]["temperature_2m"]["value"][5])
+
+
+def test_hourly_downsampling(series: HourlySeries) -> None:
+    """
+    Test 3-hour and daily aggregates skip missing values
+    """
+
+    result = series.aggregate(["temperature_2m"], "3h", ["mean", "max"], days=2)
+    temperature = result["series"]["temperature_2m"]
+
+    assert len(result["time"]) == 16
+    assert str(result["time"][1]) == "2025-01-01T03:00"
+    assert temperature["mean"][0] == 1.0
+    assert temperature["mean"][1] == 3.5
+    assert temperature["max"][-1] == 47.0
+
+    result = series.aggregate(["temperature_2m", "precipitation"], "1d", ["p50", "max"], days=16)
+    assert len(result["time"]) == 2
+    assert result["series"]["temperature_2m"]["p50"][1] == 35.5
+    assert list(result["series"]["precipitation"]["max"]) == [0.0, 1.2]
+
+
+def test_hourly_daily_follows_local_dates() -> None:
+    """
+    Test daily blocks keep to calendar dates across a 23-hour DST day
+    """
+
+    time = [f"2025-03-30T{hour:02d}:00" for hour in range(24) if hour != 2]
+    time += [f"2025-03-31T{hour:02d}:00" for hour in range(24)]
+    series = HourlySeries.from_upstream({"time": time, "temperature_2m": [1.0] * 23 + [2.0] * 24})
+
+    result = series.aggregate(["temperature_2m"], "1d", ["min", "max", "p50"], days=2)
+    temperature = result["series"]["temperature_2m"]
+
+    assert [str(day) for day in result["time"]] == ["2025-03-30T00:00", "2025-03-31T00:00"]
+    assert list(temperature["min"]) == [1.0, 2.0]
+    assert list(temperature["max"]) == [1.0, 2.0]
+    assert list(temperature["p50"]) == [1.0, 2.0]
+
+
+@pytest.mark.parametrize("resolution", ["1h", "3h", "1d"])
+def test_hourly_empty_series(resolution: str) -> None:
+    """
+    Test series without hours aggregates to empty arrays
+    """
+
+    series = HourlySeries.from_upstream({"time": [], "temperature_2m": []})
+
+    result = series.aggregate(["temperature_2m"], resolution, ["mean", "p10", "p90"], days=1)
+
+    assert len(result["time"]) == 0
+    assert all(len(values) == 0 for values in result["series"]["temperature_2m"].values())
+
+
+def test_hourly_json_roundtrip(series: HourlySeries) -> None:
+    """
+    Test series survives the cache encoding
+    """
+
+    restored = HourlySeries.from_json(series.to_json())
+
+    assert (restored.time == series.time).all()
+    np.testing.assert_array_equal(
+        restored.values["temperature_2m"], series.values["temperature_2m"]
+    )
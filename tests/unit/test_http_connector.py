@@ -0,0 +1,294 @@
+import httpx
+import pytest
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch, AsyncMock, MagicMock, PropertyMock
+
+from app.core.handlers import ErrorHandlers
+from app.core.connectors.http import limiter
+from app.core.connectors.http.client import HTTPConnector
+from app.core.connectors.http import (
+    CircuitBreaker,
+    RateLimiter,
+    RetryBudget,
+    UpstreamUnavailableError,
+    UpstreamRateLimitedError,
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+)
+
+
+@pytest.fixture(autouse=True)
+def limiter_redis():
+    """
+    Replace Redis used by the rate limiter, every call gets a token right away
+    """
+
+    redis_mock = AsyncMock()
+    redis_mock.eval.return_value = 0
+    with patch.object(limiter, "rate_limit_redis", redis_mock):
+        yield redis_mock
+
+
+@pytest.mark.asyncio
+async def test_client_is_reused() -> None:
+    """
+    Test that the same pooled client is returned between calls
+    """
+
+    connector = HTTPConnector()
+    connector.connect()
+
+    first = connector.client
+    second = connector.client
+    assert first is second
+
+    await connector.close()
+
+
+@pytest.mark.asyncio
+async def test_client_reconnects_after_close() -> None:
+    """
+    Test that a closed client is recreated on access
+    """
+
+    connector = HTTPConnector()
+    first = connector.client
+    await connector.close()
+
+    second = connector.client
+    assert second is not first
+    assert not second.is_closed
+
+    await connector.close()
+
+
+def make_breaker(**kwargs) -> CircuitBreaker:
+    options = {
+        "failure_threshold": 2,
+        "slow_call_threshold": 1.0,
+        "recovery_timeout": 30.0,
+        "half_open_max_calls": 1,
+    }
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+def test_breaker_opens_after_failures() -> None:
+    """
+    Test that consecutive failures open the circuit and it fails fast
+    """
+
+    breaker = make_breaker()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.retry_after > 0
+
+
+def test_breaker_counts_slow_calls() -> None:
+    """
+    Test that calls over the latency threshold count as failures
+    """
+
+    breaker = make_breaker()
+    breaker.record_success(0.1)
+    breaker.record_success(1.5)
+    breaker.record_success(2.0)
+    assert breaker.state == OPEN
+
+
+def test_breaker_half_open_probe() -> None:
+    """
+    Test that an expired open circuit lets one probe through
+    """
+
+    breaker = make_breaker(recovery_timeout=0.0)
+    breaker.record_failure()
+    breaker.record_failure()
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+
+
+def test_breaker_half_open_failure_reopens() -> None:
+    """
+    Test that a failed probe opens the circuit again
+    """
+
+    breaker = make_breaker(recovery_timeout=0.0, failure_threshold=5)
+    for _ in range(5):
+        breaker.record_failure()
+
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state != CLOSED
+
+
+def test_retry_budget() -> None:
+    """
+    Test that retries are capped by the budget and refilled by requests
+    """
+
+    budget = RetryBudget(ratio=0.5, max_tokens=1)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def make_response(status_code: int) -> httpx.Response:
+    return httpx.Response(status_code, request=httpx.Request("GET", "https://upstream"))
+
+
+@pytest.mark.asyncio
+@patch("app.core.connectors.http.client.asyncio.sleep", new_callable=AsyncMock)
+async def test_get_retries_server_errors(mock_sleep) -> None:
+    """
+    Test that 5xx responses are retried and a later success is returned
+    """
+
+    connector = HTTPConnector()
+    client = MagicMock(get=AsyncMock(side_effect=[make_response(503), make_response(200)]))
+
+    with patch.object(HTTPConnector, "client", new_callable=PropertyMock, return_value=client):
+        response = await connector.get("https://upstream", endpoint="retry")
+
+    assert response.status_code == 200
+    assert client.get.await_count == 2
+    mock_sleep.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_does_not_retry_client_errors() -> None:
+    """
+    Test that 4xx responses are raised without retries
+    """
+
+    connector = HTTPConnector()
+    client = MagicMock(get=AsyncMock(return_value=make_response(400)))
+
+    with patch.object(HTTPConnector, "client", new_callable=PropertyMock, return_value=client):
+        with pytest.raises(httpx.HTTPStatusError):
+            await connector.get("https://upstream", endpoint="client_error")
+
+    client.get.assert_awaited_once()
+    assert connector.breaker("client_error").state == CLOSED
+
+
+@pytest.mark.asyncio
+@patch("app.core.connectors.http.client.asyncio.sleep", new_callable=AsyncMock)
+async def test_get_fails_fast_when_open(mock_sleep) -> None:
+    """
+    Test that exhausted retries open the circuit and later calls fail fast
+    """
+
+    connector = HTTPConnector()
+    client = MagicMock(get=AsyncMock(side_effect=httpx.ConnectError("down")))
+
+    with patch.object(HTTPConnector, "client", new_callable=PropertyMock, return_value=client):
+        for _ in range(3):
+            with pytest.raises(UpstreamUnavailableError):
+                await connector.get("https://upstream", endpoint="down")
+
+        calls = client.get.await_count
+        with pytest.raises(UpstreamUnavailableError) as exc:
+            await connector.get("https://upstream", endpoint="down")
+
+    assert connector.breaker("down").state == OPEN
+    assert client.get.await_count == calls
+    assert exc.value.retry_after > 0
+
+
+@pytest.mark.asyncio
+async def test_upstream_unavailable_handler() -> None:
+    """
+    Test that an open circuit is reported as 503 with Retry-After
+    """
+
+    app = FastAPI()
+    ErrorHandlers(app)
+
+    @app.get("/upstream")
+    async def _():
+        raise UpstreamUnavailableError("forecast", retry_after=12.3)
+
+    response = TestClient(app).get("/upstream")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "13"
+    assert response.json()["type"] == "service unavailable"
+
+
+@pytest.mark.asyncio
+@patch("app.core.connectors.http.limiter.asyncio.sleep", new_callable=AsyncMock)
+async def test_rate_limiter_waits_for_reserved_slot(mock_sleep, limiter_redis) -> None:
+    """
+    Test that a call waits for the slot reserved in the shared bucket
+    """
+
+    limiter_redis.eval.return_value = 250
+
+    await RateLimiter("test").acquire()
+
+    mock_sleep.assert_awaited_once_with(0.25)
+    assert limiter_redis.eval.await_args.args[2] == "ratelimit:test"
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_rejects_past_deadline(limiter_redis) -> None:
+    """
+    Test that a wait over the deadline is rejected with retry-after
+    """
+
+    limiter_redis.eval.return_value = -3500
+
+    with pytest.raises(UpstreamRateLimitedError) as exc:
+        await RateLimiter("test").acquire()
+
+    assert exc.value.status_code == 429
+    assert exc.value.retry_after == 3.5
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_bounds_queue(limiter_redis) -> None:
+    """
+    Test that calls are rejected while the local queue is full
+    """
+
+    limiter_redis.eval.return_value = 1000
+    rate_limiter = RateLimiter("test")
+
+    with patch.object(limiter.config, "rate_limit_max_queue", 1):
+        waiting = asyncio.ensure_future(rate_limiter.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(UpstreamUnavailableError) as exc:
+            await rate_limiter.acquire()
+
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+
+    assert exc.value.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_fails_open(limiter_redis) -> None:
+    """
+    Test that Redis errors let the call through
+    """
+
+    limiter_redis.eval.side_effect = ConnectionError("redis is down")
+
+    await RateLimiter("test").acquire()
@@ -0,0 +1,92 @@
+import queue
+import logging
+import pytest
+
+from datetime import datetime
+from unittest.mock import patch
+
+from app.core.connectors.logging import handlers
+from app.core.connectors.logging.handlers import DailyFileHandler, LogListener, LogQueueHandler
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def make_record(message: dict | str, name: str = "root") -> logging.LogRecord:
+    return logging.LogRecord(name, logging.INFO, __file__, 1, message, None, None)
+
+
+def test_record_keeps_dict_message() -> None:
+    """
+    Test queued records keep a snapshot of the dict message for the writer
+    """
+
+    log_queue = queue.Queue(maxsize=10)
+    message = {"type": "request", "details": {"status": 200}}
+    LogQueueHandler(log_queue).handle(make_record(message))
+    message["details"]["status"] = 500
+
+    assert log_queue.get_nowait().msg == {"type": "request", "details": {"status": 200}}
+
+
+def test_daily_file_handler_switches_files(tmp_path) -> None:
+    """
+    Test records are written to the file of their day
+    """
+
+    handler = DailyFileHandler(str(tmp_path), "log")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    for day, message in ((1, "first"), (2, "second"), (2, "third")):
+        record = make_record(message)
+        record.created = datetime(2025, 1, day, 12).timestamp()
+        handler.handle(record)
+    handler.close()
+
+    assert (tmp_path / "log_2025-01-01.log").read_text() == "first\n"
+    assert (tmp_path / "log_2025-01-02.log").read_text() == "second\nthird\n"
+
+
+@pytest.mark.parametrize(
+    "policy, kept",
+    [(handlers.DROP_NEWEST, [1, 2]), (handlers.DROP_OLDEST, [2, 3])],
+)
+def test_overflow_policy(policy, kept) -> None:
+    """
+    Test full queue drops records according to the overflow policy
+    """
+
+    log_queue = queue.Queue(maxsize=2)
+    handler = LogQueueHandler(log_queue, policy)
+
+    with patch.object(handlers.app_metrics, "record_log_dropped") as mock_dropped:
+        for i in (1, 2, 3):
+            handler.handle(make_record({"i": i}))
+
+    assert [log_queue.get_nowait().msg["i"] for _ in range(2)] == kept
+    mock_dropped.assert_called_once()
+
+
+def test_listener_routes_and_flushes_on_stop() -> None:
+    """
+    Test writer routes records by logger and writes every queued record on stop
+    """
+
+    log_queue = queue.Queue(maxsize=100)
+    main, tracebacks = RecordingHandler(), RecordingHandler()
+    listener = LogListener(log_queue, [main], routes={"traceback": [tracebacks]})
+    handler = LogQueueHandler(log_queue)
+
+    listener.start()
+    for i in range(50):
+        handler.handle(make_record({"i": i}))
+    handler.handle(make_record({"error": "boom"}, name="traceback"))
+    listener.stop()
+
+    assert [record.msg["i"] for record in main.records] == list(range(50))
+    assert [record.msg for record in tracebacks.records] == [{"error": "boom"}]
@@ -0,0 +1,247 @@
+import pytest
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from fastapi.responses import StreamingResponse
+from unittest.mock import AsyncMock, patch
+from datetime import UTC, datetime, timedelta
+
+from app.core.middlewares import (
+    LoggingMiddleware,
+    RequestParamsMiddleware,
+    SessionMiddleware,
+)
+from app.core.utils import session_utils
+from app.core.connectors.config import config
+from app.core.middlewares import session
+
+
+def read_state(request: Request) -> dict:
+    state = request.scope["state"]
+    session = state.get("session")
+    return {
+        "request_id": state["request_id"],
+        "client_ip": state["client_ip"],
+        "session_id": session.session_id if session else None,
+    }
+
+
+@pytest.fixture
+def client() -> TestClient:
+    """
+    Create test client with the application middleware stack
+    """
+
+    app = FastAPI()
+
+    @app.get("/state")
+    async def state(request: Request):
+        return read_state(request)
+
+    @app.get("/health")
+    async def health(request: Request):
+        return read_state(request)
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(iter([b"a\n", b"b\n"]), media_type="application/x-ndjson")
+
+    app.add_middleware(SessionMiddleware, paths=["/state", "/stream"])
+    app.add_middleware(LoggingMiddleware)
+    app.add_middleware(RequestParamsMiddleware)
+
+    return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def session_store():
+    """
+    Patch Redis session store, every session is stored
+    """
+
+    with (
+        patch.object(session.session_store, "create", AsyncMock(return_value=True)),
+        patch.object(session.session_store, "validate", AsyncMock(return_value=True)),
+    ):
+        yield session.session_store
+
+
+def test_request_params_in_state(client) -> None:
+    """
+    Test request ID and client IP are set in state and the ID is returned
+    """
+
+    response = client.get("/state", headers={"X-Original-Forwarded-For": "10.0.0.1"})
+
+    state = response.json()
+    assert state["request_id"] == response.headers["X-Request-ID"]
+    assert state["client_ip"] == "10.0.0.1"
+
+
+def test_new_session_sets_cookie(client, session_store) -> None:
+    """
+    Test a new session is stored when its cookie is issued
+    """
+
+    response = client.get("/state")
+
+    session_id = response.json()["session_id"]
+    assert session_store.create.await_args.args[0] == session_id
+    assert session_id in response.headers["set-cookie"]
+    session_store.validate.assert_not_awaited()
+
+
+def test_valid_session_is_reused(client, session_store) -> None:
+    """
+    Test a valid session cookie is reused without setting a new cookie
+    """
+
+    expires_at = datetime.now(UTC) + timedelta(days=1)
+    client.cookies.set("Session", session_utils.sign("abc", expires_at))
+
+    response = client.get("/state")
+
+    assert response.json()["session_id"] == "abc"
+    assert "set-cookie" not in response.headers
+    session_store.validate.assert_awaited_once_with("abc", None)
+    session_store.create.assert_not_awaited()
+
+
+def test_revoked_session_is_replaced(client, session_store) -> None:
+    """
+    Test a signed session missing from the store is replaced, not restored
+    """
+
+    session_store.validate.return_value = False
+    client.cookies.set("Session", session_utils.sign("abc", datetime.now(UTC) + timedelta(days=1)))
+
+    response = client.get("/state")
+
+    session_id = response.json()["session_id"]
+    assert session_id != "abc"
+    session_store.create.assert_awaited_once()
+    assert session_store.create.await_args.args[0] == session_id
+    assert session_id in response.headers["set-cookie"]
+
+
+def test_sliding_session_is_renewed(client, session_store) -> None:
+    """
+    Test sliding sessions extend the store TTL and renew cookies past half their lifetime
+    """
+
+    client.cookies.set("Session", session_utils.sign("abc", datetime.now(UTC) + timedelta(days=1)))
+
+    with patch.object(config, "session_sliding", True):
+        response = client.get("/state")
+
+    assert response.json()["session_id"] == "abc"
+    assert session_utils.verify(response.cookies["Session"]).expires_at > datetime.now(
+        UTC
+    ) + timedelta(days=6)
+    session_store.validate.assert_awaited_once_with("abc", 7 * 24 * 3600)
+
+
+def test_session_skipped_outside_session_paths(client) -> None:
+    """
+    Test requests outside the session paths get no session
+    """
+
+    response = client.get("/health")
+
+    assert response.json()["session_id"] is None
+    assert "set-cookie" not in response.headers
+
+
+@pytest.mark.parametrize(
+    "method, path, has_session",
+    [
+        ("GET", "/api/v1/weather/Moscow", True),
+        ("GET", "/api/v1/weather/coords", False),
+        ("POST", "/api/v1/weather/batch", False),
+        ("GET", "/api/v1/weather/Moscow/hourly", False),
+    ],
+)
+def test_session_paths_match_routes_exactly(method, path, has_session) -> None:
+    """
+    Test only the configured route template under the API prefix gets a session
+    """
+
+    app = FastAPI()
+
+    def has_state_session(request: Request) -> dict:
+        return {"session": request.scope.get("state", {}).get("session") is not None}
+
+    @app.get("/api/v1/weather/coords")
+    async def coords(request: Request):
+        return has_state_session(request)
+
+    @app.get("/api/v1/weather/{city}")
+    async def weather(city: str, request: Request):
+        return has_state_session(request)
+
+    @app.post("/api/v1/weather/batch")
+    async def batch(request: Request):
+        return has_state_session(request)
+
+    @app.get("/api/v1/weather/{city}/hourly")
+    async def hourly(city: str, request: Request):
+        return has_state_session(request)
+
+    app.add_middleware(SessionMiddleware)
+
+    with patch.object(config, "session_paths", ["/weather/{city}"]):
+        response = TestClient(app).request(method, path)
+
+    assert response.json() == {"session": has_session}
+
+
+def test_streaming_response_passes_through(client) -> None:
+    """
+    Test streaming responses keep their body and get the request ID header
+    """
+
+    response = client.get("/stream")
+
+    assert response.text == "a\nb\n"
+    assert "X-Request-ID" in response.headers
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not-a-token",
+        '{"session_id": "abc", "expiry": "2999-01-01T00:00:00+00:00"}',
+        session_utils.sign("abc", datetime.now(UTC) - timedelta(seconds=1)),
+        session_utils.sign("abc", datetime.now(UTC) + timedelta(days=1))[:-2] + "xx",
+    ],
+    ids=["malformed", "unsigned", "expired", "tampered"],
+)
+def test_invalid_session_is_replaced(client, token) -> None:
+    """
+    Test invalid session tokens start a new session
+    """
+
+    client.cookies.set("Session", token)
+
+    response = client.get("/state")
+
+    session_id = response.json()["session_id"]
+    assert session_id != "abc"
+    assert session_id in response.headers["set-cookie"]
+
+
+def test_rotated_key_session_is_resigned(client) -> None:
+    """
+    Test sessions signed with a previous key are kept and signed with the current key
+    """
+
+    expires_at = datetime.now(UTC) + timedelta(days=1)
+    client.cookies.set("Session", session_utils.sign("abc", expires_at))
+
+    with patch.object(type(config), "session_keys", ("new", {"new": "new-key", "test": "test"})):
+        response = client.get("/state")
+        token = response.cookies["Session"]
+
+        assert response.json()["session_id"] == "abc"
+        assert token.startswith("v1.new.abc.")
+        assert session_utils.verify(token).expires_at == expires_at.replace(microsecond=0)
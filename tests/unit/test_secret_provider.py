@@ -0,0 +1,136 @@
+import asyncio
+import pytest
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.connectors.config import config
+from app.core.connectors.secrets import provider, secret_provider
+from app.core.connectors.secrets.provider import SecretProvider
+
+
+def make_reader(*versions: dict[str, str]) -> MagicMock:
+    """
+    Create Vault reader returning the given versions of a secret in order
+    """
+
+    return MagicMock(
+        side_effect=[(data, version, 0) for version, data in enumerate(versions, start=1)]
+    )
+
+
+@pytest.mark.asyncio
+async def test_secret_is_cached() -> None:
+    """
+    Test that a path is read once and then served from memory
+    """
+
+    reader = make_reader({"token": "a"})
+    secrets = SecretProvider(reader)
+
+    await secrets.load("auth")
+
+    assert secrets.get_cached("auth", "token") == "a"
+    assert secrets.get_cached_data("auth") == {"token": "a"}
+    reader.assert_called_once_with("auth")
+
+
+def test_unloaded_secret_is_not_read() -> None:
+    """
+    Test that a path that was never loaded raises instead of reading Vault
+    """
+
+    reader = make_reader({"token": "a"})
+    secrets = SecretProvider(reader)
+
+    with pytest.raises(RuntimeError, match="vault secret 'auth' is not loaded"):
+        secrets.get_cached("auth", "token")
+    reader.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_are_coalesced() -> None:
+    """
+    Test that concurrent loads of a path share one Vault read
+    """
+
+    reader = make_reader({"token": "a"})
+    secrets = SecretProvider(reader)
+
+    loaded = await asyncio.gather(*(secrets.load("auth") for _ in range(5)))
+
+    assert [secret.data["token"] for secret in loaded] == ["a"] * 5
+    reader.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_rotation_runs_callbacks() -> None:
+    """
+    Test that changed data runs rotation callbacks and unchanged data does not
+    """
+
+    reader = make_reader({"password": "a"}, {"password": "a"}, {"password": "b"})
+    callback = AsyncMock()
+    secrets = SecretProvider(reader)
+    secrets.on_rotate("db", callback)
+
+    await secrets.load("db")
+    await secrets.load("db")
+    callback.assert_not_awaited()
+
+    await secrets.load("db")
+    callback.assert_awaited_once()
+    assert secrets.get_cached("db", "password") == "b"
+
+
+@pytest.mark.asyncio
+async def test_expired_secret_served_when_vault_fails() -> None:
+    """
+    Test that the last known value is kept when a reload fails
+    """
+
+    reader = MagicMock(side_effect=[({"token": "a"}, 1, 0), ConnectionError("vault is down")])
+    secrets = SecretProvider(reader)
+
+    with patch.object(provider.config, "secrets_ttl", 0):
+        await secrets.load("auth")
+        with pytest.raises(ConnectionError):
+            await secrets.load("auth")
+
+    assert secrets.get_cached("auth", "token") == "a"
+    assert reader.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_background_refresh() -> None:
+    """
+    Test that due paths are reloaded in the background
+    """
+
+    reader = MagicMock(return_value=({"token": "a"}, 1, 0))
+    secrets = SecretProvider(reader)
+
+    with patch.object(provider.config, "secrets_ttl", 0.05):
+        await secrets.load("auth")
+        reader.return_value = ({"token": "b"}, 2, 0)
+        secrets.start()
+        await asyncio.sleep(0.1)
+        await secrets.stop()
+
+    assert secrets.get_cached("auth", "token") == "b"
+
+
+@pytest.mark.parametrize(
+    "data",
+    [{"2025-01": "a"}, {"current": "2025-06", "2025-01": "a"}],
+    ids=["no-current", "unknown-current"],
+)
+def test_session_keys_require_current_key(monkeypatch, data) -> None:
+    """
+    Test that a session secret without a usable current key names the secret
+    """
+
+    monkeypatch.delenv("USE_TEST_CONFIG")
+
+    with patch.object(secret_provider, "get_cached_data", return_value=data):
+        with pytest.raises(ValueError, match="vault secret 'session'"):
+            _ = config.session_keys
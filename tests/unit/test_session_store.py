@@ -0,0 +1,67 @@
+import pytest
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.connectors.db.redis.session import SessionStore
+
+
+def mock_redis(*results: list) -> MagicMock:
+    """
+    Create Redis client mock whose pipeline returns results for each execute call
+    """
+
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(side_effect=results)
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+
+    client = MagicMock()
+    client.pipeline.return_value = pipe
+    client.exists = AsyncMock(return_value=1)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_create_expires_with_session() -> None:
+    """
+    Test session hash is written with the session expiry in one pipeline
+    """
+
+    client = mock_redis([1, True])
+    expires_at = datetime.now(UTC) + timedelta(days=7)
+
+    assert await SessionStore(client).create("abc", "10.0.0.1", expires_at)
+
+    pipe = client.pipeline.return_value
+    assert pipe.hset.call_args.args[0] == "session:abc"
+    assert pipe.hset.call_args.kwargs["mapping"]["user_ip"] == "10.0.0.1"
+    pipe.expireat.assert_called_once_with("session:abc", expires_at)
+
+
+@pytest.mark.asyncio
+async def test_validate_sliding_extends_ttl() -> None:
+    """
+    Test sliding validation checks and extends the session in one round trip
+    """
+
+    client = mock_redis([1, True], [0, False])
+    store = SessionStore(client)
+
+    assert await store.validate("abc", 3600)
+    assert not await store.validate("missing", 3600)
+
+    client.pipeline.return_value.expire.assert_any_call("session:abc", 3600)
+    assert client.pipeline.return_value.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_validate_fails_closed() -> None:
+    """
+    Test Redis errors reject sessions that cannot be checked
+    """
+
+    client = mock_redis()
+    client.exists = AsyncMock(side_effect=ConnectionError("redis is down"))
+
+    assert not await SessionStore(client).validate("abc")
@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+
+from unittest.mock import AsyncMock, patch
+
+from app.core.caches import singleflight
+from app.core.caches.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_coalesced() -> None:
+    """
+    Test concurrent callers with the same key share one call
+    """
+
+    flight = SingleFlight()
+    calls = 0
+
+    async def load() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flight.do("key", load) for _ in range(10)))
+
+    assert results == ["result"] * 10
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_not_cached() -> None:
+    """
+    Test errors reach every waiting caller and the next call runs again
+    """
+
+    flight = SingleFlight()
+    calls = 0
+
+    async def load() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream error")
+
+    results = await asyncio.gather(
+        *(flight.do("key", load) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+
+    with pytest.raises(ValueError):
+        await flight.do("key", load)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others() -> None:
+    """
+    Test cancelling one caller keeps the shared call running
+    """
+
+    flight = SingleFlight()
+
+    async def load() -> str:
+        await asyncio.sleep(0.02)
+        return "result"
+
+    first = asyncio.create_task(flight.do("key", load))
+    second = asyncio.create_task(flight.do("key", load))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    assert await second == "result"
+
+
+@pytest.mark.asyncio
+async def test_waits_for_lock_held_by_another_worker() -> None:
+    """
+    Test caller waits for the Redis lock before running the call
+    """
+
+    redis_mock = AsyncMock()
+    redis_mock.set.return_value = None
+    redis_mock.exists.side_effect = [1, 1, 0]
+
+    with (
+        patch.object(singleflight.config, "singleflight_redis_lock", True),
+        patch.object(singleflight.config, "singleflight_lock_poll", 1),
+        patch.object(singleflight, "redis_connector", redis_mock),
+    ):
+        flight = SingleFlight()
+        load = AsyncMock(return_value="result")
+
+        assert await flight.do("key", load) == "result"
+
+    assert redis_mock.exists.await_count == 3
+    load.assert_awaited_once()
+    redis_mock.eval.assert_not_called()
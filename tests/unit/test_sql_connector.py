@@ -0,0 +1,115 @@
+import pytest
+
+from datetime import UTC, datetime
+from prometheus_client import REGISTRY
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
+
+from app.core.connectors.db.sql.connector import SQLConnector
+from app.core.connectors.db.sql import history_repo, session_repo, sql_connector
+
+
+@pytest.mark.asyncio
+async def test_engine_is_shared() -> None:
+    """
+    Test that the engine and sessionmaker are created once and reused
+    """
+
+    connector = SQLConnector()
+    connector.connect()
+
+    engine = connector.engine
+    session = connector.session
+    connector.connect()
+
+    assert connector.engine is engine
+    assert connector.session is session
+
+    await connector.dispose()
+
+
+@pytest.mark.asyncio
+async def test_engine_recreated_after_dispose() -> None:
+    """
+    Test that a disposed engine is recreated on access
+    """
+
+    connector = SQLConnector()
+    engine = connector.engine
+    await connector.dispose()
+
+    assert connector.engine is not engine
+
+    await connector.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics() -> None:
+    """
+    Test that pool usage is reported for the current engine
+    """
+
+    connector = SQLConnector()
+    connector.connect()
+
+    assert REGISTRY.get_sample_value("sql_pool_size") == connector.engine.pool.size()
+    assert REGISTRY.get_sample_value("sql_pool_checked_out") == 0
+
+    await connector.dispose()
+
+
+def test_repositories_share_connector() -> None:
+    """
+    Test that repositories use the process-wide connector
+    """
+
+    assert history_repo._connector is sql_connector
+    assert session_repo._connector is sql_connector
+
+
+@pytest.mark.asyncio
+async def test_stream_history_follows_keyset() -> None:
+    """
+    Test that history is streamed in chunks, each starting after the last id
+    """
+
+    chunks = [[MagicMock(id=5), MagicMock(id=4)], [MagicMock(id=3), MagicMock(id=2)], []]
+
+    with patch.object(history_repo, "get_history", AsyncMock(side_effect=chunks)) as mock_get:
+        streamed = [rows async for rows in history_repo.stream_history("session", None, 2)]
+
+    assert streamed == chunks[:2]
+    assert [call.args for call in mock_get.await_args_list] == [
+        ("session", None, 2),
+        ("session", 4, 2),
+        ("session", 2, 2),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_history_raises_on_error() -> None:
+    """
+    Test that a failed chunk read is not mistaken for the end of history
+    """
+
+    with patch.object(history_repo, "get_history", AsyncMock(return_value=None)):
+        with pytest.raises(RuntimeError):
+            _ = [rows async for rows in history_repo.stream_history("session", None, 2)]
+
+
+@pytest.mark.asyncio
+async def test_top_locations_grouped_by_coordinates() -> None:
+    """
+    Test that top locations are grouped by country and coordinates, not city spelling
+    """
+
+    session = MagicMock(execute=AsyncMock())
+    context = MagicMock(__aenter__=AsyncMock(return_value=session), __aexit__=AsyncMock())
+
+    with patch.object(
+        SQLConnector, "session", PropertyMock(return_value=MagicMock(return_value=context))
+    ):
+        await history_repo.get_top_locations(datetime(2025, 1, 1, tzinfo=UTC), 10)
+
+    group_by = str(session.execute.await_args.args[0]).split("GROUP BY")[1].split("ORDER BY")[0]
+    assert "history.city" not in group_by
+    assert "history.country, history.latitude, history.longitude" in group_by